@@ -0,0 +1,47 @@
+"""Benchmark: badge preview requests/sec with and without the render cache.
+
+"Before" drops the cached inputs and rendered page ahead of every request,
+so each hit pays a database round-trip and a full render like the old
+handler did. "After" is the steady state embed traffic sees.
+
+Run from ethaum-ai/backend:
+    python -m benchmarks.bench_badge_preview [--latency-ms 20] [--requests 500]
+"""
+
+import argparse
+
+from benchmarks.standin import install, measure, sample_tables
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    install(sample_tables(products=50), latency_ms=args.latency_ms)
+
+    from fastapi.testclient import TestClient
+    from main import app
+    from services.badge_renderer import render_badge_preview
+    from services.badges import invalidate_badge
+
+    client = TestClient(app)
+    url = "/api/v1/badges/7/preview"
+
+    def uncached() -> None:
+        invalidate_badge(7)
+        render_badge_preview.cache_clear()
+        client.get(url, headers={"Accept-Encoding": "identity"})
+
+    def cached() -> None:
+        client.get(url, headers={"Accept-Encoding": "gzip"})
+
+    print(f"badge preview, {args.latency_ms:g} ms simulated DB latency")
+    before = measure("before: DB fetch + render per hit", uncached, args.requests)
+    after = measure("after: cached, gzip-precompressed", cached, args.requests)
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
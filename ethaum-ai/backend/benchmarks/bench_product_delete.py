@@ -0,0 +1,72 @@
+"""Benchmark: deleting products, per-table deletes vs one cascade function call.
+
+"Before" is the original admin sequence: reviews, launches, upvotes and
+then the product, four round-trips per product. "After" is one call to
+`delete_product_cascade` (016_delete_product_cascade.sql) for the whole
+batch; the stand-in runs a Python equivalent of the SQL function.
+
+Run from ethaum-ai/backend:
+    python -m benchmarks.bench_product_delete [--latency-ms 20] [--products 50]
+"""
+
+import argparse
+import time
+
+from benchmarks.standin import install, sample_tables
+
+CHILD_TABLES = ("reviews", "upvotes", "launches")
+
+
+def delete_product_cascade(client, product_ids: list[int]) -> list[dict]:
+    """Stand-in for the SQL function: children first, then the products."""
+    ids = set(product_ids)
+    for table in CHILD_TABLES:
+        client.tables[table] = [row for row in client.tables.get(table, []) if row.get("product_id") not in ids]
+    deleted = [{"id": p["id"], "category": p["category"]} for p in client.tables["products"] if p["id"] in ids]
+    client.tables["products"] = [p for p in client.tables["products"] if p["id"] not in ids]
+    return deleted
+
+
+def sequential_delete(db, product_ids: list[int]) -> None:
+    """The original per-product sequence, kept here as the baseline."""
+    for product_id in product_ids:
+        db.table("reviews").delete().eq("product_id", product_id).execute()
+        db.table("launches").delete().eq("product_id", product_id).execute()
+        db.table("upvotes").delete().eq("product_id", product_id).execute()
+        db.table("products").delete().eq("id", product_id).execute()
+
+
+def cascade_delete(db, product_ids: list[int]) -> None:
+    db.rpc("delete_product_cascade", {"product_ids": product_ids}).execute()
+
+
+def run(label: str, delete, products: int, latency_ms: float) -> float:
+    db = install(sample_tables(products=products * 2), latency_ms=latency_ms)
+    db.functions["delete_product_cascade"] = delete_product_cascade
+    product_ids = list(range(1, products + 1))
+
+    start = time.perf_counter()
+    delete(db, product_ids)
+    elapsed = time.perf_counter() - start
+
+    leftovers = [t for t in ("products",) + CHILD_TABLES
+                 if any(r.get("product_id", r.get("id")) in set(product_ids) for r in db.tables[t])]
+    assert not leftovers, f"{label}: rows left in {leftovers}"
+    print(f"{label:<40} {elapsed * 1000:>9.1f} ms  ({db.round_trips} round-trips)")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--products", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"deleting {args.products} products, {args.latency_ms:g} ms simulated DB latency")
+    before = run("before: 4 deletes per product", sequential_delete, args.products, args.latency_ms)
+    after = run("after: one delete_product_cascade call", cascade_delete, args.products, args.latency_ms)
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark: product detail latency, sequential lookups vs concurrent fan-out.
+
+"Before" is the original handler: product, owner, launch and every
+review id fetched one after another. "After" is the current handler,
+which fans the owner, launch and review-count lookups out once the
+product row is known.
+
+Run from ethaum-ai/backend:
+    python -m benchmarks.bench_product_detail [--latency-ms 20] [--requests 200]
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.standin import install, sample_tables
+from database import get_db
+
+
+def sequential_detail(product_id: int) -> dict:
+    """The original query sequence, kept here as the baseline."""
+    db = get_db()
+    product = db.table("products").select("*").eq("id", product_id).execute().data[0]
+    owner = None
+    if product.get("user_id"):
+        owner_result = db.table("users").select("full_name, email").eq("id", product["user_id"]).execute()
+        owner = owner_result.data[0] if owner_result.data else None
+    launch_result = db.table("launches").select("*").eq("product_id", product_id).execute()
+    reviews_result = db.table("reviews").select("id").eq("product_id", product_id).execute()
+    return {"product": product, "owner": owner, "launch": launch_result.data, "reviews": len(reviews_result.data)}
+
+
+def latencies(fn, requests: int) -> list[float]:
+    samples = []
+    for i in range(requests):
+        start = time.perf_counter()
+        fn(i % 50 + 1)
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+
+def report(label: str, samples: list[float]) -> float:
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{label:<40} p50 {p50:>7.2f} ms   p99 {p99:>7.2f} ms")
+    return p50
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    db = install(sample_tables(products=50, reviews_per_product=200), latency_ms=args.latency_ms)
+
+    from routers.products import get_product as cached_get_product
+
+    # Time the handler itself, not the response cache in front of it
+    get_product = cached_get_product.__wrapped__
+
+    assert get_product(7)["reviews_count"] == sequential_detail(7)["reviews"]
+
+    print(f"product detail, {args.latency_ms:g} ms simulated DB latency per round-trip")
+    before = report("before: 4 sequential round-trips", latencies(sequential_detail, args.requests))
+    after = report("after: 1 round-trip + concurrent fan-out", latencies(get_product, args.requests))
+    print(f"p50 speedup: {before / after:.1f}x ({db.round_trips} round-trips total)")
+
+
+if __name__ == "__main__":
+    main()
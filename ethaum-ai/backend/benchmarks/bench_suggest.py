@@ -0,0 +1,106 @@
+"""Benchmark: autocomplete latency, warm and while the catalog is being reloaded.
+
+"Warm" times `suggest` on a built index for a mix of 1-6 character
+prefixes. "Before" is what the request that found the index stale used
+to pay: the whole catalog reload, with every other search and suggest
+request queued behind it. "After" times suggest requests served from
+the current index while the background refresher rebuilds it (the
+rebuild shares the GIL, so expect a few slow outliers in max).
+
+The stand-in scans the whole table for every page, so the reload time
+overstates what a real database adds on top of the simulated latency.
+
+Run from ethaum-ai/backend:
+    python -m benchmarks.bench_suggest [--products 100000] [--requests 20000] [--latency-ms 20]
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from typing import Optional
+
+from benchmarks.standin import CATEGORIES, FUNDING_STAGES, install
+
+SYLLABLES = ["neu", "ra", "tech", "flow", "sec", "ops", "data", "vi", "sion", "clo", "ud", "fin", "pay",
+             "med", "io", "ly", "ai", "mint", "core", "grid", "byte", "sky", "lab", "nova", "zen", "qu", "ant"]
+
+
+def catalog(products: int, seed: int = 7) -> dict:
+    """Approved products with varied one- to three-word names."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, products + 1):
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) for _ in range(rng.randint(1, 3))]
+        rows.append({
+            "id": i,
+            "name": " ".join(word.capitalize() for word in words),
+            "tagline": None,
+            "description": f"Product {i}",
+            "category": rng.choice(CATEGORIES),
+            "funding_stage": rng.choice(FUNDING_STAGES),
+            "trust_score": rng.randint(50, 99),
+            "website": f"https://p{i}.example.com",
+            "status": "approved",
+        })
+    return {"products": rows}
+
+
+def prefixes(tables: dict, count: int, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)
+    names = [p["name"].lower() for p in tables["products"]]
+    return [rng.choice(names)[:rng.randint(1, 6)] for _ in range(count)]
+
+
+def suggest_latencies(queries: list[str], stop: Optional[threading.Event] = None) -> list[float]:
+    from services.search import get_autocomplete_index
+
+    samples = []
+    for prefix in queries:
+        start = time.perf_counter()
+        get_autocomplete_index().suggest(prefix)
+        samples.append((time.perf_counter() - start) * 1000)
+        if stop is not None and stop.is_set():
+            break
+    return sorted(samples)
+
+
+def report(label: str, samples: list[float]) -> None:
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{label:<40} p50 {p50:>7.3f} ms   p99 {p99:>7.3f} ms   max {samples[-1]:>7.2f} ms   "
+          f"({len(samples)} requests)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    tables = catalog(args.products)
+    install(tables, latency_ms=args.latency_ms)
+    from services import search
+
+    queries = prefixes(tables, args.requests)
+    print(f"{args.products} products, {args.latency_ms:g} ms simulated DB latency per page")
+
+    start = time.perf_counter()
+    search.rebuild_search_indexes()
+    reload_ms = (time.perf_counter() - start) * 1000
+
+    report("warm index", suggest_latencies(queries))
+    print(f"{'before: request that triggers the reload':<40} {reload_ms:>11.1f} ms (others wait behind it)")
+
+    done = threading.Event()
+    rebuild = threading.Thread(target=lambda: (search.rebuild_search_indexes(), done.set()))
+    rebuild.start()
+    during = suggest_latencies(queries * 50, stop=done)
+    rebuild.join()
+    report("after: while the refresher rebuilds", during)
+
+
+if __name__ == "__main__":
+    main()
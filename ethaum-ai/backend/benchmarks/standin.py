@@ -0,0 +1,281 @@
+"""EthAum AI - Stand-in Database for Benchmarks.
+
+An in-memory imitation of the parts of the Supabase query builder the
+routers use, with a configurable per-request latency so benchmarks can
+show the effect of saved round-trips without a live project.
+
+Usage:
+    from benchmarks.standin import install, sample_tables
+    db = install(sample_tables(products=1000), latency_ms=20)
+"""
+
+import copy
+import itertools
+import os
+import random
+import re
+import time
+from typing import Any, Callable, Optional
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "standin")
+
+
+class StandInResult:
+    """Mirrors the `data` / `count` attributes of a PostgREST response."""
+
+    def __init__(self, data: list, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class StandInQuery:
+    """Chainable query against one in-memory table."""
+
+    def __init__(self, client: "StandInClient", table: str):
+        self._client = client
+        self._table = table
+        self._op = "select"
+        self._columns = "*"
+        self._payload: Any = None
+        self._filters: list[Callable[[dict], bool]] = []
+        self._order: list[tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+        self._range: Optional[tuple[int, int]] = None
+        self._count: Optional[str] = None
+        self._head = False
+
+    def select(self, columns: str = "*", count: Optional[str] = None, head: bool = False):
+        self._columns, self._count, self._head = columns, count, head
+        return self
+
+    def insert(self, payload, **kwargs):
+        self._op, self._payload = "insert", payload
+        return self
+
+    def upsert(self, payload, **kwargs):
+        self._op, self._payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self._op, self._payload = "update", payload
+        return self
+
+    def delete(self):
+        self._op = "delete"
+        return self
+
+    def eq(self, column, value):
+        return self._where(lambda r: r.get(column) == value)
+
+    def neq(self, column, value):
+        return self._where(lambda r: r.get(column) != value)
+
+    def gt(self, column, value):
+        return self._where(lambda r: r.get(column) is not None and r.get(column) > value)
+
+    def gte(self, column, value):
+        return self._where(lambda r: r.get(column) is not None and r.get(column) >= value)
+
+    def lt(self, column, value):
+        return self._where(lambda r: r.get(column) is not None and r.get(column) < value)
+
+    def lte(self, column, value):
+        return self._where(lambda r: r.get(column) is not None and r.get(column) <= value)
+
+    def in_(self, column, values):
+        values = set(values)
+        return self._where(lambda r: r.get(column) in values)
+
+    def order(self, column, desc: bool = False):
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def range(self, start: int, end: int):
+        self._range = (start, end)
+        return self
+
+    def execute(self) -> StandInResult:
+        self._client.round_trip()
+        rows = self._client.tables.setdefault(self._table, [])
+
+        if self._op == "insert":
+            payload = self._payload if isinstance(self._payload, list) else [self._payload]
+            inserted = []
+            for row in payload:
+                row = dict(row)
+                row.setdefault("id", self._client.next_id(self._table))
+                rows.append(row)
+                inserted.append(copy.deepcopy(row))
+            return StandInResult(inserted)
+
+        matched = [r for r in rows if all(f(r) for f in self._filters)]
+
+        if self._op == "update":
+            for row in matched:
+                row.update(self._payload)
+            return StandInResult(copy.deepcopy(matched))
+
+        if self._op == "delete":
+            matched_ids = {id(r) for r in matched}
+            self._client.tables[self._table] = [r for r in rows if id(r) not in matched_ids]
+            return StandInResult(copy.deepcopy(matched))
+
+        for column, desc in reversed(self._order):
+            matched.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+
+        total = len(matched)
+        if self._range:
+            matched = matched[self._range[0]:self._range[1] + 1]
+        if self._limit is not None:
+            matched = matched[:self._limit]
+
+        data = [] if self._head else [self._project(r) for r in matched]
+        return StandInResult(data, total if self._count else None)
+
+    def _where(self, predicate: Callable[[dict], bool]):
+        self._filters.append(predicate)
+        return self
+
+    def _project(self, row: dict) -> dict:
+        """Apply the select list, resolving `table(col, ...)` embeds."""
+        out: dict = {}
+        for part in _split_columns(self._columns):
+            embed = re.match(r"(\w+)(?:!inner)?\((.*)\)$", part)
+            if embed:
+                table, columns = embed.group(1), _split_columns(embed.group(2))
+                out[table] = self._embed(row, table, columns)
+            elif part == "*":
+                out.update(copy.deepcopy(row))
+            else:
+                out[part] = row.get(part)
+        return out
+
+    def _embed(self, row: dict, table: str, columns: list[str]):
+        pick = lambda r: dict(r) if columns == ["*"] else {c: r.get(c) for c in columns}
+        foreign_key = f"{table.rstrip('s')}_id"
+        if foreign_key in row:
+            for candidate in self._client.tables.get(table, []):
+                if candidate.get("id") == row[foreign_key]:
+                    return pick(candidate)
+            return None
+        back_reference = f"{self._table.rstrip('s')}_id"
+        return [pick(r) for r in self._client.tables.get(table, []) if r.get(back_reference) == row.get("id")]
+
+
+class StandInRPC:
+    def __init__(self, client: "StandInClient", fn: str, params: Optional[dict]):
+        self._client, self._fn, self._params = client, fn, params or {}
+
+    def execute(self) -> StandInResult:
+        self._client.round_trip()
+        return StandInResult(self._client.functions[self._fn](self._client, **self._params))
+
+
+class StandInClient:
+    """In-memory client with `table()` / `rpc()` like `supabase.Client`."""
+
+    def __init__(self, tables: Optional[dict] = None, latency_ms: float = 0.0):
+        self.tables: dict[str, list[dict]] = tables or {}
+        self.functions: dict[str, Callable] = {}
+        self.latency = latency_ms / 1000.0
+        self.round_trips = 0
+        self._ids: dict[str, itertools.count] = {}
+
+    def table(self, name: str) -> StandInQuery:
+        return StandInQuery(self, name)
+
+    def rpc(self, fn: str, params: Optional[dict] = None) -> StandInRPC:
+        return StandInRPC(self, fn, params)
+
+    def round_trip(self) -> None:
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def next_id(self, table: str) -> int:
+        if table not in self._ids:
+            start = max((r.get("id", 0) for r in self.tables.get(table, []) if isinstance(r.get("id"), int)), default=0)
+            self._ids[table] = itertools.count(start + 1)
+        return next(self._ids[table])
+
+
+def install(tables: Optional[dict] = None, latency_ms: float = 0.0) -> StandInClient:
+    """Point `database.get_db()` at a fresh stand-in client and return it."""
+    import database
+
+    client = StandInClient(tables, latency_ms)
+    database.supabase = client
+    return client
+
+
+CATEGORIES = ["AI/ML", "DevOps", "FinTech", "Security", "HealthTech", "Analytics", "Cloud", "IoT", "E-commerce"]
+FUNDING_STAGES = ["Series A", "Series B", "Series C", "Series D"]
+
+
+def sample_tables(products: int = 100, reviews_per_product: int = 3, seed: int = 42) -> dict:
+    """Generate a deterministic catalog of approved products and related rows."""
+    rng = random.Random(seed)
+    tables: dict[str, list[dict]] = {
+        "users": [{"id": "user-1", "clerk_id": "clerk-1", "email": "founder@example.com",
+                   "full_name": "Sample Founder", "role": "admin"}],
+        "products": [], "launches": [], "reviews": [], "deals": [], "upvotes": [], "pilot_requests": [],
+    }
+    for i in range(1, products + 1):
+        created_at = f"2026-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}T00:00:00+00:00"
+        tables["products"].append({
+            "id": i,
+            "name": f"Startup {i}",
+            "website": f"https://startup{i}.example.com",
+            "category": rng.choice(CATEGORIES),
+            "funding_stage": rng.choice(FUNDING_STAGES),
+            "description": f"Sample product number {i}",
+            "tagline": None,
+            "trust_score": rng.randint(50, 99),
+            "data_integrity": rng.randint(50, 99),
+            "market_traction": rng.randint(30, 99),
+            "user_sentiment": rng.randint(50, 99),
+            "status": "approved",
+            "user_id": "user-1",
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+        tables["launches"].append({"id": i, "product_id": i, "upvotes": rng.randint(0, 500),
+                                   "rank": i, "is_featured": False})
+        for _ in range(reviews_per_product):
+            tables["reviews"].append({
+                "id": len(tables["reviews"]) + 1, "product_id": i, "rating": rng.randint(1, 5),
+                "comment": "Sample review", "reviewer_name": "Reviewer",
+                "sentiment_score": round(rng.random(), 2), "verified": False, "created_at": created_at,
+            })
+    return tables
+
+
+def measure(label: str, fn: Callable[[], Any], iterations: int) -> float:
+    """Run `fn` repeatedly and print throughput; returns requests/sec."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    rate = iterations / elapsed
+    print(f"{label:<40} {rate:>10.1f} req/s  ({elapsed / iterations * 1000:.3f} ms/req)")
+    return rate
+
+
+def _split_columns(columns: str) -> list[str]:
+    parts, depth, current = [], 0, ""
+    for char in columns:
+        depth += char == "("
+        depth -= char == ")"
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+        else:
+            current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
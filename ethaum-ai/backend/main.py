@@ -1,5 +1,7 @@
 """EthAum AI - FastAPI Application Entry Point."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -18,11 +20,49 @@ from routers import (
     recommendations,
     admin,
 )
+from services import (
+    audit_log,
+    badge_tracking,
+    collaborative,
+    pilot_ingestion,
+    product_refresh,
+    search,
+    similarity,
+    comparisons as comparison_service,
+    matchmaking as matchmaking_service,
+)
+from services.cache import cache_metrics, single_flight_metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start per-worker background tasks and flush their buffers on shutdown."""
+    badge_tracking.start_flusher()
+    audit_log.start_flusher()
+    comparison_service.start_refresher()
+    similarity.start_refresher()
+    search.start_refresher()
+    matchmaking_service.start_refresher()
+    collaborative.start_refresher()
+    product_refresh.start_worker()
+    pilot_ingestion.start_worker()
+    yield
+    pilot_ingestion.stop_worker()
+    product_refresh.stop_worker()
+    collaborative.stop_refresher()
+    matchmaking_service.stop_refresher()
+    search.stop_refresher()
+    similarity.stop_refresher()
+    comparison_service.stop_refresher()
+    audit_log.stop_flusher()
+    badge_tracking.stop_flusher()
+
 
 app = FastAPI(
     title="EthAum AI",
     description="AI-Powered SaaS Marketplace for Series A-D Startups - Product Hunt + G2 + Gartner + AppSumo",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 # Enable CORS for frontend integration
@@ -32,6 +72,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
 )
 
 # ========== USER MANAGEMENT ==========
@@ -69,3 +110,14 @@ def health_check() -> dict:
     return {"status": "ok", "service": "ethaum-ai", "version": "2.0.0"}
 
 
+
+
+@app.get("/metrics", tags=["Health"])
+def metrics() -> dict:
+    """Response cache, request coalescing, audit buffer and index refresh metrics for this worker."""
+    return {
+        "response_caches": cache_metrics(),
+        "single_flight": single_flight_metrics(),
+        "audit_log": audit_log.audit_metrics(),
+        "product_refresh": product_refresh.refresh_metrics(),
+    }
@@ -0,0 +1,30 @@
+-- EthAum AI - Hourly Badge Impression/Click Rollups
+-- Run this in Supabase SQL Editor
+
+-- One row per product per hour, filled in batches by the API workers
+CREATE TABLE IF NOT EXISTS badge_event_rollups (
+    product_id INTEGER REFERENCES products(id) ON DELETE CASCADE,
+    hour TIMESTAMP WITH TIME ZONE NOT NULL,
+    impressions BIGINT DEFAULT 0,
+    clicks BIGINT DEFAULT 0,
+    PRIMARY KEY (product_id, hour)
+);
+
+-- Index for "last 30 days" engagement lookups
+CREATE INDEX IF NOT EXISTS idx_badge_event_rollups_hour ON badge_event_rollups(hour);
+
+-- Add a batch of rollups, summing with counts already flushed by other workers
+CREATE OR REPLACE FUNCTION record_badge_events(events JSONB)
+RETURNS VOID AS $$
+    INSERT INTO badge_event_rollups (product_id, hour, impressions, clicks)
+    SELECT
+        (e->>'product_id')::INTEGER,
+        (e->>'hour')::TIMESTAMP WITH TIME ZONE,
+        (e->>'impressions')::BIGINT,
+        (e->>'clicks')::BIGINT
+    FROM jsonb_array_elements(events) AS e
+    WHERE EXISTS (SELECT 1 FROM products p WHERE p.id = (e->>'product_id')::INTEGER)
+    ON CONFLICT (product_id, hour) DO UPDATE SET
+        impressions = badge_event_rollups.impressions + EXCLUDED.impressions,
+        clicks = badge_event_rollups.clicks + EXCLUDED.clicks;
+$$ LANGUAGE SQL;
@@ -0,0 +1,17 @@
+-- EthAum AI - Keep products.updated_at current
+-- Run this in Supabase SQL Editor
+
+-- Comparison caches key on updated_at, so every write must bump it
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_products_updated_at ON products;
+CREATE TRIGGER trg_products_updated_at
+    BEFORE UPDATE ON products
+    FOR EACH ROW
+    EXECUTE FUNCTION set_updated_at();
@@ -0,0 +1,8 @@
+-- EthAum AI - Idempotent Pilot Request Ingestion
+-- Run this in Supabase SQL Editor
+
+-- Every queued submission carries a key; duplicates are ignored on insert
+ALTER TABLE pilot_requests ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(255);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pilot_requests_idempotency_key
+    ON pilot_requests(idempotency_key);
@@ -0,0 +1,70 @@
+-- EthAum AI - Pilot Request Inbox
+-- Run this in Supabase SQL Editor
+
+-- Denormalize the owning founder and product so inbox queries never join
+ALTER TABLE pilot_requests ADD COLUMN IF NOT EXISTS product_id INTEGER REFERENCES products(id) ON DELETE CASCADE;
+ALTER TABLE pilot_requests ADD COLUMN IF NOT EXISTS owner_id UUID REFERENCES users(id) ON DELETE SET NULL;
+ALTER TABLE pilot_requests ADD COLUMN IF NOT EXISTS read_at TIMESTAMP WITH TIME ZONE;
+
+UPDATE pilot_requests pr
+SET product_id = d.product_id, owner_id = p.user_id
+FROM deals d JOIN products p ON p.id = d.product_id
+WHERE pr.deal_id = d.id AND pr.product_id IS NULL;
+
+-- Keyset pagination indexes: newest first, id as tie-breaker
+CREATE INDEX IF NOT EXISTS idx_pilot_requests_created ON pilot_requests(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_pilot_requests_owner_created ON pilot_requests(owner_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_pilot_requests_deal_created ON pilot_requests(deal_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_pilot_requests_status_created ON pilot_requests(status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_pilot_requests_owner_unread ON pilot_requests(owner_id) WHERE read_at IS NULL;
+
+-- Per-founder unread counter, maintained by the triggers below
+CREATE TABLE IF NOT EXISTS pilot_inbox_counters (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    unread_count INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO pilot_inbox_counters (user_id, unread_count)
+SELECT owner_id, COUNT(*) FROM pilot_requests
+WHERE owner_id IS NOT NULL AND read_at IS NULL
+GROUP BY owner_id
+ON CONFLICT (user_id) DO UPDATE SET unread_count = EXCLUDED.unread_count;
+
+-- Fill product/owner on insert
+CREATE OR REPLACE FUNCTION pilot_requests_set_owner()
+RETURNS TRIGGER AS $$
+BEGIN
+    SELECT d.product_id, p.user_id INTO NEW.product_id, NEW.owner_id
+    FROM deals d JOIN products p ON p.id = d.product_id
+    WHERE d.id = NEW.deal_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_pilot_requests_set_owner ON pilot_requests;
+CREATE TRIGGER trg_pilot_requests_set_owner
+    BEFORE INSERT ON pilot_requests
+    FOR EACH ROW
+    EXECUTE FUNCTION pilot_requests_set_owner();
+
+-- Keep unread counters in step with inserts, reads and deletes
+CREATE OR REPLACE FUNCTION pilot_requests_count_unread()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.owner_id IS NOT NULL AND OLD.read_at IS NULL THEN
+        UPDATE pilot_inbox_counters SET unread_count = GREATEST(unread_count - 1, 0)
+        WHERE user_id = OLD.owner_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.owner_id IS NOT NULL AND NEW.read_at IS NULL THEN
+        INSERT INTO pilot_inbox_counters (user_id, unread_count) VALUES (NEW.owner_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET unread_count = pilot_inbox_counters.unread_count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_pilot_requests_count_unread ON pilot_requests;
+CREATE TRIGGER trg_pilot_requests_count_unread
+    AFTER INSERT OR DELETE OR UPDATE OF read_at, owner_id ON pilot_requests
+    FOR EACH ROW
+    EXECUTE FUNCTION pilot_requests_count_unread();
@@ -0,0 +1,25 @@
+-- EthAum AI - Buyer Profiles for Matchmaking
+-- Run this in Supabase SQL Editor
+
+CREATE TABLE IF NOT EXISTS buyer_profiles (
+    id SERIAL PRIMARY KEY,
+    buyer_type VARCHAR(255) NOT NULL,
+    categories TEXT[] NOT NULL DEFAULT '{}',
+    min_trust_score INTEGER NOT NULL DEFAULT 60,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_buyer_profiles_categories ON buyer_profiles USING GIN(categories);
+CREATE INDEX IF NOT EXISTS idx_buyer_profiles_min_trust ON buyer_profiles(min_trust_score);
+
+-- Seed with the built-in personas
+INSERT INTO buyer_profiles (buyer_type, categories, min_trust_score, description)
+SELECT * FROM (VALUES
+    ('Enterprise Fintech', ARRAY['AI/ML', 'FinTech', 'Security'], 75, 'Large financial institutions seeking AI-powered solutions'),
+    ('Tech Enterprise', ARRAY['DevOps', 'AI/ML', 'Cloud'], 70, 'Technology companies modernizing their infrastructure'),
+    ('Retail Chain', ARRAY['AI/ML', 'Analytics', 'E-commerce'], 65, 'Retail enterprises optimizing operations with AI'),
+    ('Healthcare Provider', ARRAY['AI/ML', 'HealthTech', 'Security'], 80, 'Healthcare organizations with strict compliance needs'),
+    ('Manufacturing Corp', ARRAY['IoT', 'AI/ML', 'Analytics'], 60, 'Industrial enterprises adopting Industry 4.0')
+) AS seed(buyer_type, categories, min_trust_score, description)
+WHERE NOT EXISTS (SELECT 1 FROM buyer_profiles);
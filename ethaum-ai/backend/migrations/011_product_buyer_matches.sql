@@ -0,0 +1,22 @@
+-- EthAum AI - Stored Buyer Matches
+-- Run this in Supabase SQL Editor
+-- Filled by the batch job: python -m services.match_batch
+
+-- Top buyer matches per product; reasons are rebuilt from buyer_profiles on read
+CREATE TABLE IF NOT EXISTS product_buyer_matches (
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    rank SMALLINT NOT NULL,
+    buyer_id INTEGER NOT NULL,
+    match_score SMALLINT NOT NULL,
+    PRIMARY KEY (product_id, rank)
+);
+
+-- Inputs the stored matches were computed from, to find changed products
+CREATE TABLE IF NOT EXISTS product_match_state (
+    product_id INTEGER PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE,
+    category VARCHAR(100) NOT NULL,
+    trust_score INTEGER NOT NULL,
+    market_traction INTEGER NOT NULL,
+    profiles_version VARCHAR(16) NOT NULL,
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
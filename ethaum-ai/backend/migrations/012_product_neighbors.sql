@@ -0,0 +1,14 @@
+-- EthAum AI - Precomputed Similar Products
+-- Run this in Supabase SQL Editor
+
+-- Top-K nearest products per approved product, maintained by the API
+CREATE TABLE IF NOT EXISTS product_neighbors (
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    rank SMALLINT NOT NULL,
+    neighbor_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    similarity REAL NOT NULL,
+    PRIMARY KEY (product_id, rank)
+);
+
+-- Lets product deletes cascade without scanning the table
+CREATE INDEX IF NOT EXISTS idx_product_neighbors_neighbor ON product_neighbors(neighbor_id);
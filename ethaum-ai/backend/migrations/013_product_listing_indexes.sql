@@ -0,0 +1,47 @@
+-- EthAum AI - Product Listing Sorts and Indexes
+-- Run this in Supabase SQL Editor
+
+-- Upvotes live on launches; keep a per-product total so listings can sort and page on it
+ALTER TABLE products ADD COLUMN IF NOT EXISTS upvotes INTEGER NOT NULL DEFAULT 0;
+
+UPDATE products p
+SET upvotes = totals.upvotes
+FROM (SELECT product_id, COALESCE(SUM(upvotes), 0) AS upvotes FROM launches GROUP BY product_id) totals
+WHERE totals.product_id = p.id;
+
+CREATE OR REPLACE FUNCTION launches_sync_product_upvotes()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.product_id IS NOT NULL THEN
+        UPDATE products SET upvotes = (
+            SELECT COALESCE(SUM(upvotes), 0) FROM launches WHERE product_id = OLD.product_id
+        ) WHERE id = OLD.product_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.product_id IS NOT NULL
+        AND (TG_OP = 'INSERT' OR NEW.product_id IS DISTINCT FROM OLD.product_id) THEN
+        UPDATE products SET upvotes = (
+            SELECT COALESCE(SUM(upvotes), 0) FROM launches WHERE product_id = NEW.product_id
+        ) WHERE id = NEW.product_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_launches_sync_product_upvotes ON launches;
+CREATE TRIGGER trg_launches_sync_product_upvotes
+    AFTER INSERT OR DELETE OR UPDATE OF upvotes, product_id ON launches
+    FOR EACH ROW
+    EXECUTE FUNCTION launches_sync_product_upvotes();
+
+-- Keyset pagination indexes for each marketplace sort, highest first, id as tie-breaker
+CREATE INDEX IF NOT EXISTS idx_products_approved_trust ON products(trust_score DESC, id DESC) WHERE status = 'approved';
+CREATE INDEX IF NOT EXISTS idx_products_approved_created ON products(created_at DESC, id DESC) WHERE status = 'approved';
+CREATE INDEX IF NOT EXISTS idx_products_approved_upvotes ON products(upvotes DESC, id DESC) WHERE status = 'approved';
+
+-- The same sorts within a category filter
+CREATE INDEX IF NOT EXISTS idx_products_approved_category_trust ON products(category, trust_score DESC, id DESC) WHERE status = 'approved';
+CREATE INDEX IF NOT EXISTS idx_products_approved_category_created ON products(category, created_at DESC, id DESC) WHERE status = 'approved';
+CREATE INDEX IF NOT EXISTS idx_products_approved_category_upvotes ON products(category, upvotes DESC, id DESC) WHERE status = 'approved';
+
+-- Comparison listing pages through one status in id order
+CREATE INDEX IF NOT EXISTS idx_products_status_id ON products(status, id);
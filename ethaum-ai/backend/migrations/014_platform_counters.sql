@@ -0,0 +1,131 @@
+-- EthAum AI - Admin Dashboard Counters
+-- Run this in Supabase SQL Editor
+
+-- Platform totals for the admin dashboard, kept current by the triggers below
+CREATE TABLE IF NOT EXISTS platform_counters (
+    name TEXT PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0
+);
+
+-- Recount from scratch; run again if a TRUNCATE or manual fix leaves them off
+CREATE OR REPLACE FUNCTION refresh_platform_counters()
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO platform_counters (name, value) VALUES
+        ('total_products', (SELECT COUNT(*) FROM products)),
+        ('pending_products', (SELECT COUNT(*) FROM products WHERE status = 'pending')),
+        ('total_users', (SELECT COUNT(*) FROM users)),
+        ('total_reviews', (SELECT COUNT(*) FROM reviews)),
+        ('total_upvotes', (SELECT COALESCE(SUM(upvotes), 0) FROM launches))
+    ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT refresh_platform_counters();
+
+CREATE OR REPLACE FUNCTION bump_platform_counter(counter TEXT, delta BIGINT)
+RETURNS VOID AS $$
+BEGIN
+    IF delta <> 0 THEN
+        UPDATE platform_counters SET value = value + delta WHERE name = counter;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level triggers: a bulk insert or delete bumps each counter once
+CREATE OR REPLACE FUNCTION products_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_platform_counter('total_products', (SELECT COUNT(*) FROM new_rows));
+        PERFORM bump_platform_counter('pending_products', (SELECT COUNT(*) FROM new_rows WHERE status = 'pending'));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_platform_counter('total_products', -(SELECT COUNT(*) FROM old_rows));
+        PERFORM bump_platform_counter('pending_products', -(SELECT COUNT(*) FROM old_rows WHERE status = 'pending'));
+    ELSE
+        PERFORM bump_platform_counter('pending_products',
+            (SELECT COUNT(*) FROM new_rows WHERE status = 'pending')
+            - (SELECT COUNT(*) FROM old_rows WHERE status = 'pending'));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_products_count_insert ON products;
+CREATE TRIGGER trg_products_count_insert
+    AFTER INSERT ON products REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION products_count();
+
+DROP TRIGGER IF EXISTS trg_products_count_delete ON products;
+CREATE TRIGGER trg_products_count_delete
+    AFTER DELETE ON products REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION products_count();
+
+DROP TRIGGER IF EXISTS trg_products_count_update ON products;
+CREATE TRIGGER trg_products_count_update
+    AFTER UPDATE ON products REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION products_count();
+
+-- Row counts for users and reviews; the counter name is the trigger argument
+CREATE OR REPLACE FUNCTION rows_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_platform_counter(TG_ARGV[0], (SELECT COUNT(*) FROM new_rows));
+    ELSE
+        PERFORM bump_platform_counter(TG_ARGV[0], -(SELECT COUNT(*) FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_users_count_insert ON users;
+CREATE TRIGGER trg_users_count_insert
+    AFTER INSERT ON users REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rows_count('total_users');
+
+DROP TRIGGER IF EXISTS trg_users_count_delete ON users;
+CREATE TRIGGER trg_users_count_delete
+    AFTER DELETE ON users REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rows_count('total_users');
+
+DROP TRIGGER IF EXISTS trg_reviews_count_insert ON reviews;
+CREATE TRIGGER trg_reviews_count_insert
+    AFTER INSERT ON reviews REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rows_count('total_reviews');
+
+DROP TRIGGER IF EXISTS trg_reviews_count_delete ON reviews;
+CREATE TRIGGER trg_reviews_count_delete
+    AFTER DELETE ON reviews REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rows_count('total_reviews');
+
+-- Upvote total follows the per-launch counts
+CREATE OR REPLACE FUNCTION launches_count_upvotes()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_platform_counter('total_upvotes', (SELECT COALESCE(SUM(upvotes), 0) FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_platform_counter('total_upvotes', -(SELECT COALESCE(SUM(upvotes), 0) FROM old_rows));
+    ELSE
+        PERFORM bump_platform_counter('total_upvotes',
+            (SELECT COALESCE(SUM(upvotes), 0) FROM new_rows) - (SELECT COALESCE(SUM(upvotes), 0) FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_launches_count_insert ON launches;
+CREATE TRIGGER trg_launches_count_insert
+    AFTER INSERT ON launches REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION launches_count_upvotes();
+
+DROP TRIGGER IF EXISTS trg_launches_count_delete ON launches;
+CREATE TRIGGER trg_launches_count_delete
+    AFTER DELETE ON launches REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION launches_count_upvotes();
+
+DROP TRIGGER IF EXISTS trg_launches_count_update ON launches;
+CREATE TRIGGER trg_launches_count_update
+    AFTER UPDATE ON launches REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION launches_count_upvotes();
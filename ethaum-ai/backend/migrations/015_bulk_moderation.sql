@@ -0,0 +1,25 @@
+-- EthAum AI - Bulk Product Moderation
+-- Run this in Supabase SQL Editor
+
+-- Approve, reject or delete many products in one transaction.
+-- Returns the products it touched, with their category, so callers can
+-- report ids that did not exist and refresh what changed.
+CREATE OR REPLACE FUNCTION moderate_products(product_ids INTEGER[], action TEXT)
+RETURNS TABLE (id INTEGER, category VARCHAR) AS $$
+#variable_conflict use_column
+BEGIN
+    IF action = 'delete' THEN
+        DELETE FROM reviews WHERE product_id = ANY(product_ids);
+        DELETE FROM upvotes WHERE product_id = ANY(product_ids);
+        DELETE FROM launches WHERE product_id = ANY(product_ids);
+        RETURN QUERY DELETE FROM products p WHERE p.id = ANY(product_ids) RETURNING p.id, p.category;
+    ELSIF action IN ('approve', 'reject') THEN
+        RETURN QUERY UPDATE products p
+            SET status = CASE WHEN action = 'approve' THEN 'approved' ELSE 'rejected' END
+            WHERE p.id = ANY(product_ids)
+            RETURNING p.id, p.category;
+    ELSE
+        RAISE EXCEPTION 'Unknown moderation action: %', action;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,35 @@
+-- EthAum AI - Transactional Product Delete
+-- Run this in Supabase SQL Editor
+
+-- Delete products and their reviews, upvotes and launches in one transaction.
+-- The child deletes are explicit so projects whose foreign keys predate
+-- ON DELETE CASCADE are covered too; the remaining product tables cascade.
+-- Returns the deleted products with their category.
+CREATE OR REPLACE FUNCTION delete_product_cascade(product_ids INTEGER[])
+RETURNS TABLE (id INTEGER, category VARCHAR) AS $$
+#variable_conflict use_column
+BEGIN
+    DELETE FROM reviews WHERE product_id = ANY(product_ids);
+    DELETE FROM upvotes WHERE product_id = ANY(product_ids);
+    DELETE FROM launches WHERE product_id = ANY(product_ids);
+    RETURN QUERY DELETE FROM products p WHERE p.id = ANY(product_ids) RETURNING p.id, p.category;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Bulk moderation deletes through the same function
+CREATE OR REPLACE FUNCTION moderate_products(product_ids INTEGER[], action TEXT)
+RETURNS TABLE (id INTEGER, category VARCHAR) AS $$
+#variable_conflict use_column
+BEGIN
+    IF action = 'delete' THEN
+        RETURN QUERY SELECT * FROM delete_product_cascade(product_ids);
+    ELSIF action IN ('approve', 'reject') THEN
+        RETURN QUERY UPDATE products p
+            SET status = CASE WHEN action = 'approve' THEN 'approved' ELSE 'rejected' END
+            WHERE p.id = ANY(product_ids)
+            RETURNING p.id, p.category;
+    ELSE
+        RAISE EXCEPTION 'Unknown moderation action: %', action;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,40 @@
+-- EthAum AI - Admin Audit Log
+-- Run this in Supabase SQL Editor
+
+-- One row per admin action, written in batches by the API workers.
+-- event_id is generated by the worker so a retried batch is not stored twice.
+CREATE TABLE IF NOT EXISTS admin_audit_log (
+    id BIGSERIAL PRIMARY KEY,
+    event_id UUID UNIQUE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    admin_id UUID,
+    admin_email VARCHAR(255),
+    action VARCHAR(50) NOT NULL,
+    target_type VARCHAR(50) NOT NULL,
+    target_id VARCHAR(255),
+    details JSONB DEFAULT '{}'::jsonb
+);
+
+-- Newest-first paging, overall and filtered by action, admin or target
+CREATE INDEX IF NOT EXISTS idx_admin_audit_log_created ON admin_audit_log(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_admin_audit_log_action ON admin_audit_log(action, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_admin_audit_log_admin ON admin_audit_log(admin_email, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_admin_audit_log_target ON admin_audit_log(target_type, target_id, created_at DESC, id DESC);
+
+-- The log is append-only
+CREATE OR REPLACE FUNCTION forbid_admin_audit_log_changes()
+RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'admin_audit_log is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS admin_audit_log_append_only ON admin_audit_log;
+CREATE TRIGGER admin_audit_log_append_only
+    BEFORE UPDATE OR DELETE ON admin_audit_log
+    FOR EACH ROW EXECUTE FUNCTION forbid_admin_audit_log_changes();
+
+DROP TRIGGER IF EXISTS admin_audit_log_no_truncate ON admin_audit_log;
+CREATE TRIGGER admin_audit_log_no_truncate
+    BEFORE TRUNCATE ON admin_audit_log
+    FOR EACH STATEMENT EXECUTE FUNCTION forbid_admin_audit_log_changes();
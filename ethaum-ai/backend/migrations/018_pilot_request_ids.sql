@@ -0,0 +1,9 @@
+-- EthAum AI - Durable Pilot Request Status
+-- Run this in Supabase SQL Editor
+
+-- The request_id handed to the client at submission, so its status can be
+-- looked up after a restart or from another worker
+ALTER TABLE pilot_requests ADD COLUMN IF NOT EXISTS request_id VARCHAR(32);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pilot_requests_request_id
+    ON pilot_requests(request_id);
@@ -4,12 +4,36 @@ Secure admin endpoints for managing products, users, and reviews.
 All endpoints require admin role verification.
 """
 
-from fastapi import APIRouter, HTTPException, Header
+import logging
+
+from fastapi import APIRouter, File, HTTPException, Header, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from typing import Optional
+from datetime import datetime
 from database import get_db
+from schemas.product import ProductBulkAction
+from services.audit_log import record_admin_action
+from services.badges import invalidate_badge
+from services.cache import invalidate_tags
+from services.collaborative import forget_interaction
+from services.comparisons import refresh_products_comparisons
+from services.deals import invalidate_deals_catalog
+from services.export import EXPORT_COLUMNS, gzip_chunks, iter_ndjson
+from services.matchmaking import refresh_startups
+from services.pagination import apply_keyset, page_of
+from services.product_import import DEFAULT_BATCH_SIZE, detect_format, import_products
+from services.product_refresh import queue_product_refresh, queue_products_refresh
+from services.scoring import update_product_trust_score
+from services.search import refresh_products_search
+from services.similarity import refresh_products_similarity
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Products per index refresh, so each refresh stays one reasonably sized `in` query
+REFRESH_CHUNK_SIZE = 500
+
 
 def verify_admin(clerk_user_id: str) -> dict:
     """Verify that the user has admin role. Returns user data or raises 403."""
@@ -34,29 +58,25 @@ def verify_admin(clerk_user_id: str) -> dict:
 
 @router.get("/stats")
 def get_admin_stats(x_clerk_user_id: Optional[str] = Header(None)) -> dict:
-    """Get dashboard statistics for admin."""
+    """
+    Get dashboard statistics for admin.
+    
+    Totals are kept by database triggers (014_platform_counters.sql), so
+    this is a single small read however large the platform grows.
+    """
     verify_admin(x_clerk_user_id)
     
     db = get_db()
     
-    # Get counts
-    products = db.table("products").select("id", count="exact").execute()
-    users = db.table("users").select("id", count="exact").execute()
-    reviews = db.table("reviews").select("id", count="exact").execute()
-    launches = db.table("launches").select("id, upvotes").execute()
-    
-    # Calculate totals
-    total_upvotes = sum(l.get("upvotes", 0) for l in (launches.data or []))
-    
-    # Get pending products count
-    pending = db.table("products").select("id", count="exact").eq("status", "pending").execute()
+    result = db.table("platform_counters").select("name, value").execute()
+    counters = {row["name"]: row["value"] for row in result.data or []}
     
     return {
-        "total_products": products.count or 0,
-        "total_users": users.count or 0,
-        "total_reviews": reviews.count or 0,
-        "total_upvotes": total_upvotes,
-        "pending_products": pending.count or 0,
+        "total_products": counters.get("total_products", 0),
+        "total_users": counters.get("total_users", 0),
+        "total_reviews": counters.get("total_reviews", 0),
+        "total_upvotes": counters.get("total_upvotes", 0),
+        "pending_products": counters.get("pending_products", 0),
     }
 
 
@@ -84,6 +104,56 @@ def get_all_products_admin(
     return result.data or []
 
 
+@router.post("/products/import")
+def import_products_admin(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=5000),
+    approve: bool = False,
+    x_clerk_user_id: Optional[str] = Header(None)
+) -> dict:
+    """
+    Bulk-import products from a CSV or JSONL upload (admin only).
+    
+    Rows are validated like single submissions, deduplicated on website
+    and inserted in batches. The response reports counts, per-row
+    errors and rows/sec.
+    """
+    admin = verify_admin(x_clerk_user_id)
+    
+    file_format = format or detect_format(file.filename)
+    if file_format is None:
+        raise HTTPException(status_code=400, detail="Cannot tell the file format; pass format=csv or format=jsonl")
+    
+    report = import_products(
+        file.file,
+        file_format,
+        batch_size=batch_size,
+        status="approved" if approve else "pending",
+        progress=lambda r: logger.info("Product import: %d rows, %d inserted", r["rows"], r["inserted"]),
+        # Approved products go live at once, so add them to the in-memory indexes
+        on_insert=_refresh_imported if approve else None,
+    )
+    if report["inserted"]:
+        invalidate_tags("products")
+    record_admin_action(admin, "product.import", "product", details={
+        key: report[key] for key in ("rows", "inserted", "duplicates", "invalid", "failed")
+    })
+    
+    return {"success": True, **report, "admin": admin["email"]}
+
+
+def _refresh_imported(rows: list[dict]) -> None:
+    """Add a batch of newly approved products to the search, similarity, matchmaking and comparison indexes."""
+    for start in range(0, len(rows), REFRESH_CHUNK_SIZE):
+        chunk = rows[start:start + REFRESH_CHUNK_SIZE]
+        product_ids = [row["id"] for row in chunk]
+        refresh_products_comparisons({row["id"]: row.get("category") for row in chunk})
+        refresh_startups(product_ids)
+        refresh_products_similarity(product_ids)
+        refresh_products_search(product_ids)
+
+
 @router.post("/products/{product_id}/approve")
 def approve_product(
     product_id: int,
@@ -101,6 +171,10 @@ def approve_product(
     if not result.data:
         raise HTTPException(status_code=404, detail="Product not found")
     
+    queue_product_refresh(product_id, result.data[0].get("category"))
+    invalidate_tags(f"product:{product_id}", f"reviews:{product_id}", "products")
+    record_admin_action(admin, "product.approve", "product", product_id)
+    
     return {"success": True, "message": f"Product {product_id} approved", "admin": admin["email"]}
 
 
@@ -121,6 +195,10 @@ def reject_product(
     if not result.data:
         raise HTTPException(status_code=404, detail="Product not found")
     
+    queue_product_refresh(product_id, result.data[0].get("category"))
+    invalidate_tags(f"product:{product_id}", f"reviews:{product_id}", "products")
+    record_admin_action(admin, "product.reject", "product", product_id)
+    
     return {"success": True, "message": f"Product {product_id} rejected", "admin": admin["email"]}
 
 
@@ -134,17 +212,85 @@ def delete_product_admin(
     
     db = get_db()
     
-    # Delete related data first
-    db.table("reviews").delete().eq("product_id", product_id).execute()
-    db.table("launches").delete().eq("product_id", product_id).execute()
-    db.table("upvotes").delete().eq("product_id", product_id).execute()
-    
-    # Delete product
-    result = db.table("products").delete().eq("id", product_id).execute()
+    # Product and its reviews, upvotes and launches go in one transaction
+    result = db.rpc("delete_product_cascade", {"product_ids": [product_id]}).execute()
+    invalidate_badge(product_id)
+    invalidate_deals_catalog(product_id)
+    queue_product_refresh(product_id)
+    invalidate_tags(f"product:{product_id}", f"reviews:{product_id}", "products")
+    record_admin_action(admin, "product.delete", "product", product_id, {"found": bool(result.data)})
     
     return {"success": True, "message": f"Product {product_id} deleted", "admin": admin["email"]}
 
 
+@router.post("/products:bulk")
+def bulk_moderate_products(
+    request: ProductBulkAction,
+    x_clerk_user_id: Optional[str] = Header(None)
+) -> dict:
+    """
+    Approve, reject or delete many products in one call (admin only).
+    
+    The action runs in one database transaction (moderate_products in
+    015_bulk_moderation.sql); indexes and caches are refreshed once for
+    the whole batch. Ids that do not exist are reported as not_found.
+    """
+    admin = verify_admin(x_clerk_user_id)
+    
+    db = get_db()
+    
+    product_ids = list(dict.fromkeys(request.ids))
+    result = db.rpc("moderate_products", {"product_ids": product_ids, "action": request.action}).execute()
+    categories = {row["id"]: row.get("category") for row in result.data or []}
+    done = [pid for pid in product_ids if pid in categories]
+    
+    if done:
+        if request.action == "delete":
+            for product_id in done:
+                invalidate_badge(product_id)
+                invalidate_deals_catalog(product_id)
+        queue_products_refresh(categories)
+        invalidate_tags("products", *(f"{kind}:{pid}" for pid in done for kind in ("product", "reviews")))
+    record_admin_action(admin, f"product.bulk_{request.action}", "product", details={
+        "ids": done,
+        "not_found": [pid for pid in product_ids if pid not in categories],
+    })
+    
+    outcome = {"approve": "approved", "reject": "rejected", "delete": "deleted"}[request.action]
+    return {
+        "success": True,
+        "action": request.action,
+        "results": [{"id": pid, "status": outcome if pid in categories else "not_found"} for pid in product_ids],
+        "processed": len(done),
+        "admin": admin["email"],
+    }
+
+
+# ========== DEAL MANAGEMENT ==========
+
+@router.post("/deals/{deal_id}/toggle")
+def toggle_deal(
+    deal_id: int,
+    x_clerk_user_id: Optional[str] = Header(None)
+) -> dict:
+    """Open or close an enterprise pilot deal."""
+    admin = verify_admin(x_clerk_user_id)
+    
+    db = get_db()
+    
+    deal_result = db.table("deals").select("is_active").eq("id", deal_id).execute()
+    if not deal_result.data:
+        raise HTTPException(status_code=404, detail="Deal not found")
+    
+    is_active = not deal_result.data[0].get("is_active", False)
+    db.table("deals").update({"is_active": is_active}).eq("id", deal_id).execute()
+    invalidate_deals_catalog()
+    record_admin_action(admin, "deal.toggle", "deal", deal_id, {"is_active": is_active})
+    
+    state = "opened" if is_active else "closed"
+    return {"success": True, "message": f"Deal {deal_id} {state}", "is_active": is_active, "admin": admin["email"]}
+
+
 # ========== USER MANAGEMENT ==========
 
 @router.get("/users")
@@ -181,6 +327,7 @@ def update_user_role(
     
     if not result.data:
         raise HTTPException(status_code=404, detail="User not found")
+    record_admin_action(admin, "user.role_change", "user", user_id, {"role": role})
     
     return {"success": True, "message": f"User role updated to {role}", "admin": admin["email"]}
 
@@ -210,7 +357,22 @@ def delete_review_admin(
     admin = verify_admin(x_clerk_user_id)
     
     db = get_db()
+    
+    # Get review to find product_id for cache and score updates
+    review_result = db.table("reviews").select("product_id, user_id").eq("id", review_id).execute()
+    review = review_result.data[0] if review_result.data else None
+    
     db.table("reviews").delete().eq("id", review_id).execute()
+    if review and review.get("product_id"):
+        product_id = review["product_id"]
+        if review.get("user_id"):
+            forget_interaction(review["user_id"], product_id)
+        invalidate_tags(f"reviews:{product_id}", f"product:{product_id}")
+        try:
+            update_product_trust_score(product_id)
+        except Exception:
+            logger.exception("Trust score update failed for product %s", product_id)
+    record_admin_action(admin, "review.delete", "review", review_id)
     
     return {"success": True, "message": f"Review {review_id} deleted", "admin": admin["email"]}
 
@@ -231,5 +393,87 @@ def verify_review_admin(
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Review not found")
+    product_id = result.data[0].get("product_id")
+    if product_id:
+        invalidate_tags(f"reviews:{product_id}", f"product:{product_id}")
+    record_admin_action(admin, "review.verify", "review", review_id)
     
     return {"success": True, "message": f"Review {review_id} verified", "admin": admin["email"]}
+
+
+# ========== DATA EXPORT ==========
+
+@router.get("/export/{table}")
+def export_table(
+    table: str,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    gzip: bool = False,
+    x_clerk_user_id: Optional[str] = Header(None)
+) -> StreamingResponse:
+    """
+    Stream a table as NDJSON, one row per line in id order (admin only).
+    
+    Rows are fetched page by page as the response is sent, so exports of
+    any size use constant memory. Pass gzip=true for a .ndjson.gz file.
+    """
+    verify_admin(x_clerk_user_id)
+    
+    if table not in EXPORT_COLUMNS:
+        raise HTTPException(status_code=404, detail=f"Unknown export. Available: {', '.join(EXPORT_COLUMNS)}")
+    
+    body = iter_ndjson(table, created_after, created_before)
+    filename = f"{table}.ndjson"
+    media_type = "application/x-ndjson"
+    if gzip:
+        body, filename, media_type = gzip_chunks(body), f"{filename}.gz", "application/gzip"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# ========== AUDIT LOG ==========
+
+_AUDIT_ORDER = ["created_at", "id"]
+
+
+@router.get("/audit-log")
+def get_audit_log(
+    action: Optional[str] = None,
+    admin_email: Optional[str] = None,
+    target_type: Optional[str] = None,
+    target_id: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    x_clerk_user_id: Optional[str] = Header(None)
+) -> dict:
+    """
+    Page through admin actions, newest first (admin only).
+    
+    Pass `next_cursor` back as `cursor` to fetch the following page.
+    Actions reach the log in batches, so the last few seconds may not
+    be listed yet.
+    """
+    verify_admin(x_clerk_user_id)
+    
+    db = get_db()
+    
+    query = db.table("admin_audit_log").select(
+        "id, created_at, admin_id, admin_email, action, target_type, target_id, details"
+    )
+    if action:
+        query = query.eq("action", action)
+    if admin_email:
+        query = query.eq("admin_email", admin_email)
+    if target_type:
+        query = query.eq("target_type", target_type)
+    if target_id:
+        query = query.eq("target_id", target_id)
+    
+    result = apply_keyset(query, _AUDIT_ORDER, cursor).limit(limit + 1).execute()
+    events, next_cursor = page_of(result.data or [], _AUDIT_ORDER, limit)
+    
+    return {"events": events, "next_cursor": next_cursor}
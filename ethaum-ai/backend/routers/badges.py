@@ -1,11 +1,31 @@
 """EthAum AI - Embeddable Badge Router with Supabase Database."""
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse
+import base64
+from typing import Optional
+from functools import lru_cache
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from database import get_db
+from services.badge_renderer import (
+    RenderedBadge,
+    render_badge_svg,
+    render_badge_png,
+    render_badge_preview,
+)
+from services.badge_tracking import record_click, record_impression
+from services.badges import get_badge_inputs, normalize_trust_score
 
 router = APIRouter()
 
+# Product badges follow score changes within minutes; rendered images never change
+BADGE_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=86400"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Impressions are counted by a separate pixel that no cache may answer, so the
+# badge image itself can stay cacheable
+PIXEL_CACHE_CONTROL = "no-store, max-age=0"
+# 1x1 transparent GIF
+TRACKING_PIXEL = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
 
 @router.get("/{product_id}")
 def get_badge_data(product_id: int) -> dict:
@@ -19,7 +39,8 @@ def get_badge_data(product_id: int) -> dict:
         raise HTTPException(status_code=404, detail="Product not found")
     
     product = product_result.data[0]
-    trust_score = product.get("trust_score", 75)
+    # Same 0-100 integer the image endpoints render, so image_url resolves
+    trust_score = normalize_trust_score(product.get("trust_score"))
     badge_level = _get_badge_level(trust_score)
     
     base_url = "https://ethaum.ai"
@@ -37,102 +58,113 @@ def get_badge_data(product_id: int) -> dict:
             "valid_until": "2027-01-03",
         },
         "embed_codes": {
-            "html": f'''<a href="{base_url}/product/{product_id}" target="_blank">
+            "html": f'''<a href="{base_url}/api/v1/badges/{product_id}/click" target="_blank">
   <img src="{base_url}/api/v1/badges/{product_id}/image" alt="EthAum Verified - {badge_level}" />
-</a>''',
-            "markdown": f"[![EthAum Verified]({base_url}/api/v1/badges/{product_id}/image)]({base_url}/product/{product_id})",
+</a>
+<img src="{base_url}/api/v1/badges/{product_id}/pixel.gif" width="1" height="1" alt="" style="position:absolute" />''',
+            "markdown": f"[![EthAum Verified]({base_url}/api/v1/badges/{product_id}/image)]({base_url}/api/v1/badges/{product_id}/click)"
+                        f"![]({base_url}/api/v1/badges/{product_id}/pixel.gif)",
             "react": f'''<EthAumBadge productId={product_id} score={trust_score} level="{badge_level}" />''',
         },
         "preview_url": f"{base_url}/api/v1/badges/{product_id}/preview",
+        "image_url": f"{base_url}/api/v1/badges/render/{_render_badge(trust_score).digest}.svg",
     }
 
 
-@router.get("/{product_id}/preview", response_class=HTMLResponse)
-def get_badge_preview(product_id: int) -> HTMLResponse:
+@router.get("/{product_id}/image")
+def get_badge_image(product_id: int, request: Request, format: str = "svg") -> Response:
     """
-    Get a visual HTML preview of the embeddable badge.
+    Get the embeddable badge image for a startup.
+    
+    This is the URL customers embed, so it only touches the database when
+    the product's score is not already cached in this worker. Views are
+    counted by /pixel.gif, since most are answered from caches.
     """
-    db = get_db()
+    if format not in ("svg", "png"):
+        raise HTTPException(status_code=400, detail="Format must be: svg, png")
     
-    product_result = db.table("products").select("*").eq("id", product_id).execute()
-    if not product_result.data:
+    inputs = get_badge_inputs(product_id)
+    if inputs is None:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    product = product_result.data[0]
-    trust_score = product.get("trust_score", 75)
-    badge_level = _get_badge_level(trust_score)
-    badge_color = _get_badge_color(trust_score)
-    
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            .ethaum-badge {{
-                display: inline-flex;
-                align-items: center;
-                gap: 12px;
-                padding: 12px 20px;
-                background: linear-gradient(135deg, #f8f9fa 0%, #ffffff 100%);
-                border: 2px solid {badge_color};
-                border-radius: 12px;
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-                text-decoration: none;
-                color: inherit;
-                transition: transform 0.2s, box-shadow 0.2s;
-            }}
-            .ethaum-badge:hover {{
-                transform: translateY(-2px);
-                box-shadow: 0 6px 20px rgba(0,0,0,0.12);
-            }}
-            .badge-logo {{
-                width: 40px;
-                height: 40px;
-                background: linear-gradient(135deg, #7c3aed 0%, #4f46e5 100%);
-                border-radius: 10px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: white;
-                font-weight: bold;
-                font-size: 18px;
-            }}
-            .badge-content {{
-                display: flex;
-                flex-direction: column;
-            }}
-            .badge-title {{
-                font-size: 14px;
-                font-weight: 600;
-                color: #1f2937;
-            }}
-            .badge-subtitle {{
-                font-size: 12px;
-                color: #6b7280;
-            }}
-            .badge-score {{
-                font-size: 24px;
-                font-weight: bold;
-                color: {badge_color};
-                margin-left: 12px;
-            }}
-        </style>
-    </head>
-    <body style="display: flex; justify-content: center; align-items: center; min-height: 100vh; margin: 0; background: #f3f4f6;">
-        <a href="https://ethaum.ai/product/{product_id}" class="ethaum-badge" target="_blank">
-            <div class="badge-logo">E</div>
-            <div class="badge-content">
-                <span class="badge-title">EthAum Verified</span>
-                <span class="badge-subtitle">{badge_level}</span>
-            </div>
-            <span class="badge-score">{trust_score}</span>
-        </a>
-    </body>
-    </html>
+    badge = _render_badge(inputs["trust_score"], format)
+    return _badge_response(request, badge, BADGE_CACHE_CONTROL)
+
+
+@router.get("/{product_id}/pixel.gif")
+def track_badge_impression(product_id: int) -> Response:
+    """Count a badge view; embedded next to the cacheable badge image."""
+    record_impression(product_id)
+    return Response(
+        content=TRACKING_PIXEL,
+        media_type="image/gif",
+        headers={"Cache-Control": PIXEL_CACHE_CONTROL},
+    )
+
+
+@router.get("/{product_id}/click")
+def track_badge_click(product_id: int) -> RedirectResponse:
+    """Count a badge click-through and forward to the product page."""
+    record_click(product_id)
+    return RedirectResponse(
+        url=f"https://ethaum.ai/product/{product_id}",
+        status_code=302,
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@router.get("/render/{digest}.{format}")
+def get_rendered_badge(digest: str, format: str, request: Request) -> Response:
     """
+    Get a badge image by its content digest.
+    
+    The URL changes whenever the image does, so it is cached forever.
+    """
+    if format not in ("svg", "png"):
+        raise HTTPException(status_code=404, detail="Badge not found")
+    
+    score = _digest_index().get(digest)
+    if score is None:
+        raise HTTPException(status_code=404, detail="Badge not found")
     
-    return HTMLResponse(content=html, status_code=200)
+    badge = _render_badge(score, format)
+    return _badge_response(request, badge, IMMUTABLE_CACHE_CONTROL)
+
+
+@router.get("/{product_id}/preview", response_class=HTMLResponse)
+def get_badge_preview(product_id: int, request: Request) -> Response:
+    """
+    Get a visual HTML preview of the embeddable badge.
+    
+    The page is rendered once per (product, name, score) and served
+    gzip-precompressed to clients that accept it.
+    """
+    inputs = get_badge_inputs(product_id)
+    if inputs is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    trust_score = inputs["trust_score"]
+    preview = render_badge_preview(
+        product_id,
+        inputs["name"],
+        trust_score,
+        _get_badge_level(trust_score),
+        _get_badge_color(trust_score),
+    )
+    
+    headers = {"Cache-Control": BADGE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if _accepts_gzip(request.headers.get("accept-encoding")):
+        body, etag = preview.gzipped, f'"{preview.digest}-gz"'
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body, etag = preview.html, f'"{preview.digest}"'
+    headers["ETag"] = etag
+    
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
 
 
 def _get_badge_level(score: int) -> str:
@@ -157,3 +189,50 @@ def _get_badge_color(score: int) -> str:
         return "#3b82f6"
     else:
         return "#6b7280"
+
+
+def _render_badge(score: int, format: str = "svg") -> RenderedBadge:
+    """Render (or fetch the cached render of) the badge for a score."""
+    level = _get_badge_level(score)
+    color = _get_badge_color(score)
+    
+    if format == "png":
+        badge = render_badge_png(score, level, color)
+        if badge is None:
+            raise HTTPException(status_code=501, detail="PNG badges are not available on this server")
+        return badge
+    
+    return render_badge_svg(score, level, color)
+
+
+@lru_cache(maxsize=1)
+def _digest_index() -> dict[str, int]:
+    """Map every badge digest back to its score (scores are 0-100)."""
+    return {_render_badge(score).digest: score for score in range(101)}
+
+
+def _badge_response(request: Request, badge: RenderedBadge, cache_control: str) -> Response:
+    """Build a cacheable badge response, answering 304 on a matching ETag."""
+    headers = {"ETag": badge.etag, "Cache-Control": cache_control}
+    
+    if _etag_matches(request.headers.get("if-none-match"), badge.etag):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=badge.body, media_type=badge.media_type, headers=headers)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against a strong ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Check whether the client accepts a gzip-encoded response."""
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
@@ -5,19 +5,46 @@ with ROI metrics and integration capabilities.
 Now fetches from database!
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
 from database import get_db
+from services.cache import TTLCache
+from services.pagination import apply_keyset, page_of
+from services.comparisons import (
+    COMPARE_COLUMNS,
+    ALTERNATIVES_PER_PRODUCT,
+    build_startup_metrics,
+    compare_two,
+    compare_many,
+    comparison_index,
+    find_alternatives,
+)
 
 router = APIRouter()
 
+MAX_COMPARE = 10
+_LIST_ORDER = ["id"]
+
+# (sorted ids, updated_at per id) -> comparison response
+_comparison_cache = TTLCache(maxsize=1024, ttl=600)
+
 
 @router.get("/")
-def get_all_comparisons() -> dict:
+def get_all_comparisons(
+    status: str = "approved",
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+) -> dict:
     """
-    Get all startups available for comparison from database.
+    Get a page of startups available for comparison from database.
+    
+    Pass `next_cursor` back as `cursor` to fetch the following page.
     """
     db = get_db()
-    result = db.table("products").select("id, name, category, trust_score").execute()
+    query = db.table("products").select("id, name, category, trust_score").eq("status", status)
+    query = apply_keyset(query, _LIST_ORDER, cursor, desc=False)
+    result = query.limit(limit + 1).execute()
+    products, next_cursor = page_of(result.data or [], _LIST_ORDER, limit)
     
     startups = [
         {
@@ -26,96 +53,92 @@ def get_all_comparisons() -> dict:
             "category": product["category"],
             "trust_score": product["trust_score"],
         }
-        for product in (result.data or [])
+        for product in products
     ]
-    return {"startups": startups}
+    return {"startups": startups, "next_cursor": next_cursor}
 
 
-@router.get("/{product_id_1}/vs/{product_id_2}")
-def compare_startups(product_id_1: int, product_id_2: int) -> dict:
+@router.get("/compare")
+def compare_multiple(ids: str = Query(..., description="Comma-separated product ids, e.g. 1,2,3")) -> dict:
     """
-    Compare two startups side-by-side with enterprise metrics.
+    Compare 2-10 startups side-by-side with per-metric winners and ranks.
+    
+    All products are loaded in one query; results are cached until one
+    of the compared products is updated.
     """
-    db = get_db()
+    try:
+        product_ids = sorted({int(part) for part in ids.split(",") if part.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
     
-    # Get both products from database
-    result_1 = db.table("products").select("*").eq("id", product_id_1).execute()
-    result_2 = db.table("products").select("*").eq("id", product_id_2).execute()
+    if not 2 <= len(product_ids) <= MAX_COMPARE:
+        raise HTTPException(status_code=400, detail=f"Compare between 2 and {MAX_COMPARE} distinct products")
     
-    if not result_1.data:
-        raise HTTPException(status_code=404, detail=f"Product {product_id_1} not found")
-    if not result_2.data:
-        raise HTTPException(status_code=404, detail=f"Product {product_id_2} not found")
+    products = _fetch_products(product_ids)
     
-    p1 = result_1.data[0]
-    p2 = result_2.data[0]
+    cache_key = (tuple(product_ids), tuple(products[pid].get("updated_at") for pid in product_ids))
+    return _comparison_cache.get_or_set(
+        cache_key,
+        lambda: compare_many([{**build_startup_metrics(products[pid]), "id": pid} for pid in product_ids]),
+    )
+
+
+@router.get("/{product_id}/alternatives")
+def get_alternatives(
+    product_id: int,
+    limit: int = Query(ALTERNATIVES_PER_PRODUCT, ge=1, le=ALTERNATIVES_PER_PRODUCT),
+) -> dict:
+    """
+    Get the best alternatives to a startup within its category.
     
-    # Generate comparison metrics (simulated for MVP)
-    startup_1 = {
-        "name": p1["name"],
-        "category": p1["category"],
-        "trust_score": p1["trust_score"],
-        "pricing_tier": "Enterprise",
-        "avg_implementation_days": 14,
-        "roi_percentage": 280 + (p1["trust_score"] * 2),
-        "integration_count": 30 + p1["market_traction"],
-        "support_sla": "24/7 Priority",
-        "security_certifications": ["SOC2", "GDPR"],
-        "key_features": ["Custom Solutions", "API-first", "Real-time"],
-        "ideal_for": f"Enterprises in {p1['category']} looking for trusted solutions",
-    }
+    Served from the precomputed category index; products outside their
+    category's top tier are compared against that tier on the fly.
+    """
+    alternatives = comparison_index.get_alternatives(product_id)
     
-    startup_2 = {
-        "name": p2["name"],
-        "category": p2["category"],
-        "trust_score": p2["trust_score"],
-        "pricing_tier": "Enterprise",
-        "avg_implementation_days": 14,
-        "roi_percentage": 280 + (p2["trust_score"] * 2),
-        "integration_count": 30 + p2["market_traction"],
-        "support_sla": "24/7 Priority",
-        "security_certifications": ["SOC2", "GDPR"],
-        "key_features": ["Custom Solutions", "API-first", "Real-time"],
-        "ideal_for": f"Enterprises in {p2['category']} looking for trusted solutions",
-    }
-    
-    # Calculate winner for each metric
-    comparison_results = {
-        "trust_score": {
-            "winner": startup_1["name"] if startup_1["trust_score"] > startup_2["trust_score"] else startup_2["name"],
-            "values": {startup_1["name"]: startup_1["trust_score"], startup_2["name"]: startup_2["trust_score"]},
-        },
-        "roi_percentage": {
-            "winner": startup_1["name"] if startup_1["roi_percentage"] > startup_2["roi_percentage"] else startup_2["name"],
-            "values": {startup_1["name"]: startup_1["roi_percentage"], startup_2["name"]: startup_2["roi_percentage"]},
-        },
-        "implementation_speed": {
-            "winner": startup_1["name"] if startup_1["avg_implementation_days"] < startup_2["avg_implementation_days"] else startup_2["name"],
-            "values": {startup_1["name"]: startup_1["avg_implementation_days"], startup_2["name"]: startup_2["avg_implementation_days"]},
-            "unit": "days",
-        },
-        "integrations": {
-            "winner": startup_1["name"] if startup_1["integration_count"] > startup_2["integration_count"] else startup_2["name"],
-            "values": {startup_1["name"]: startup_1["integration_count"], startup_2["name"]: startup_2["integration_count"]},
-        },
-    }
+    if alternatives is None:
+        product = _fetch_products([product_id])[product_id]
+        startup = {**build_startup_metrics(product), "id": product_id}
+        candidates = comparison_index.get_category_members(product.get("category") or "")
+        alternatives = find_alternatives(startup, candidates, limit)
     
     return {
-        "comparison": {
-            "startup_1": {**startup_1, "id": product_id_1},
-            "startup_2": {**startup_2, "id": product_id_2},
-        },
-        "metrics_comparison": comparison_results,
-        "recommendation": _generate_recommendation(startup_1, startup_2),
+        "product_id": product_id,
+        "alternatives": alternatives[:limit],
+        "total": len(alternatives[:limit]),
     }
 
 
-def _generate_recommendation(s1: dict, s2: dict) -> str:
-    """Generate AI recommendation based on comparison."""
-    score_1 = s1["trust_score"] + (s1["roi_percentage"] / 10) + s1["integration_count"]
-    score_2 = s2["trust_score"] + (s2["roi_percentage"] / 10) + s2["integration_count"]
+@router.get("/{product_id_1}/vs/{product_id_2}")
+def compare_startups(product_id_1: int, product_id_2: int) -> dict:
+    """
+    Compare two startups side-by-side with enterprise metrics.
+    
+    Leading products in each category are served from the precomputed
+    comparison index without touching the database.
+    """
+    startup_1 = comparison_index.get_startup(product_id_1)
+    startup_2 = comparison_index.get_startup(product_id_2)
+    
+    if startup_1 is None or startup_2 is None:
+        products = _fetch_products([product_id_1, product_id_2])
+        startup_1 = {**build_startup_metrics(products[product_id_1]), "id": product_id_1}
+        startup_2 = {**build_startup_metrics(products[product_id_2]), "id": product_id_2}
+    
+    return compare_two(startup_1, startup_2)
+
+
+def _fetch_products(product_ids: list[int]) -> dict[int, dict]:
+    """Load products by id in one query; 404 naming any that are missing."""
+    db = get_db()
+    result = db.table("products").select(COMPARE_COLUMNS).in_("id", product_ids).execute()
+    
+    products = {p["id"]: p for p in result.data or []}
+    
+    missing = [pid for pid in product_ids if pid not in products]
+    if len(missing) == 1:
+        raise HTTPException(status_code=404, detail=f"Product {missing[0]} not found")
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Products {', '.join(map(str, missing))} not found")
     
-    if score_1 > score_2:
-        return f"{s1['name']} is recommended for enterprises prioritizing ROI and credibility."
-    else:
-        return f"{s2['name']} is recommended for enterprises prioritizing ROI and credibility."
+    return products
@@ -1,85 +1,182 @@
 """EthAum AI - Deals Router with Supabase Database (AppSumo-Inspired Enterprise Pilots)."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi.responses import Response
+from typing import Optional
+from datetime import datetime, timezone
 from database import get_db
-from schemas.deal import DealResponse, PilotRequest, PilotRequestResponse
+from schemas.deal import DealResponse, PilotInboxRead, PilotRequest, PilotRequestResponse
+from services.deals import get_deal_startup_name, render_deals_page
+from services.pagination import apply_keyset, page_of
+from services.pilot_ingestion import IdempotencyConflictError, QueueFullError, get_submission, submit_pilot_request
 
 router = APIRouter()
 
+_INBOX_COLUMNS = "id, deal_id, product_id, owner_id, company_name, email, message, status, created_at, read_at"
+_INBOX_ORDER = ["created_at", "id"]
+
 
 @router.get("/", response_model=list[DealResponse])
-def get_deals() -> list[DealResponse]:
+def get_deals(
+    category: Optional[str] = None,
+    min_credibility: Optional[int] = Query(None, ge=0, le=100),
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> Response:
     """
     Get all available enterprise pilot deals.
     
     These are low-cost POCs backed by AI credibility scores,
     replacing traditional AppSumo-style discounts with trust-verified pilots.
-    """
-    db = get_db()
     
-    # Join deals with products to get startup names and credibility scores
-    deals_result = db.table("deals").select("*").eq("is_active", True).execute()
-    
-    formatted_deals = []
-    for deal in deals_result.data or []:
-        # Get product info
-        product_result = db.table("products").select("name, trust_score").eq("id", deal["product_id"]).execute()
-        product = product_result.data[0] if product_result.data else {"name": "Unknown", "trust_score": 0}
-        
-        formatted_deals.append(DealResponse(
-            id=deal["id"],
-            product_id=deal["product_id"],
-            startup_name=product["name"],
-            pilot_title=deal["title"],
-            description=deal["description"] or "",
-            ideal_buyer="Enterprise",
-            credibility_score=product["trust_score"],
-            pilot_duration=f"{deal['trial_days']} days",
-            status="open" if deal["is_active"] else "closed",
-        ))
-    
-    return formatted_deals
+    Served from a cached, pre-serialized catalog; the total number of
+    matching deals is returned in the X-Total-Count header.
+    """
+    body, total = render_deals_page(category, min_credibility, limit, offset)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"X-Total-Count": str(total)},
+    )
 
 
-@router.post("/request", response_model=PilotRequestResponse)
-def request_pilot(request: PilotRequest) -> PilotRequestResponse:
+@router.post("/request", response_model=PilotRequestResponse, status_code=202)
+def request_pilot(
+    request: PilotRequest,
+    idempotency_key: Optional[str] = Header(None),
+) -> PilotRequestResponse:
     """
     Submit a request for an enterprise pilot.
-    """
-    db = get_db()
     
-    # Find the deal
-    deal_result = db.table("deals").select("*, products(name)").eq("id", request.deal_id).execute()
-    
-    if not deal_result.data:
+    The request is queued and stored in the background; poll
+    /request/{request_id} for its status. Resubmitting with the same
+    Idempotency-Key header (for the same deal and contact email) returns
+    the original submission; reusing a key for a different request is
+    rejected with 409.
+    """
+    startup_name = get_deal_startup_name(request.deal_id)
+    if startup_name is None:
         raise HTTPException(status_code=404, detail="Deal not found")
     
-    deal = deal_result.data[0]
-    
-    # Get product name
-    product_result = db.table("products").select("name").eq("id", deal["product_id"]).execute()
-    startup_name = product_result.data[0]["name"] if product_result.data else "Unknown"
-    
-    # Create pilot request in database
-    result = db.table("pilot_requests").insert({
-        "deal_id": request.deal_id,
-        "company_name": request.company_name,
-        "email": request.contact_email,
-        "message": getattr(request, 'message', None),
-        "status": "pending",
-    }).execute()
+    try:
+        submission, _ = submit_pilot_request(
+            deal_id=request.deal_id,
+            company_name=request.company_name,
+            email=request.contact_email,
+            message=getattr(request, 'message', None),
+            idempotency_key=idempotency_key,
+        )
+    except IdempotencyConflictError as error:
+        raise HTTPException(status_code=409, detail=str(error))
+    except QueueFullError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many pilot requests right now, please try again shortly",
+            headers={"Retry-After": "5"},
+        )
     
     return PilotRequestResponse(
         success=True,
         message=f"Pilot request submitted successfully! {startup_name} will contact you within 24 hours.",
         deal_id=request.deal_id,
         company_name=request.company_name,
+        request_id=submission["request_id"],
+        status=submission["status"],
     )
 
 
+@router.get("/request/{request_id}")
+def get_pilot_request_status(request_id: str) -> dict:
+    """Get the ingestion status of a submitted pilot request."""
+    submission = get_submission(request_id)
+    if submission is None:
+        raise HTTPException(status_code=404, detail="Pilot request not found")
+    return dict(submission)
+
+
 @router.get("/requests")
-def get_pilot_requests() -> list[dict]:
-    """Get all pilot requests (admin endpoint)."""
+def get_pilot_requests(
+    x_clerk_user_id: Optional[str] = Header(None),
+    deal_id: Optional[int] = None,
+    owner_id: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    unread_only: bool = False,
+    limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    Get a page of the pilot request inbox, newest first.
+    
+    Founders only see requests for their own products; admins see every
+    request and may filter by owner_id. Pass `next_cursor` back as
+    `cursor` to fetch the following page.
+    """
+    user = _get_inbox_user(x_clerk_user_id)
+    if user.get("role") != "admin":
+        owner_id = user["id"]
+    
     db = get_db()
-    result = db.table("pilot_requests").select("*").execute()
-    return result.data or []
+    
+    query = db.table("pilot_requests").select(_INBOX_COLUMNS)
+    if owner_id:
+        query = query.eq("owner_id", owner_id)
+    if deal_id is not None:
+        query = query.eq("deal_id", deal_id)
+    if status:
+        query = query.eq("status", status)
+    if created_after:
+        query = query.gte("created_at", created_after.isoformat())
+    if created_before:
+        query = query.lt("created_at", created_before.isoformat())
+    if unread_only:
+        query = query.is_("read_at", "null")
+    
+    query = apply_keyset(query, _INBOX_ORDER, cursor)
+    result = query.limit(limit + 1).execute()
+    requests, next_cursor = page_of(result.data or [], _INBOX_ORDER, limit)
+    
+    counter = db.table("pilot_inbox_counters").select("unread_count").eq("user_id", user["id"]).execute()
+    
+    return {
+        "requests": requests,
+        "next_cursor": next_cursor,
+        "unread_count": counter.data[0]["unread_count"] if counter.data else 0,
+    }
+
+
+@router.post("/requests/read")
+def mark_pilot_requests_read(
+    update: PilotInboxRead,
+    x_clerk_user_id: Optional[str] = Header(None),
+) -> dict:
+    """Mark pilot requests in the caller's inbox as read."""
+    user = _get_inbox_user(x_clerk_user_id)
+    
+    db = get_db()
+    
+    query = db.table("pilot_requests").update({
+        "read_at": datetime.now(timezone.utc).isoformat(),
+    }).eq("owner_id", user["id"]).is_("read_at", "null")
+    if update.ids is not None:
+        if not update.ids:
+            return {"success": True, "marked_read": 0}
+        query = query.in_("id", update.ids)
+    
+    result = query.execute()
+    
+    return {"success": True, "marked_read": len(result.data or [])}
+
+
+def _get_inbox_user(clerk_user_id: Optional[str]) -> dict:
+    """Resolve the inbox owner from the Clerk header."""
+    if not clerk_user_id:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    
+    db = get_db()
+    user_result = db.table("users").select("id, role").eq("clerk_id", clerk_user_id).execute()
+    if not user_result.data:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    return user_result.data[0]
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException
 from database import get_db
+from services.cache import single_flight
 from services.credibility import (
     calculate_overall_credibility_score,
     calculate_emerging_quadrant_position,
@@ -66,6 +67,7 @@ def get_overall_credibility(product_id: int) -> dict:
 
 
 @router.get("/quadrant")
+@single_flight(timeout=15)
 def get_emerging_quadrant() -> dict:
     """
     Gartner-style Emerging Quadrant view of all Series A-D startups.
@@ -170,6 +172,6 @@ def get_embeddable_badge(product_id: int) -> dict:
         "score": credibility_data["overall_credibility_score"],
         "badge": credibility_data["badge"],
         "embed_code": f'<div data-ethaum-badge="{product_id}"></div>',
-        "svg_url": f"https://ethaum.ai/badges/{product_id}.svg",
+        "svg_url": f"https://ethaum.ai/api/v1/badges/{product_id}/image",
         "verified_by": "EthAum.AI",
     }
@@ -4,6 +4,8 @@ from fastapi import APIRouter, HTTPException, Header
 from typing import Optional
 from database import get_db
 from schemas.launch import LaunchCreate, LaunchResponse
+from services.cache import invalidate_tags, single_flight
+from services.collaborative import forget_interaction, record_interaction
 
 router = APIRouter()
 
@@ -38,6 +40,7 @@ def create_launch(
     
     if result.data:
         new_launch = result.data[0]
+        invalidate_tags(f"product:{launch.product_id}")
         return LaunchResponse(
             id=new_launch["id"],
             product_id=new_launch["product_id"],
@@ -83,6 +86,8 @@ def upvote_launch(
         db.table("upvotes").delete().eq("user_id", user_id).eq("launch_id", launch_id).execute()
         new_upvotes = max(0, launch["upvotes"] - 1)
         db.table("launches").update({"upvotes": new_upvotes}).eq("id", launch_id).execute()
+        forget_interaction(user_id, launch["product_id"])
+        invalidate_tags(f"product:{launch['product_id']}")
         return {"id": launch_id, "upvotes": new_upvotes, "user_upvoted": False}
     else:
         # Add upvote
@@ -93,6 +98,8 @@ def upvote_launch(
         }).execute()
         new_upvotes = launch["upvotes"] + 1
         db.table("launches").update({"upvotes": new_upvotes}).eq("id", launch_id).execute()
+        record_interaction(user_id, launch["product_id"])
+        invalidate_tags(f"product:{launch['product_id']}")
         return {"id": launch_id, "upvotes": new_upvotes, "user_upvoted": True}
 
 
@@ -131,6 +138,17 @@ def get_leaderboard(x_clerk_user_id: Optional[str] = Header(None)) -> list[dict]
             upvotes_result = db.table("upvotes").select("launch_id").eq("user_id", user_id).execute()
             user_upvoted_ids = {u["launch_id"] for u in upvotes_result.data or []}
     
+    return [
+        {**entry, "user_upvoted": entry["id"] in user_upvoted_ids}
+        for entry in _ranked_launches()
+    ]
+
+
+@single_flight(timeout=10)
+def _ranked_launches() -> list[dict]:
+    """The leaderboard shared by every viewer; concurrent requests share one query."""
+    db = get_db()
+    
     # Get launches with product info
     result = db.table("launches").select("*, products(name, category)").order("upvotes", desc=True).execute()
     
@@ -145,7 +163,6 @@ def get_leaderboard(x_clerk_user_id: Optional[str] = Header(None)) -> list[dict]
             "upvotes": launch["upvotes"],
             "rank": i + 1,
             "is_featured": launch.get("is_featured", False),
-            "user_upvoted": launch["id"] in user_upvoted_ids,
         })
     
     return leaderboard
@@ -4,9 +4,10 @@ This router provides AI-powered buyer-startup matchmaking
 using explainable heuristics for enterprise acquisition.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from database import get_db
-from services.matchmaking import match_buyers_to_startup
+from services.match_batch import stored_matches
+from services.matchmaking import get_engine, match_buyers_to_startup, match_startups_to_buyer
 
 router = APIRouter()
 
@@ -23,8 +24,12 @@ def get_buyer_matches(product_id: int) -> dict:
     """
     db = get_db()
     
-    # Get product from database
-    result = db.table("products").select("*").eq("id", product_id).execute()
+    # Product inputs plus the matches the batch job stored for them
+    result = db.table("products").select(
+        "id, name, category, trust_score, market_traction, "
+        "product_match_state(category, trust_score, market_traction, profiles_version), "
+        "product_buyer_matches(rank, buyer_id, match_score)"
+    ).eq("id", product_id).execute()
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Product not found")
@@ -35,12 +40,14 @@ def get_buyer_matches(product_id: int) -> dict:
     trust_score = product.get("trust_score", 75)
     market_traction = product.get("market_traction", 70)
     
-    # Run AI matchmaking
-    matches = match_buyers_to_startup(
-        category=product.get("category", "AI/ML"),
-        trust_score=trust_score,
-        market_traction=market_traction,
-    )
+    matches = stored_matches(product, trust_score, market_traction)
+    if matches is None:
+        # Not computed yet, or inputs changed since the last batch run
+        matches = match_buyers_to_startup(
+            category=product.get("category", "AI/ML"),
+            trust_score=trust_score,
+            market_traction=market_traction,
+        )
     
     return {
         "startup": {
@@ -60,3 +67,35 @@ def get_buyer_matches(product_id: int) -> dict:
         "recommended_buyers": matches,
         "total_matches": len(matches),
     }
+
+
+@router.get("/buyers/{buyer_id}/startups")
+def get_startup_matches(
+    buyer_id: int,
+    limit: int = Query(10, ge=1, le=50),
+) -> dict:
+    """
+    Get the best-matching approved startups for an enterprise buyer.
+    
+    Uses the same explainable scoring as buyer matches, from the
+    buyer's side of the marketplace.
+    """
+    buyer = get_engine().buyers_by_id.get(buyer_id)
+    
+    if buyer is None:
+        raise HTTPException(status_code=404, detail="Buyer not found")
+    
+    matches = match_startups_to_buyer(buyer, top_k=limit)
+    
+    return {
+        "buyer": {
+            "id": buyer_id,
+            "buyer_type": buyer["buyer_type"],
+            "description": buyer["description"],
+            "categories": buyer["categories"],
+            "min_trust_score": buyer["min_trust_score"],
+        },
+        "recommended_startups": matches,
+        "total_matches": len(matches),
+    }
+
@@ -1,12 +1,34 @@
 """EthAum AI - Products Router with Supabase Database and User Linking."""
 
-from fastapi import APIRouter, HTTPException, Header
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, HTTPException, Header, Query, Response
 from typing import Optional
 from database import get_db
 from schemas.product import ProductCreate, ProductResponse
+from services.badges import invalidate_badge
+from services.cache import cached_response, invalidate_tags
+from services.deals import invalidate_deals_catalog
+from services.pagination import apply_keyset, page_of
+from services.product_import import initial_product_row
+from services.product_refresh import queue_product_refresh
+from services.search import SUGGEST_LIMIT, get_autocomplete_index, get_search_index, refresh_product_search
 
 router = APIRouter()
 
+LIST_COLUMNS = ["id", "name", "trust_score", "category", "funding_stage", "website", "description", "user_id", "status"]
+LISTABLE_COLUMNS = set(LIST_COLUMNS) | {
+    "tagline", "data_integrity", "market_traction", "user_sentiment", "upvotes", "created_at", "updated_at",
+}
+# sort name -> keyset order, each backed by an index in 013_product_listing_indexes.sql
+LIST_SORTS = {
+    "trust_score": ["trust_score", "id"],
+    "created_at": ["created_at", "id"],
+    "upvotes": ["upvotes", "id"],
+}
+
+# Detail lookups that only need the product row run side by side on this pool
+_detail_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="product-detail")
+
 
 @router.post("/", response_model=ProductResponse)
 def create_product(
@@ -29,25 +51,13 @@ def create_product(
     
     user = user_result.data[0]
     
-    # Calculate initial trust score (base score for new products)
-    initial_score = 70
-    
-    result = db.table("products").insert({
-        "name": product.name,
-        "website": product.website,
-        "category": product.category,
-        "funding_stage": product.funding_stage,
-        "description": product.description,
-        "trust_score": initial_score,
-        "data_integrity": 70,
-        "market_traction": 70,
-        "user_sentiment": 70,
-        "user_id": user["id"],
-        "status": "pending",  # New products require admin approval
-    }).execute()
+    # New products start from base scores and require admin approval
+    result = db.table("products").insert(initial_product_row(product, user["id"])).execute()
     
     if result.data:
         new_product = result.data[0]
+        refresh_product_search(new_product["id"])
+        invalidate_tags("products")
         return ProductResponse(
             id=new_product["id"],
             name=new_product["name"],
@@ -63,13 +73,82 @@ def create_product(
 
 
 @router.get("/", response_model=list[dict])
-def list_products() -> list[dict]:
-    """List all approved startups for marketplace."""
+def list_products(
+    response: Response,
+    sort: str = "trust_score",
+    category: Optional[str] = None,
+    funding_stage: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+) -> list[dict]:
+    """
+    List a page of approved startups for marketplace, highest first by `sort`.
+    
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the
+    following page; it is absent on the last page.
+    """
+    order = LIST_SORTS.get(sort)
+    if order is None:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(LIST_SORTS)}")
+    
+    columns = LIST_COLUMNS
+    if fields:
+        columns = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+        unknown = [column for column in columns if column not in LISTABLE_COLUMNS]
+        if unknown or not columns:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown) or fields}")
+    
     db = get_db()
-    result = db.table("products").select(
-        "id, name, trust_score, category, funding_stage, website, description, user_id, status"
-    ).eq("status", "approved").execute()
-    return result.data if result.data else []
+    
+    # The sort key always comes back so the cursor can be built from the last row
+    query = db.table("products").select(", ".join(dict.fromkeys(columns + order))).eq("status", "approved")
+    if category:
+        query = query.eq("category", category)
+    if funding_stage:
+        query = query.eq("funding_stage", funding_stage)
+    
+    query = apply_keyset(query, order, cursor)
+    result = query.limit(limit + 1).execute()
+    products, next_cursor = page_of(result.data or [], order, limit)
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [{column: product.get(column) for column in columns} for product in products]
+
+
+@router.get("/search")
+def search_products(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    funding_stage: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0),
+) -> dict:
+    """
+    Full-text search over approved startups, ranked by BM25.
+    Facet counts cover all matches for the query; each facet ignores its own filter.
+    """
+    hits, total, facets = get_search_index().search(q, category, funding_stage, limit, offset)
+    
+    return {
+        "query": q,
+        "results": [{**hit.product, "score": hit.score} for hit in hits],
+        "total": total,
+        "facets": facets,
+        "limit": limit,
+        "offset": offset,
+    }
+
+
+@router.get("/suggest")
+def suggest_products(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(SUGGEST_LIMIT, ge=1, le=SUGGEST_LIMIT),
+) -> dict:
+    """As-you-type suggestions: approved startups by trust score, and matching categories."""
+    products, categories = get_autocomplete_index().suggest(prefix, limit)
+    return {"prefix": prefix, "products": products, "categories": categories}
 
 
 @router.get("/my-products")
@@ -93,8 +172,15 @@ def get_my_products(x_clerk_user_id: Optional[str] = Header(None)) -> list[dict]
 
 
 @router.get("/{product_id}")
+@cached_response(ttl=30, stale_ttl=300, tags=lambda product_id: [f"product:{product_id}"])
 def get_product(product_id: int) -> dict:
-    """Get startup details with trust score breakdown."""
+    """
+    Get startup details with trust score breakdown.
+    
+    Once the product row is known, the owner, launch and review count
+    are fetched concurrently, so the response costs one round-trip plus
+    the slowest of the three.
+    """
     db = get_db()
     
     # Get product
@@ -105,22 +191,34 @@ def get_product(product_id: int) -> dict:
     
     product = product_result.data[0]
     
+    owner_future = None
+    if product.get("user_id"):
+        owner_future = _detail_pool.submit(
+            lambda: db.table("users").select("full_name, email").eq("id", product["user_id"]).execute()
+        )
+    launch_future = _detail_pool.submit(
+        lambda: db.table("launches").select("upvotes, rank, is_featured").eq("product_id", product_id).execute()
+    )
+    # Count on the server instead of downloading every review id
+    reviews_future = _detail_pool.submit(
+        lambda: db.table("reviews").select("id", count="exact", head=True).eq("product_id", product_id).execute()
+    )
+    
     # Get owner info if product has user_id
     owner_info = None
-    if product.get("user_id"):
-        owner_result = db.table("users").select("full_name, email").eq("id", product["user_id"]).execute()
+    if owner_future is not None:
+        owner_result = owner_future.result()
         if owner_result.data:
             owner_info = owner_result.data[0]
     
     # Get launch data
-    launch_result = db.table("launches").select("*").eq("product_id", product_id).execute()
+    launch_result = launch_future.result()
     launch_data = launch_result.data[0] if launch_result.data else {
         "upvotes": 0, "rank": 0, "is_featured": False
     }
     
     # Get reviews count
-    reviews_result = db.table("reviews").select("id").eq("product_id", product_id).execute()
-    reviews_count = len(reviews_result.data) if reviews_result.data else 0
+    reviews_count = reviews_future.result().count or 0
     
     return {
         "id": product["id"],
@@ -182,6 +280,10 @@ def update_product(
     }).eq("id", product_id).execute()
     
     if result.data:
+        invalidate_badge(product_id)
+        invalidate_deals_catalog(product_id)
+        queue_product_refresh(product_id, product.category)
+        invalidate_tags(f"product:{product_id}", "products")
         return {"success": True, "message": "Product updated successfully"}
     
     raise HTTPException(status_code=500, detail="Failed to update product")
@@ -1,77 +1,83 @@
 """EthAum AI - Smart Recommendations Router.
 
 Provides AI-powered product recommendations:
-- Similar products by category
+- Similar products by nearest-neighbour features
 - Trending products by recent activity
 - New arrivals
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header
+from typing import Optional
 from database import get_db
 from datetime import datetime, timedelta
+from services.cache import cached_response, single_flight
+from services.collaborative import get_matrix, get_user_history
+from services.similarity import TOP_K_NEIGHBORS, find_similar_products
 
 router = APIRouter()
 
+SIMILARITY_ALGORITHM = "knn: category + funding_stage + trust_score + traction + sentiment + upvotes"
+
 
 @router.get("/similar/{product_id}")
 def get_similar_products(product_id: int, limit: int = 5) -> dict:
     """
     Get products similar to the given product.
-    Based on category matching and trust score proximity.
+    Based on precomputed nearest neighbours over category, funding stage,
+    trust score, market traction, sentiment and upvote volume.
     """
+    limit = max(1, min(limit, TOP_K_NEIGHBORS))
     db = get_db()
     
-    # Get the source product
-    product_result = db.table("products").select("category, trust_score").eq("id", product_id).execute()
-    
-    if not product_result.data:
-        return {"products": [], "algorithm": "category_match"}
+    # Stored neighbours with the source and neighbour fields, in one lookup
+    result = db.table("product_neighbors").select(
+        "similarity, "
+        "source:products!product_id(category, trust_score, funding_stage), "
+        "neighbor:products!neighbor_id(id, name, category, trust_score, website, funding_stage)"
+    ).eq("product_id", product_id).order("rank").limit(limit).execute()
+    
+    if result.data:
+        source = result.data[0]["source"]
+        neighbors = [(row["neighbor"], row["similarity"]) for row in result.data if row.get("neighbor")]
+    else:
+        # Not persisted yet (new or unapproved product): ask the index directly
+        found = find_similar_products(product_id, limit)
+        if found is None:
+            return {"products": [], "algorithm": SIMILARITY_ALGORITHM}
+        source, neighbors = found
     
-    source = product_result.data[0]
     source_category = source["category"]
-    source_score = source["trust_score"]
-    
-    # Find products in same category, excluding the source
-    similar_result = db.table("products").select(
-        "id, name, category, trust_score, website"
-    ).eq("category", source_category).neq("id", product_id).limit(limit).execute()
-    
-    # If not enough in same category, get from other categories
-    similar_products = similar_result.data or []
-    
-    if len(similar_products) < limit:
-        # Get more products ordered by trust score
-        more_result = db.table("products").select(
-            "id, name, category, trust_score, website"
-        ).neq("id", product_id).neq("category", source_category).order(
-            "trust_score", desc=True
-        ).limit(limit - len(similar_products)).execute()
-        
-        similar_products.extend(more_result.data or [])
-    
-    # Calculate similarity score for each
-    for product in similar_products:
-        category_match = 50 if product["category"] == source_category else 20
-        score_diff = 100 - abs(product["trust_score"] - source_score)
-        product["similarity_score"] = int((category_match + score_diff / 2) / 1.5)
-        product["match_reasons"] = []
+    source_score = source["trust_score"] or 0
+    
+    similar_products = []
+    for neighbor, similarity in neighbors:
+        match_reasons = []
+        if neighbor["category"] == source_category:
+            match_reasons.append(f"Same category: {source_category}")
+        if abs((neighbor["trust_score"] or 0) - source_score) <= 10:
+            match_reasons.append("Similar trust score")
+        if neighbor.get("funding_stage") and neighbor["funding_stage"] == source.get("funding_stage"):
+            match_reasons.append(f"Same stage: {neighbor['funding_stage']}")
         
-        if product["category"] == source_category:
-            product["match_reasons"].append(f"Same category: {source_category}")
-        if abs(product["trust_score"] - source_score) <= 10:
-            product["match_reasons"].append("Similar trust score")
-    
-    # Sort by similarity
-    similar_products.sort(key=lambda x: x["similarity_score"], reverse=True)
+        similar_products.append({
+            "id": neighbor["id"],
+            "name": neighbor["name"],
+            "category": neighbor["category"],
+            "trust_score": neighbor["trust_score"],
+            "website": neighbor["website"],
+            "similarity_score": int(round(similarity * 100)),
+            "match_reasons": match_reasons,
+        })
     
     return {
-        "products": similar_products[:limit],
-        "algorithm": "category_match + trust_score_proximity",
+        "products": similar_products,
+        "algorithm": SIMILARITY_ALGORITHM,
         "source_category": source_category,
     }
 
 
 @router.get("/trending")
+@single_flight(timeout=10)
 def get_trending_products(limit: int = 10) -> dict:
     """
     Get trending products based on recent upvotes and reviews.
@@ -107,6 +113,7 @@ def get_trending_products(limit: int = 10) -> dict:
 
 
 @router.get("/new-arrivals")
+@cached_response(ttl=60, stale_ttl=600, tags=lambda **_: ["products"])
 def get_new_arrivals(limit: int = 10) -> dict:
     """
     Get recently added products.
@@ -124,47 +131,104 @@ def get_new_arrivals(limit: int = 10) -> dict:
 
 
 @router.get("/for-you")
-def get_personalized_recommendations(limit: int = 6) -> dict:
+def get_personalized_recommendations(
+    limit: int = 6,
+    x_clerk_user_id: Optional[str] = Header(None)
+) -> dict:
     """
     Get personalized recommendations.
-    For now, returns a mix of trending and high-trust products.
-    Future: Use user behavior to personalize.
+    Signed-in users with upvotes or reviews get products that people with
+    overlapping histories also liked (item-to-item collaborative filtering).
+    Everyone else gets a mix of trending and high-trust products.
     """
     db = get_db()
     
+    user_id = None
+    if x_clerk_user_id:
+        user_result = db.table("users").select("id").eq("clerk_id", x_clerk_user_id).execute()
+        if user_result.data:
+            user_id = user_result.data[0]["id"]
+    
+    history = get_user_history(user_id) if user_id else []
+    recommendations = get_matrix().recommend(history, limit) if history else []
+    
+    if not recommendations:
+        # Cold start: nothing to personalize from yet
+        if not user_id:
+            message = "Sign in for personalized recommendations"
+        elif not history:
+            message = "Upvote or review products to personalize recommendations"
+        else:
+            message = "Not enough activity from similar users yet"
+        return {
+            "products": _trusted_and_trending(limit, exclude=set(history)),
+            "algorithm": "hybrid: high_trust + trending",
+            "personalized": False,
+            "message": message,
+        }
+    
+    ids = {pid for pid, _, because in recommendations} | {because for _, _, because in recommendations}
+    details = db.table("products").select("id, name, category, trust_score, status").in_("id", list(ids)).execute()
+    by_id = {p["id"]: p for p in details.data or []}
+    
+    products = []
+    for product_id, score, because in recommendations:
+        product = by_id.get(product_id)
+        if not product or product.get("status") != "approved":
+            continue
+        liked = by_id.get(because, {}).get("name")
+        products.append({
+            "id": product["id"],
+            "name": product["name"],
+            "category": product["category"],
+            "trust_score": product["trust_score"],
+            "reason": f"Popular with people who liked {liked}" if liked else "Popular with people like you",
+        })
+    
+    if len(products) < limit:
+        seen = set(history) | {p["id"] for p in products}
+        products.extend(_trusted_and_trending(limit - len(products), exclude=seen))
+    
+    return {
+        "products": products[:limit],
+        "algorithm": "item-item collaborative filtering",
+        "personalized": True,
+    }
+
+
+def _trusted_and_trending(limit: int, exclude: set) -> list[dict]:
+    """High trust score and most upvoted products, for users without a usable history."""
+    db = get_db()
+    
     # Get high trust score products
     high_trust = db.table("products").select(
         "id, name, category, trust_score"
-    ).gte("trust_score", 80).order("trust_score", desc=True).limit(limit // 2).execute()
+    ).gte("trust_score", 80).order("trust_score", desc=True).limit(limit // 2 + len(exclude)).execute()
     
     # Get trending (most upvoted)
     trending = db.table("launches").select(
         "products(id, name, category, trust_score)"
-    ).order("upvotes", desc=True).limit(limit // 2).execute()
+    ).order("upvotes", desc=True).limit(limit // 2 + len(exclude)).execute()
     
     products = []
-    seen_ids = set()
+    seen_ids = set(exclude)
     
     for p in (high_trust.data or []):
-        if p["id"] not in seen_ids:
+        if p["id"] not in seen_ids and len(products) < limit // 2:
             products.append({**p, "reason": "High credibility score"})
             seen_ids.add(p["id"])
     
     for launch in (trending.data or []):
         p = launch.get("products")
-        if p and p["id"] not in seen_ids:
+        if p and p["id"] not in seen_ids and len(products) < limit:
             products.append({**p, "reason": "Trending now"})
             seen_ids.add(p["id"])
     
-    return {
-        "products": products[:limit],
-        "algorithm": "hybrid: high_trust + trending",
-        "personalized": False,
-        "message": "Sign in for personalized recommendations",
-    }
+    return products[:limit]
 
 
 @router.get("/categories/{category}")
+@cached_response(ttl=60, stale_ttl=600, tags=lambda **_: ["products"])
 def get_products_by_category(category: str, limit: int = 10) -> dict:
     """
     Get top products in a specific category.
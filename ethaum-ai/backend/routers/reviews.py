@@ -7,7 +7,9 @@ from fastapi import APIRouter, HTTPException, Header
 from typing import Optional
 from database import get_db
 from schemas.review import ReviewCreate, ReviewResponse
+from services.cache import cached_response, invalidate_tags
 from services.sentiment import analyze_sentiment, get_sentiment_score
+from services.collaborative import forget_interaction, record_interaction
 from services.scoring import update_product_trust_score
 
 router = APIRouter()
@@ -72,6 +74,9 @@ def create_review(
     
     if result.data:
         new_review = result.data[0]
+        if new_review.get("user_id"):
+            record_interaction(new_review["user_id"], review.product_id)
+        invalidate_tags(f"reviews:{review.product_id}", f"product:{review.product_id}")
         
         # Update product's trust score after new review
         try:
@@ -92,6 +97,7 @@ def create_review(
 
 
 @router.get("/{product_id}")
+@cached_response(ttl=30, stale_ttl=300, tags=lambda product_id: [f"reviews:{product_id}"])
 def get_reviews_for_product(product_id: int) -> list[dict]:
     """Get all reviews for a specific product with sentiment info."""
     db = get_db()
@@ -127,6 +133,7 @@ def get_reviews_for_product(product_id: int) -> list[dict]:
 
 
 @router.get("/{product_id}/sentiment-summary")
+@cached_response(ttl=60, stale_ttl=600, tags=lambda product_id: [f"reviews:{product_id}"])
 def get_sentiment_summary(product_id: int) -> dict:
     """Get AI sentiment summary for a product's reviews."""
     db = get_db()
@@ -183,14 +190,17 @@ def delete_review(
     db = get_db()
     
     # Get review to find product_id for score update
-    review_result = db.table("reviews").select("product_id").eq("id", review_id).execute()
+    review_result = db.table("reviews").select("product_id, user_id").eq("id", review_id).execute()
     product_id = review_result.data[0]["product_id"] if review_result.data else None
     
     # Delete review
     db.table("reviews").delete().eq("id", review_id).execute()
+    if review_result.data and review_result.data[0].get("user_id"):
+        forget_interaction(review_result.data[0]["user_id"], product_id)
     
     # Update product trust score
     if product_id:
+        invalidate_tags(f"reviews:{product_id}", f"product:{product_id}")
         try:
             update_product_trust_score(product_id)
         except Exception:
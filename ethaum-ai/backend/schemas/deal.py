@@ -1,6 +1,7 @@
 """EthAum AI - Deal Schemas for AppSumo-Style Pilots."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Optional
 
 
 class DealResponse(BaseModel):
@@ -21,8 +22,8 @@ class PilotRequest(BaseModel):
     """Schema for requesting a pilot."""
 
     deal_id: int
-    company_name: str
-    contact_email: str
+    company_name: str = Field(..., min_length=1, max_length=255)
+    contact_email: str = Field(..., min_length=3, max_length=255)
 
 
 class PilotRequestResponse(BaseModel):
@@ -31,4 +32,12 @@ class PilotRequestResponse(BaseModel):
     success: bool
     message: str
     deal_id: int
-    company_name: str
+    company_name: str = Field(..., max_length=255)
+    request_id: Optional[str] = None
+    status: Optional[str] = None  # "queued", "stored" or "failed"
+
+
+class PilotInboxRead(BaseModel):
+    """Schema for marking pilot requests as read."""
+
+    ids: Optional[list[int]] = None  # None marks the whole inbox as read
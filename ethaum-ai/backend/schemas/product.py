@@ -1,7 +1,7 @@
 """EthAum AI - Product Schemas."""
 
-from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from pydantic import BaseModel, Field, HttpUrl
+from typing import Literal, Optional
 
 
 class ProductCreate(BaseModel):
@@ -31,3 +31,9 @@ class ProductWithOwner(ProductResponse):
     """Product with owner information."""
     owner_name: Optional[str] = None
     owner_email: Optional[str] = None
+
+
+class ProductBulkAction(BaseModel):
+    """Schema for moderating many products at once."""
+    ids: list[int] = Field(..., min_length=1, max_length=500)
+    action: Literal["approve", "reject", "delete"]
@@ -0,0 +1,198 @@
+"""EthAum AI - Admin Audit Log Service.
+
+Admin actions are recorded without an extra round-trip on the request:
+each event is appended to a bounded in-memory buffer and a background
+flusher writes the buffer to `admin_audit_log` in batches.
+
+When the buffer is full (the database is down or slow), recording
+blocks briefly while the flusher catches up; only if that wait runs
+out is the oldest buffered event dropped, and the drop is logged.
+Whatever is still buffered is written on shutdown.
+"""
+
+import logging
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from database import get_db
+
+logger = logging.getLogger(__name__)
+
+BUFFER_CAPACITY = 10000
+FLUSH_INTERVAL_SECONDS = 5
+FLUSH_BATCH_SIZE = 200
+# How long a request waits for room in a full buffer before dropping the oldest event
+ENQUEUE_TIMEOUT_SECONDS = 2.0
+
+
+class AuditBuffer:
+    """
+    Bounded FIFO of audit events shared by request threads and the flusher.
+
+    Producers wake the flusher early once a full batch is waiting, and
+    wait for room when the buffer is at capacity.
+    """
+
+    def __init__(self, capacity: int = BUFFER_CAPACITY):
+        self.capacity = capacity
+        self._events: deque[dict] = deque()
+        self._cond = threading.Condition()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.backpressure_waits = 0
+        self.failed_flushes = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def put(self, event: dict, timeout: float = ENQUEUE_TIMEOUT_SECONDS) -> None:
+        """Append an event, waiting up to `timeout` for room if the buffer is full."""
+        with self._cond:
+            if len(self._events) >= self.capacity:
+                self.backpressure_waits += 1
+                self._cond.notify_all()
+                if not self._cond.wait_for(lambda: len(self._events) < self.capacity, timeout):
+                    dropped = self._events.popleft()
+                    self.dropped += 1
+                    logger.error("Audit buffer full; dropped %s event %s", dropped["action"], dropped["event_id"])
+            self._events.append(event)
+            self.enqueued += 1
+            if len(self._events) >= FLUSH_BATCH_SIZE:
+                self._cond.notify_all()
+
+    def take(self, limit: int) -> list[dict]:
+        """Remove and return up to `limit` of the oldest events."""
+        with self._cond:
+            batch = [self._events.popleft() for _ in range(min(limit, len(self._events)))]
+            self._cond.notify_all()
+            return batch
+
+    def requeue(self, batch: list[dict]) -> None:
+        """Put a batch that failed to write back at the front, as far as there is room."""
+        with self._cond:
+            room = max(self.capacity - len(self._events), 0)
+            keep = batch[len(batch) - room:] if len(batch) > room else batch
+            self.dropped += len(batch) - len(keep)
+            self._events.extendleft(reversed(keep))
+
+    def wait_for_batch(self, timeout: float, stop: threading.Event) -> None:
+        """Block until a full batch is waiting, `stop` is set or `timeout` passes."""
+        with self._cond:
+            self._cond.wait_for(lambda: stop.is_set() or len(self._events) >= FLUSH_BATCH_SIZE, timeout)
+
+    def wake(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+
+audit_buffer = AuditBuffer()
+
+_stop = threading.Event()
+_flusher: Optional[threading.Thread] = None
+
+
+def record_admin_action(
+    admin: dict,
+    action: str,
+    target_type: str,
+    target_id: Any = None,
+    details: Optional[dict] = None,
+) -> None:
+    """
+    Queue one admin action for the audit log.
+
+    Args:
+        admin: The acting admin, as returned by `verify_admin`.
+        action: What was done, e.g. "product.approve".
+        target_type: Kind of object acted on, e.g. "product".
+        target_id: Id of that object, if there is a single one.
+        details: Extra JSON-serialisable context.
+    """
+    try:
+        audit_buffer.put({
+            "event_id": str(uuid.uuid4()),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "admin_id": admin.get("id"),
+            "admin_email": admin.get("email"),
+            "action": action,
+            "target_type": target_type,
+            "target_id": None if target_id is None else str(target_id),
+            "details": details or {},
+        })
+    except Exception:
+        logger.exception("Failed to record admin action %s", action)
+
+
+def flush_audit_log() -> int:
+    """
+    Write buffered events to `admin_audit_log`, oldest first.
+
+    Stops at the first failed batch, which is put back for the next
+    flush. Returns the number of events written.
+    """
+    db = get_db()
+    written = 0
+    while True:
+        batch = audit_buffer.take(FLUSH_BATCH_SIZE)
+        if not batch:
+            return written
+        try:
+            db.table("admin_audit_log").upsert(batch, on_conflict="event_id", ignore_duplicates=True).execute()
+        except Exception:
+            logger.exception("Failed to flush %d audit events, will retry", len(batch))
+            audit_buffer.failed_flushes += 1
+            audit_buffer.requeue(batch)
+            return written
+        written += len(batch)
+        audit_buffer.written += len(batch)
+
+
+def audit_metrics() -> dict:
+    """Buffer depth and lifetime counters for this worker."""
+    return {
+        "buffered": len(audit_buffer),
+        "capacity": audit_buffer.capacity,
+        "enqueued": audit_buffer.enqueued,
+        "written": audit_buffer.written,
+        "dropped": audit_buffer.dropped,
+        "backpressure_waits": audit_buffer.backpressure_waits,
+        "failed_flushes": audit_buffer.failed_flushes,
+    }
+
+
+def start_flusher() -> None:
+    """Start the background flush thread for this worker."""
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    _stop.clear()
+    _flusher = threading.Thread(target=_flush_loop, name="admin-audit-flusher", daemon=True)
+    _flusher.start()
+
+
+def stop_flusher() -> None:
+    """Stop the flush thread and write out everything still buffered."""
+    _stop.set()
+    audit_buffer.wake()
+    if _flusher is not None:
+        _flusher.join(timeout=FLUSH_INTERVAL_SECONDS)
+    flush_audit_log()
+
+
+def _flush_loop() -> None:
+    while not _stop.is_set():
+        audit_buffer.wait_for_batch(FLUSH_INTERVAL_SECONDS, _stop)
+        if _stop.is_set():
+            return
+        failures = audit_buffer.failed_flushes
+        try:
+            flush_audit_log()
+        except Exception:
+            logger.exception("Audit log flush failed")
+        if audit_buffer.failed_flushes != failures:
+            # Back off instead of spinning on a full buffer while the database is unavailable
+            _stop.wait(FLUSH_INTERVAL_SECONDS)
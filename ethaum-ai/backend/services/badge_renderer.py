@@ -0,0 +1,193 @@
+"""EthAum AI - Embeddable Badge Rendering Service.
+
+Renders the trust badge shown on startup websites. The image depends
+only on (score, level, color), so every variant is rendered once per
+worker and addressed by a digest of its bytes. That digest doubles as
+the strong ETag and as the immutable URL of the image. The HTML preview
+page is cached the same way, together with its gzip encoding.
+
+PNG output is optional and only available when `cairosvg` is installed.
+"""
+
+import gzip
+import hashlib
+from functools import lru_cache
+from html import escape
+from typing import NamedTuple, Optional
+
+try:
+    import cairosvg
+except ImportError:  # PNG badges are an optional extra
+    cairosvg = None
+
+# Bump when the template changes so cached digests roll over
+BADGE_TEMPLATE_VERSION = "1"
+
+_LABEL = "EthAum Verified"
+_CHAR_WIDTH = 7
+_PADDING = 10
+
+
+class RenderedBadge(NamedTuple):
+    """A rendered badge and its content address."""
+    body: bytes
+    media_type: str
+    digest: str
+    etag: str
+
+
+class RenderedPreview(NamedTuple):
+    """A rendered preview page, pre-compressed for gzip clients."""
+    html: bytes
+    gzipped: bytes
+    digest: str
+
+
+@lru_cache(maxsize=512)
+def render_badge_svg(score: int, level: str, color: str) -> RenderedBadge:
+    """
+    Render a flat two-part SVG badge: "EthAum Verified | <level> <score>".
+
+    Args:
+        score: Trust score shown on the badge (0-100).
+        level: Badge level label, e.g. "Gold".
+        color: Hex color for the value half of the badge.
+
+    Returns:
+        RenderedBadge with the SVG bytes and their digest.
+    """
+    value = f"{level} {score}"
+    label_width = len(_LABEL) * _CHAR_WIDTH + _PADDING * 2
+    value_width = len(value) * _CHAR_WIDTH + _PADDING * 2
+    width = label_width + value_width
+
+    svg = f"""<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="24" role="img" aria-label="{_LABEL}: {value}">
+<title>{_LABEL}: {value}</title>
+<linearGradient id="s" x2="0" y2="100%"><stop offset="0" stop-color="#fff" stop-opacity=".12"/><stop offset="1" stop-opacity=".12"/></linearGradient>
+<clipPath id="r"><rect width="{width}" height="24" rx="5" fill="#fff"/></clipPath>
+<g clip-path="url(#r)">
+<rect width="{label_width}" height="24" fill="#4f46e5"/>
+<rect x="{label_width}" width="{value_width}" height="24" fill="{color}"/>
+<rect width="{width}" height="24" fill="url(#s)"/>
+</g>
+<g fill="#fff" text-anchor="middle" font-family="Verdana,Geneva,DejaVu Sans,sans-serif" font-size="11" font-weight="600">
+<text x="{label_width / 2}" y="16">{_LABEL}</text>
+<text x="{label_width + value_width / 2}" y="16">{value}</text>
+</g>
+</svg>""".encode("utf-8")
+
+    digest = _digest(svg)
+    return RenderedBadge(svg, "image/svg+xml", digest, f'"{digest}"')
+
+
+@lru_cache(maxsize=512)
+def render_badge_png(score: int, level: str, color: str) -> Optional[RenderedBadge]:
+    """Render the PNG variant of a badge, or None if cairosvg is missing."""
+    if cairosvg is None:
+        return None
+
+    svg = render_badge_svg(score, level, color)
+    png = cairosvg.svg2png(bytestring=svg.body, scale=2)
+    # PNGs share the SVG's address so one URL family covers both formats,
+    # but carry their own strong ETag since the bytes differ
+    return RenderedBadge(png, "image/png", svg.digest, f'"{svg.digest}-png"')
+
+
+@lru_cache(maxsize=2048)
+def render_badge_preview(
+    product_id: int,
+    name: str,
+    score: int,
+    level: str,
+    color: str,
+) -> RenderedPreview:
+    """
+    Render the standalone HTML preview page for a product's badge.
+
+    Every argument is part of the cache key, so a product whose name or
+    score changes simply gets a new entry; stale ones age out of the LRU.
+    """
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{escape(name)} - EthAum Verified</title>
+    <style>
+        .ethaum-badge {{
+            display: inline-flex;
+            align-items: center;
+            gap: 12px;
+            padding: 12px 20px;
+            background: linear-gradient(135deg, #f8f9fa 0%, #ffffff 100%);
+            border: 2px solid {color};
+            border-radius: 12px;
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.08);
+            text-decoration: none;
+            color: inherit;
+            transition: transform 0.2s, box-shadow 0.2s;
+        }}
+        .ethaum-badge:hover {{
+            transform: translateY(-2px);
+            box-shadow: 0 6px 20px rgba(0,0,0,0.12);
+        }}
+        .badge-logo {{
+            width: 40px;
+            height: 40px;
+            background: linear-gradient(135deg, #7c3aed 0%, #4f46e5 100%);
+            border-radius: 10px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            color: white;
+            font-weight: bold;
+            font-size: 18px;
+        }}
+        .badge-content {{
+            display: flex;
+            flex-direction: column;
+        }}
+        .badge-title {{
+            font-size: 14px;
+            font-weight: 600;
+            color: #1f2937;
+        }}
+        .badge-subtitle {{
+            font-size: 12px;
+            color: #6b7280;
+        }}
+        .badge-score {{
+            font-size: 24px;
+            font-weight: bold;
+            color: {color};
+            margin-left: 12px;
+        }}
+    </style>
+</head>
+<body style="display: flex; justify-content: center; align-items: center; min-height: 100vh; margin: 0; background: #f3f4f6;">
+    <a href="https://ethaum.ai/api/v1/badges/{product_id}/click" class="ethaum-badge" target="_blank">
+        <div class="badge-logo">E</div>
+        <div class="badge-content">
+            <span class="badge-title">EthAum Verified</span>
+            <span class="badge-subtitle">{level}</span>
+        </div>
+        <span class="badge-score">{score}</span>
+    </a>
+    <img src="https://ethaum.ai/api/v1/badges/{product_id}/pixel.gif" width="1" height="1" alt="" style="position: absolute;">
+</body>
+</html>
+"""
+    body = html.encode("utf-8")
+    return RenderedPreview(body, gzip.compress(body, compresslevel=9, mtime=0), _digest(body))
+
+
+def png_supported() -> bool:
+    """Whether PNG badges can be rendered in this deployment."""
+    return cairosvg is not None
+
+
+def _digest(body: bytes) -> str:
+    """Short content hash used for ETags and immutable URLs."""
+    hasher = hashlib.sha256(BADGE_TEMPLATE_VERSION.encode("ascii"))
+    hasher.update(body)
+    return hasher.hexdigest()[:20]
@@ -0,0 +1,201 @@
+"""EthAum AI - Badge Impression & Click Tracking Service.
+
+Embedded badges are loaded far too often to write a row per view.
+Instead, each request thread bumps a counter in its own shard (no locks
+on the hot path) and a background flusher folds the shards into hourly
+rollups, written to `badge_event_rollups` in batches.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from database import get_db
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = 30
+FLUSH_BATCH_SIZE = 500
+
+IMPRESSION = "impressions"
+CLICK = "clicks"
+
+
+class ShardedCounter:
+    """
+    Per-thread counters that are merged only when flushed.
+
+    Each thread increments a private dict, so the hot path never takes
+    a lock. On drain the live dicts are swapped out and retired; a
+    retired dict is read one drain later, after any increment that raced
+    with the swap has landed in it.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._retired: list[dict] = []
+        self._registry_lock = threading.Lock()
+
+    def increment(self, key: tuple, amount: int = 1) -> None:
+        """Add `amount` to `key` in the calling thread's shard."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._register_shard()
+        counts = shard["counts"]
+        counts[key] = counts.get(key, 0) + amount
+
+    def drain(self, final: bool = False) -> dict:
+        """
+        Collect counts accumulated since the previous drain.
+
+        Args:
+            final: Also read the shards just swapped out. Use on shutdown,
+                once request threads have stopped.
+
+        Returns:
+            Mapping of key -> summed count.
+        """
+        with self._registry_lock:
+            ready, self._retired = self._retired, []
+            for shard in self._shards:
+                self._retired.append(shard["counts"])
+                shard["counts"] = {}
+            if final:
+                ready, self._retired = ready + self._retired, []
+
+        totals: dict = {}
+        for counts in ready:
+            for key, amount in counts.items():
+                totals[key] = totals.get(key, 0) + amount
+        return totals
+
+    def _register_shard(self) -> dict:
+        shard = {"counts": {}}
+        with self._registry_lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+
+badge_events = ShardedCounter()
+
+# Rollups that failed to write; retried on the next flush
+_pending: dict = {}
+_pending_lock = threading.Lock()
+
+_stop = threading.Event()
+_flusher: Optional[threading.Thread] = None
+
+
+def record_impression(product_id: int) -> None:
+    """Count one badge view for the current hour."""
+    badge_events.increment((product_id, _current_hour(), IMPRESSION))
+
+
+def record_click(product_id: int) -> None:
+    """Count one badge click-through for the current hour."""
+    badge_events.increment((product_id, _current_hour(), CLICK))
+
+
+def flush_badge_events(final: bool = False) -> int:
+    """
+    Write accumulated counts to the hourly rollup table.
+
+    Returns the number of rollup rows written.
+    """
+    with _pending_lock:
+        rollups = dict(_pending)
+        _pending.clear()
+
+    for (product_id, hour, kind), amount in badge_events.drain(final=final).items():
+        row = rollups.setdefault((product_id, hour), {IMPRESSION: 0, CLICK: 0})
+        row[kind] += amount
+
+    if not rollups:
+        return 0
+
+    rows = [
+        {
+            "product_id": product_id,
+            "hour": datetime.fromtimestamp(hour * 3600, tz=timezone.utc).isoformat(),
+            IMPRESSION: counts[IMPRESSION],
+            CLICK: counts[CLICK],
+        }
+        for (product_id, hour), counts in rollups.items()
+    ]
+
+    db = get_db()
+    written = 0
+    for start in range(0, len(rows), FLUSH_BATCH_SIZE):
+        batch = rows[start:start + FLUSH_BATCH_SIZE]
+        try:
+            db.rpc("record_badge_events", {"events": batch}).execute()
+            written += len(batch)
+        except Exception:
+            logger.exception("Failed to flush %d badge rollups, will retry", len(batch))
+            _requeue(batch)
+
+    return written
+
+
+def get_badge_engagement(product_id: int, days: int = 30) -> dict:
+    """Sum rolled-up badge impressions and clicks over the last `days`."""
+    db = get_db()
+    since = datetime.fromtimestamp(time.time() - days * 86400, tz=timezone.utc).isoformat()
+
+    result = db.table("badge_event_rollups").select(
+        "impressions, clicks"
+    ).eq("product_id", product_id).gte("hour", since).execute()
+
+    rows = result.data or []
+    impressions = sum(r.get("impressions", 0) for r in rows)
+    clicks = sum(r.get("clicks", 0) for r in rows)
+
+    return {
+        "impressions": impressions,
+        "clicks": clicks,
+        "click_through_rate": round(clicks / impressions * 100, 2) if impressions else 0.0,
+    }
+
+
+def start_flusher() -> None:
+    """Start the background flush thread for this worker."""
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    _stop.clear()
+    _flusher = threading.Thread(target=_flush_loop, name="badge-event-flusher", daemon=True)
+    _flusher.start()
+
+
+def stop_flusher() -> None:
+    """Stop the flush thread and write out everything still buffered."""
+    _stop.set()
+    if _flusher is not None:
+        _flusher.join(timeout=FLUSH_INTERVAL_SECONDS)
+    flush_badge_events(final=True)
+
+
+def _flush_loop() -> None:
+    while not _stop.wait(FLUSH_INTERVAL_SECONDS):
+        try:
+            flush_badge_events()
+        except Exception:
+            logger.exception("Badge event flush failed")
+
+
+def _requeue(batch: list[dict]) -> None:
+    with _pending_lock:
+        for row in batch:
+            hour = int(datetime.fromisoformat(row["hour"]).timestamp()) // 3600
+            counts = _pending.setdefault((row["product_id"], hour), {IMPRESSION: 0, CLICK: 0})
+            counts[IMPRESSION] += row[IMPRESSION]
+            counts[CLICK] += row[CLICK]
+
+
+def _current_hour() -> int:
+    """Hours since the epoch, used as the rollup bucket."""
+    return int(time.time()) // 3600
@@ -0,0 +1,52 @@
+"""EthAum AI - Badge Inputs Service.
+
+Badges only depend on a product's name and trust score. This module
+keeps those two fields in a per-worker cache so embed traffic rarely
+reaches the database, and lets write paths drop a product's entry as
+soon as either field changes.
+"""
+
+from typing import Any, Optional
+
+from database import get_db
+from services.cache import TTLCache
+
+DEFAULT_TRUST_SCORE = 75
+
+# product_id -> {"name", "trust_score"}
+_badge_inputs = TTLCache(maxsize=10_000, ttl=300)
+
+
+def normalize_trust_score(score: Any) -> int:
+    """A stored trust score as the 0-100 integer badges are rendered for; 75 if unset."""
+    if score is None:
+        return DEFAULT_TRUST_SCORE
+    return max(0, min(100, int(score)))
+
+
+def get_badge_inputs(product_id: int) -> Optional[dict]:
+    """
+    Get the fields a product's badge is rendered from.
+
+    Returns:
+        Dict with `name` and a 0-100 `trust_score`, or None if the
+        product does not exist.
+    """
+    inputs = _badge_inputs.get(product_id)
+    if inputs is None:
+        db = get_db()
+        result = db.table("products").select("name, trust_score").eq("id", product_id).execute()
+        if not result.data:
+            return None
+        product = result.data[0]
+        inputs = {
+            "name": product.get("name") or "",
+            "trust_score": normalize_trust_score(product.get("trust_score")),
+        }
+        _badge_inputs.set(product_id, inputs)
+    return inputs
+
+
+def invalidate_badge(product_id: int) -> None:
+    """Forget a product's cached badge inputs after its name or score changes."""
+    _badge_inputs.invalidate(product_id)
@@ -0,0 +1,379 @@
+"""EthAum AI - In-Process Caching Utilities.
+
+Small, dependency-free caches shared by the routers. Each uvicorn
+worker keeps its own copy, so entries are bounded and short-lived
+rather than a source of truth.
+
+`cached_response` wraps a public GET handler in a stale-while-revalidate
+cache: fresh entries are served as-is, stale ones are served while a
+background thread recomputes them, and write endpoints drop entries by
+tag through `invalidate_tags`.
+
+`single_flight` coalesces concurrent identical calls instead: while one
+computation for a set of arguments is running, callers with the same
+arguments wait for it and share its result.
+"""
+
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after `ttl` seconds.
+
+    Args:
+        maxsize: Maximum number of entries kept before evicting the
+            least recently used one.
+        ttl: Seconds an entry stays fresh. None disables expiry.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh cached value or `default`."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the oldest entry when full."""
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of handler results with stale-while-revalidate.
+
+    Args:
+        name: Name the cache is reported under in `cache_metrics()`.
+        ttl: Seconds an entry is served without being recomputed.
+        stale_ttl: Further seconds a stale entry is still served while it
+            is recomputed in the background.
+        maxsize: Maximum number of entries.
+        max_bytes: Maximum total JSON size of the cached values.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float, maxsize: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        # key -> (value, size, fresh_until, stale_until, tags)
+        self._data: OrderedDict = OrderedDict()
+        self._tag_keys: dict[str, set] = {}
+        # Bumped on invalidation, so results computed before it are not stored after it
+        self._tag_versions: dict[str, int] = {}
+        self._refreshing: set = set()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.stale_hits = self.misses = self.refreshes = self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], tags: tuple[str, ...] = ()) -> Any:
+        """Return the cached value, refreshing it in the background once stale."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and now < entry[3]:
+                self._data.move_to_end(key)
+                if now < entry[2]:
+                    self.hits += 1
+                    return entry[0]
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    _refresh_pool.submit(self._refresh, key, compute, tags, self._versions(tags))
+                return entry[0]
+            self.misses += 1
+            versions = self._versions(tags)
+
+        value = compute()
+        self._store(key, value, tags, versions)
+        return value
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """Drop every entry carrying any of the tags."""
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+                for key in list(self._tag_keys.get(tag, ())):
+                    self._drop(key)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            for key in list(self._data):
+                self._drop(key)
+
+    def metrics(self) -> dict:
+        """Hit counts, hit ratio and memory use."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _refresh(self, key: Hashable, compute: Callable[[], Any], tags: tuple[str, ...], versions: tuple) -> None:
+        try:
+            self._store(key, compute(), tags, versions)
+            with self._lock:
+                self.refreshes += 1
+        except Exception:
+            # Keep serving the stale value; the next stale hit retries
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key: Hashable, value: Any, tags: tuple[str, ...], versions: tuple) -> None:
+        size = len(json.dumps(value, default=str))
+        now = time.monotonic()
+        with self._lock:
+            if self._versions(tags) != versions or size > self.max_bytes:
+                return
+            self._drop(key)
+            self._data[key] = (value, size, now + self.ttl, now + self.ttl + self.stale_ttl, tags)
+            self._bytes += size
+            for tag in tags:
+                self._tag_keys.setdefault(tag, set()).add(key)
+            while len(self._data) > self.maxsize or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[1]
+        for tag in entry[4]:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def _versions(self, tags: tuple[str, ...]) -> tuple:
+        return tuple(self._tag_versions.get(tag, 0) for tag in tags)
+
+
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+_response_caches: dict[str, ResponseCache] = {}
+
+
+def cached_response(
+    ttl: float,
+    stale_ttl: Optional[float] = None,
+    tags: Optional[Callable[..., Iterable[str]]] = None,
+    maxsize: int = 1024,
+    max_bytes: int = 16 * 1024 * 1024,
+):
+    """
+    Cache a sync route handler's result per set of arguments.
+
+    Args:
+        ttl: Seconds a result is served without touching the handler.
+        stale_ttl: Further seconds a stale result is served while it is
+            recomputed in the background. Defaults to `ttl`.
+        tags: Called with the handler's arguments as keywords; returns
+            the tags that `invalidate_tags` can drop the result by.
+        maxsize: Maximum number of cached results.
+        max_bytes: Maximum total JSON size of the cached results.
+
+    Handler arguments must be hashable. Raised errors (e.g. 404s) are
+    not cached; the uncached handler stays reachable as `__wrapped__`.
+    """
+    def decorator(handler: Callable) -> Callable:
+        name = f"{handler.__module__.rsplit('.', 1)[-1]}.{handler.__name__}"
+        cache = ResponseCache(name, ttl, ttl if stale_ttl is None else stale_ttl, maxsize, max_bytes)
+        _response_caches[name] = cache
+        signature = inspect.signature(handler)
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            key = tuple(sorted(arguments.items()))
+            entry_tags = tuple(tags(**arguments)) if tags else ()
+            return cache.get_or_compute(key, lambda: handler(**arguments), entry_tags)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+class _Flight:
+    """One in-progress computation and the callers waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time; concurrent callers
+    with the same key wait for it and share its result or error.
+
+    Args:
+        name: Name the group is reported under in `single_flight_metrics()`.
+        timeout: Seconds a caller waits on someone else's computation
+            before giving up and running its own.
+    """
+
+    def __init__(self, name: str, timeout: float):
+        self.name = name
+        self.timeout = timeout
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.calls = self.coalesced = self.timeouts = 0
+
+    def do(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return `compute()`, sharing one run among concurrent callers with `key`."""
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                flight.result = compute()
+                return flight.result
+            except BaseException as error:
+                flight.error = error
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+
+        if not flight.done.wait(self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            return compute()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def metrics(self) -> dict:
+        """Calls, how many of them were coalesced, and wait timeouts."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "coalesced_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+                "timeouts": self.timeouts,
+                "in_flight": len(self._flights),
+            }
+
+
+_single_flights: dict[str, SingleFlight] = {}
+
+
+def single_flight(timeout: float = 10.0):
+    """
+    Coalesce concurrent calls of a function with the same arguments.
+
+    Args:
+        timeout: Seconds a caller waits on an in-flight call before
+            running its own.
+
+    Arguments must be hashable; defaults are filled in before keying, so
+    `f()` and `f(limit=10)` share a flight when 10 is the default.
+    Callers share the returned object and must not mutate it.
+    """
+    def decorator(fn: Callable) -> Callable:
+        name = f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+        group = SingleFlight(name, timeout)
+        _single_flights[name] = group
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            return group.do(tuple(sorted(arguments.items())), lambda: fn(**arguments))
+
+        wrapper.single_flight = group
+        return wrapper
+
+    return decorator
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Write-path hook: drop cached responses carrying any of the tags."""
+    for cache in _response_caches.values():
+        cache.invalidate_tags(tags)
+
+
+def cache_metrics() -> dict:
+    """Metrics of every response cache, by handler."""
+    return {name: cache.metrics() for name, cache in _response_caches.items()}
+
+
+def single_flight_metrics() -> dict:
+    """Coalescing metrics of every single-flight function, by name."""
+    return {name: group.metrics() for name, group in _single_flights.items()}
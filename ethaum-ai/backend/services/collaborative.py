@@ -0,0 +1,279 @@
+"""EthAum AI - Item-to-Item Collaborative Filtering.
+
+Users who upvote or review the same products tell us those products go
+together. A background job turns the `upvotes` and `reviews.user_id`
+signals into an item-item co-occurrence matrix held CSR-style in three
+flat NumPy arrays (row offsets, column positions, counts). A user's
+recommendations are the sum of the matrix rows for the products in
+their history, each pair normalised by the two products' popularity.
+
+New votes and reviews are applied straight away as a small overlay of
+count deltas on top of the arrays; the periodic rebuild folds the
+overlay back in.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+import numpy as np
+
+from database import get_db
+
+logger = logging.getLogger(__name__)
+
+# Users with longer histories are left out of co-occurrence: they pair
+# everything with everything and cost O(n^2) to count
+MAX_HISTORY = 200
+PAGE_SIZE = 1000
+REBUILD_INTERVAL_SECONDS = 900
+
+
+class CooccurrenceMatrix:
+    """
+    Item-item co-occurrence counts over user histories.
+
+    Row r of the matrix lives in `indices[indptr[r]:indptr[r + 1]]`
+    (column positions, ascending) and the matching slice of `data`
+    (number of users who interacted with both products).
+    """
+
+    def __init__(self, histories: dict[str, dict[int, int]]):
+        self._lock = threading.Lock()
+        # user -> {product_id: number of signals (upvote, review)}
+        self.histories = histories
+        self.item_ids: list[int] = sorted({pid for items in histories.values() for pid in items})
+        self.position = {pid: i for i, pid in enumerate(self.item_ids)}
+        size = len(self.item_ids)
+
+        self.counts = np.zeros(size, dtype=np.float64)
+        keys = []
+        for items in histories.values():
+            if len(items) > MAX_HISTORY:
+                continue
+            positions = np.fromiter((self.position[pid] for pid in items), dtype=np.int64, count=len(items))
+            self.counts[positions] += 1
+            if len(positions) > 1:
+                rows = np.repeat(positions, len(positions))
+                cols = np.tile(positions, len(positions))
+                keep = rows != cols
+                keys.append(rows[keep] * size + cols[keep])
+
+        if keys:
+            pairs, pair_counts = np.unique(np.concatenate(keys), return_counts=True)
+        else:
+            pairs, pair_counts = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        self.indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pairs // max(size, 1), minlength=size), out=self.indptr[1:])
+        self.indices = (pairs % max(size, 1)).astype(np.int32)
+        self.data = pair_counts.astype(np.float32)
+
+        # row -> {col: count delta} applied since the arrays were built
+        self.overlay: dict[int, dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def record(self, user_id: str, product_id: int) -> None:
+        """Fold one new upvote or review into the counts."""
+        with self._lock:
+            items = self.histories.setdefault(user_id, {})
+            if items.get(product_id):
+                items[product_id] += 1
+                return
+            before = list(items)
+            items[product_id] = 1
+            if len(items) == MAX_HISTORY + 1:
+                # The user just became too active to count; take their pairs back out
+                self._apply(before, -1)
+            elif len(items) <= MAX_HISTORY:
+                self._apply_one(product_id, before, +1)
+
+    def forget(self, user_id: str, product_id: int) -> None:
+        """Remove one upvote or review from the counts."""
+        with self._lock:
+            items = self.histories.get(user_id, {})
+            if not items.get(product_id):
+                return
+            items[product_id] -= 1
+            if items[product_id]:
+                return
+            del items[product_id]
+            if len(items) == MAX_HISTORY:
+                self._apply(list(items), +1)
+            elif len(items) < MAX_HISTORY:
+                self._apply_one(product_id, list(items), -1)
+
+    def recommend(self, history: list[int], limit: int) -> list[tuple[int, float, int]]:
+        """
+        Products that co-occur most with a history.
+
+        Returns:
+            (product_id, score, because_product_id) for the top products
+            not in the history, best first; `because_product_id` is the
+            history item contributing most to the score.
+        """
+        with self._lock:
+            rows = [self.position[pid] for pid in set(history) if pid in self.position]
+            if not rows:
+                return []
+            size = len(self.item_ids)
+            norms = np.sqrt(np.maximum(self.counts, 1))
+
+            # Weighted sum of the history rows, arrays plus overlay
+            cols, weights, sources = [], [], []
+            for row in rows:
+                start, end = self.indptr[row], self.indptr[row + 1]
+                row_cols, row_data = self.indices[start:end].astype(np.int64), self.data[start:end].astype(np.float64)
+                delta = self.overlay.get(row)
+                if delta:
+                    row_cols = np.concatenate([row_cols, np.fromiter(delta.keys(), dtype=np.int64, count=len(delta))])
+                    row_data = np.concatenate([row_data, np.fromiter(delta.values(), dtype=np.float64, count=len(delta))])
+                cols.append(row_cols)
+                weights.append(row_data / (norms[row] * norms[row_cols]))
+                sources.append(np.full(len(row_cols), row, dtype=np.int64))
+            cols, weights, sources = np.concatenate(cols), np.concatenate(weights), np.concatenate(sources)
+
+            # Rounded so ties break on product id however the sums were accumulated
+            scores = np.round(np.bincount(cols, weights=weights, minlength=size), 9)
+            scores[rows] = 0
+            candidates = np.nonzero(scores > 0)[0]
+            if len(candidates) > limit:
+                cutoff = np.partition(scores[candidates], len(candidates) - limit)[len(candidates) - limit]
+                candidates = candidates[scores[candidates] >= cutoff]
+            item_ids = np.array(self.item_ids, dtype=np.int64)
+            candidates = candidates[np.lexsort((item_ids[candidates], -scores[candidates]))][:limit]
+
+            results = []
+            for col in candidates:
+                contributing = cols == col
+                # Per-source totals, so overlay deltas are netted against array counts
+                totals = np.bincount(sources[contributing], weights=weights[contributing], minlength=size)
+                results.append((self.item_ids[col], float(scores[col]), self.item_ids[int(np.argmax(totals))]))
+            return results
+
+    def _apply_one(self, product_id: int, others: list[int], sign: int) -> None:
+        """Add or remove the pairs between one product and a user's other products."""
+        row = self._position_for(product_id)
+        self.counts[row] += sign
+        for other in others:
+            col = self._position_for(other)
+            self._bump(row, col, sign)
+            self._bump(col, row, sign)
+
+    def _apply(self, items: list[int], sign: int) -> None:
+        """Add or remove every pair of a user's history."""
+        positions = [self._position_for(pid) for pid in items]
+        for row in positions:
+            self.counts[row] += sign
+            for col in positions:
+                if row != col:
+                    self._bump(row, col, sign)
+
+    def _bump(self, row: int, col: int, sign: int) -> None:
+        deltas = self.overlay.setdefault(row, {})
+        deltas[col] = deltas.get(col, 0) + sign
+        if not deltas[col]:
+            del deltas[col]
+
+    def _position_for(self, product_id: int) -> int:
+        """Matrix position of a product, adding an empty row for new products."""
+        position = self.position.get(product_id)
+        if position is None:
+            position = len(self.item_ids)
+            self.item_ids.append(product_id)
+            self.position[product_id] = position
+            self.counts = np.append(self.counts, 0.0)
+            self.indptr = np.append(self.indptr, self.indptr[-1])
+        return position
+
+
+_matrix: Optional[CooccurrenceMatrix] = None
+_matrix_lock = threading.Lock()
+_stop = threading.Event()
+_refresher: Optional[threading.Thread] = None
+
+
+def get_matrix() -> CooccurrenceMatrix:
+    """Get the co-occurrence matrix, building it on first use."""
+    if _matrix is None:
+        with _matrix_lock:
+            if _matrix is None:
+                rebuild_matrix()
+    return _matrix
+
+
+def rebuild_matrix() -> int:
+    """Rebuild the matrix from every upvote and review. Returns the number of products in it."""
+    global _matrix
+    _matrix = CooccurrenceMatrix(load_histories())
+    return len(_matrix)
+
+
+def load_histories() -> dict[str, dict[int, int]]:
+    """Per-user signal counts from upvotes and signed-in reviews."""
+    histories: dict[str, dict[int, int]] = {}
+    for table in ("upvotes", "reviews"):
+        for row in _load_pages(table):
+            if row.get("user_id") and row.get("product_id") is not None:
+                items = histories.setdefault(row["user_id"], {})
+                items[row["product_id"]] = items.get(row["product_id"], 0) + 1
+    return histories
+
+
+def get_user_history(user_id: str) -> list[int]:
+    """Products a user has upvoted or reviewed."""
+    db = get_db()
+    upvotes = db.table("upvotes").select("product_id").eq("user_id", user_id).execute()
+    reviews = db.table("reviews").select("product_id").eq("user_id", user_id).execute()
+    return list({row["product_id"] for row in (upvotes.data or []) + (reviews.data or [])})
+
+
+def record_interaction(user_id: str, product_id: int) -> None:
+    """Write-path hook for a new upvote or review."""
+    if _matrix is not None:
+        _matrix.record(user_id, product_id)
+
+
+def forget_interaction(user_id: str, product_id: int) -> None:
+    """Write-path hook for a removed upvote or review."""
+    if _matrix is not None:
+        _matrix.forget(user_id, product_id)
+
+
+def start_refresher() -> None:
+    """Build the matrix in the background and rebuild it periodically."""
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return
+    _stop.clear()
+    _refresher = threading.Thread(target=_refresh_loop, name="collaborative-filtering", daemon=True)
+    _refresher.start()
+
+
+def stop_refresher() -> None:
+    """Stop the periodic rebuild."""
+    _stop.set()
+
+
+def _refresh_loop() -> None:
+    while True:
+        try:
+            with _matrix_lock:
+                rebuild_matrix()
+        except Exception:
+            logger.exception("Co-occurrence matrix rebuild failed")
+        if _stop.wait(REBUILD_INTERVAL_SECONDS):
+            return
+
+
+def _load_pages(table: str) -> list[dict]:
+    db = get_db()
+    rows: list[dict] = []
+    while True:
+        page = db.table(table).select("id, user_id, product_id").order("id").range(
+            len(rows), len(rows) + PAGE_SIZE - 1
+        ).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
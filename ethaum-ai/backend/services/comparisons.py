@@ -0,0 +1,369 @@
+"""EthAum AI - Startup Comparison Service (G2-Inspired).
+
+Derives enterprise comparison metrics for products and ranks them
+against each other. Buyers browsing a category keep comparing the same
+leading vendors, so this module also keeps a per-category index of the
+top products by trust score with their pairwise comparison matrix and
+"best alternatives" lists, rebuilt in the background and refreshed per
+category when a member's scores change.
+
+NOTE: The enterprise metrics (ROI, integrations, SLAs) are simulated
+from trust score and market traction for MVP demonstration.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+from database import get_db
+
+logger = logging.getLogger(__name__)
+
+# (display key, startup field, higher is better, unit)
+COMPARISON_METRICS = [
+    ("trust_score", "trust_score", True, None),
+    ("roi_percentage", "roi_percentage", True, None),
+    ("implementation_speed", "avg_implementation_days", False, "days"),
+    ("integrations", "integration_count", True, None),
+]
+
+# Only the columns the comparison derives from, plus updated_at for cache keys
+COMPARE_COLUMNS = "id, name, category, trust_score, market_traction, updated_at"
+
+TOP_K_PER_CATEGORY = 25
+ALTERNATIVES_PER_PRODUCT = 5
+REFRESH_INTERVAL_SECONDS = 900
+# PostgREST returns at most 1000 rows per request by default
+PAGE_SIZE = 1000
+
+
+def build_startup_metrics(product: dict) -> dict:
+    """Derive enterprise comparison metrics for a product (simulated for MVP)."""
+    return {
+        "name": product["name"],
+        "category": product["category"],
+        "trust_score": product["trust_score"],
+        "pricing_tier": "Enterprise",
+        "avg_implementation_days": 14,
+        "roi_percentage": 280 + (product["trust_score"] * 2),
+        "integration_count": 30 + product["market_traction"],
+        "support_sla": "24/7 Priority",
+        "security_certifications": ["SOC2", "GDPR"],
+        "key_features": ["Custom Solutions", "API-first", "Real-time"],
+        "ideal_for": f"Enterprises in {product['category']} looking for trusted solutions",
+    }
+
+
+def rank_values(values: list, higher_is_better: bool) -> list[int]:
+    """Competition ranks (1, 2, 2, 4) for values; equal values share a rank."""
+    order = sorted(range(len(values)), key=lambda i: values[i], reverse=higher_is_better)
+    ranks = [0] * len(values)
+    for position, i in enumerate(order):
+        previous = order[position - 1] if position else None
+        ranks[i] = ranks[previous] if previous is not None and values[previous] == values[i] else position + 1
+    return ranks
+
+
+def pick_winner(startups: list[dict], ranks: list[int]) -> dict:
+    """Top-ranked startup; ties go to the later entry, as in the two-way view."""
+    return startups[max(i for i, rank in enumerate(ranks) if rank == 1)]
+
+
+def recommendation_score(startup: dict) -> float:
+    """Blend of credibility, ROI and integrations used to recommend a startup."""
+    return startup["trust_score"] + (startup["roi_percentage"] / 10) + startup["integration_count"]
+
+
+def compare_two(startup_1: dict, startup_2: dict) -> dict:
+    """
+    Build the side-by-side comparison of two startups.
+
+    Args:
+        startup_1: Metrics from `build_startup_metrics`, plus `id`.
+        startup_2: Metrics from `build_startup_metrics`, plus `id`.
+
+    Returns:
+        The two startups, per-metric winners and a recommendation.
+    """
+    pair = [startup_1, startup_2]
+
+    comparison_results = {}
+    for key, field, higher_is_better, unit in COMPARISON_METRICS:
+        ranks = rank_values([startup_1[field], startup_2[field]], higher_is_better)
+        comparison_results[key] = {
+            "winner": pick_winner(pair, ranks)["name"],
+            "values": {startup_1["name"]: startup_1[field], startup_2["name"]: startup_2[field]},
+        }
+        if unit:
+            comparison_results[key]["unit"] = unit
+
+    return {
+        "comparison": {
+            "startup_1": startup_1,
+            "startup_2": startup_2,
+        },
+        "metrics_comparison": comparison_results,
+        "recommendation": _generate_recommendation(startup_1, startup_2),
+    }
+
+
+def compare_many(startups: list[dict]) -> dict:
+    """
+    Build the N-way comparison of startups given in id order.
+
+    Args:
+        startups: Metrics from `build_startup_metrics`, plus `id`.
+
+    Returns:
+        Startups, per-metric winners and ranks, overall ranks and a recommendation.
+    """
+    metrics_comparison = {}
+    for key, field, higher_is_better, unit in COMPARISON_METRICS:
+        values = [s[field] for s in startups]
+        ranks = rank_values(values, higher_is_better)
+        winner = pick_winner(startups, ranks)
+        metrics_comparison[key] = {
+            "winner": winner["name"],
+            "winner_id": winner["id"],
+            "values": {str(s["id"]): v for s, v in zip(startups, values)},
+            "ranks": {str(s["id"]): r for s, r in zip(startups, ranks)},
+        }
+        if unit:
+            metrics_comparison[key]["unit"] = unit
+
+    overall = rank_values([recommendation_score(s) for s in startups], higher_is_better=True)
+    best = pick_winner(startups, overall)
+
+    return {
+        "startups": startups,
+        "metrics_comparison": metrics_comparison,
+        "overall_ranks": {str(s["id"]): r for s, r in zip(startups, overall)},
+        "recommendation": f"{best['name']} is recommended for enterprises prioritizing ROI and credibility.",
+    }
+
+
+class ComparisonIndex:
+    """
+    Precomputed comparisons for the top products of each category.
+
+    For each category the index keeps the top-K approved products by
+    trust score, a K×K matrix counting the metrics on which product i
+    beats product j, and for every member its best alternatives.
+    """
+
+    def __init__(self, top_k: int = TOP_K_PER_CATEGORY, alternatives: int = ALTERNATIVES_PER_PRODUCT):
+        self.top_k = top_k
+        self.alternatives = alternatives
+        self._lock = threading.Lock()
+        self._categories: dict[str, dict] = {}
+        self._category_of: dict[int, str] = {}
+
+    def get_startup(self, product_id: int) -> Optional[dict]:
+        """Cached comparison metrics for an indexed product, or None."""
+        category = self._categories.get(self._category_of.get(product_id, ""))
+        return category["startups"].get(product_id) if category else None
+
+    def get_alternatives(self, product_id: int) -> Optional[list[dict]]:
+        """Precomputed alternatives for an indexed product, or None."""
+        category = self._categories.get(self._category_of.get(product_id, ""))
+        return category["alternatives"].get(product_id) if category else None
+
+    def get_category_members(self, category: str) -> list[dict]:
+        """Indexed startups of a category, best trust score first."""
+        entry = self._categories.get(category)
+        if not entry:
+            return []
+        return [entry["startups"][pid] for pid in entry["members"]]
+
+    def rebuild(self) -> int:
+        """Rebuild every category. Returns the number of categories indexed."""
+        by_category: dict[str, list[dict]] = {}
+        for product in _load_approved():
+            members = by_category.setdefault(product.get("category") or "", [])
+            if len(members) < self.top_k:
+                members.append(product)
+
+        categories = {name: self._build_category(products) for name, products in by_category.items()}
+        category_of = {pid: name for name, entry in categories.items() for pid in entry["members"]}
+
+        with self._lock:
+            self._categories = categories
+            self._category_of = category_of
+        return len(categories)
+
+    def refresh_category(self, category: str) -> None:
+        """Recompute a single category after one of its members changed."""
+        db = get_db()
+        result = db.table("products").select(COMPARE_COLUMNS).eq(
+            "status", "approved"
+        ).eq("category", category).order("trust_score", desc=True).limit(self.top_k).execute()
+
+        products = result.data or []
+        with self._lock:
+            previous = self._categories.pop(category, None)
+            if previous:
+                for pid in previous["members"]:
+                    if self._category_of.get(pid) == category:
+                        del self._category_of[pid]
+            if products:
+                entry = self._build_category(products)
+                self._categories[category] = entry
+                for pid in entry["members"]:
+                    self._category_of[pid] = category
+
+    def refresh_product(self, product_id: int, category: Optional[str] = None) -> None:
+        """
+        Refresh the categories a product belonged to and now belongs to.
+
+        Args:
+            product_id: Product whose scores, category or status changed.
+            category: Its current category, if the caller already knows it.
+        """
+        self.refresh_products({product_id: category})
+
+    def refresh_products(self, categories: dict[int, Optional[str]]) -> None:
+        """Refresh every category a batch of products touches, each once."""
+        affected = {self._category_of.get(pid) for pid in categories} | set(categories.values())
+        unknown = [pid for pid, category in categories.items() if category is None]
+        if unknown:
+            db = get_db()
+            result = db.table("products").select("category").in_("id", unknown).execute()
+            affected |= {row.get("category") or "" for row in result.data or []}
+        for name in affected - {None}:
+            self.refresh_category(name)
+
+    def _build_category(self, products: list[dict]) -> dict:
+        startups = {p["id"]: {**build_startup_metrics(p), "id": p["id"]} for p in products}
+        members = [p["id"] for p in products]
+        size = len(members)
+
+        wins = [[0] * size for _ in range(size)]
+        for _, field, higher_is_better, _ in COMPARISON_METRICS:
+            values = [startups[pid][field] for pid in members]
+            for i in range(size):
+                for j in range(i + 1, size):
+                    if values[i] == values[j]:
+                        continue
+                    i_better = (values[i] > values[j]) == higher_is_better
+                    wins[i if i_better else j][j if i_better else i] += 1
+
+        alternatives = {}
+        for i, pid in enumerate(members):
+            ranked = sorted(
+                (j for j in range(size) if j != i),
+                key=lambda j: (wins[j][i] - wins[i][j], recommendation_score(startups[members[j]])),
+                reverse=True,
+            )
+            alternatives[pid] = [
+                _alternative_entry(startups[members[j]], wins[j][i], wins[i][j])
+                for j in ranked[:self.alternatives]
+            ]
+
+        return {"members": members, "startups": startups, "wins": wins, "alternatives": alternatives}
+
+
+comparison_index = ComparisonIndex()
+
+_stop = threading.Event()
+_refresher: Optional[threading.Thread] = None
+
+
+def find_alternatives(startup: dict, candidates: list[dict], limit: int = ALTERNATIVES_PER_PRODUCT) -> list[dict]:
+    """Rank candidates as alternatives to a startup that is not in the index."""
+    scored = []
+    for candidate in candidates:
+        if candidate["id"] == startup["id"]:
+            continue
+        wins, losses = _head_to_head(candidate, startup)
+        scored.append((wins - losses, recommendation_score(candidate), candidate, wins, losses))
+    scored.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+    return [_alternative_entry(c, wins, losses) for _, _, c, wins, losses in scored[:limit]]
+
+
+def refresh_product_comparisons(product_id: int, category: Optional[str] = None) -> None:
+    """Write-path hook: refresh indexed comparisons touching a product."""
+    try:
+        comparison_index.refresh_product(product_id, category)
+    except Exception:
+        logger.exception("Failed to refresh comparisons for product %s", product_id)
+
+
+def refresh_products_comparisons(categories: dict[int, Optional[str]]) -> None:
+    """Write-path hook: refresh indexed comparisons touching a batch of products."""
+    try:
+        comparison_index.refresh_products(categories)
+    except Exception:
+        logger.exception("Failed to refresh comparisons for products %s", list(categories))
+
+
+def start_refresher() -> None:
+    """Build the index in the background and rebuild it periodically."""
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return
+    _stop.clear()
+    _refresher = threading.Thread(target=_refresh_loop, name="comparison-index", daemon=True)
+    _refresher.start()
+
+
+def stop_refresher() -> None:
+    """Stop the periodic rebuild."""
+    _stop.set()
+
+
+def _refresh_loop() -> None:
+    while True:
+        try:
+            comparison_index.rebuild()
+        except Exception:
+            logger.exception("Comparison index rebuild failed")
+        if _stop.wait(REFRESH_INTERVAL_SECONDS):
+            return
+
+
+def _load_approved() -> list[dict]:
+    """Every approved product, best trust score first, fetched a page at a time."""
+    db = get_db()
+    products: list[dict] = []
+    while True:
+        page = db.table("products").select(COMPARE_COLUMNS).eq("status", "approved").order(
+            "trust_score", desc=True
+        ).order("id").range(len(products), len(products) + PAGE_SIZE - 1).execute().data or []
+        products.extend(page)
+        if len(page) < PAGE_SIZE:
+            return products
+
+
+def _head_to_head(a: dict, b: dict) -> tuple[int, int]:
+    """Metrics on which `a` beats `b`, and on which `b` beats `a`."""
+    wins = losses = 0
+    for _, field, higher_is_better, _ in COMPARISON_METRICS:
+        if a[field] == b[field]:
+            continue
+        if (a[field] > b[field]) == higher_is_better:
+            wins += 1
+        else:
+            losses += 1
+    return wins, losses
+
+
+def _alternative_entry(startup: dict, wins: int, losses: int) -> dict:
+    return {
+        "id": startup["id"],
+        "name": startup["name"],
+        "category": startup["category"],
+        "trust_score": startup["trust_score"],
+        "metrics_won": wins,
+        "metrics_lost": losses,
+    }
+
+
+def _generate_recommendation(s1: dict, s2: dict) -> str:
+    """Generate AI recommendation based on comparison."""
+    score_1 = recommendation_score(s1)
+    score_2 = recommendation_score(s2)
+
+    if score_1 > score_2:
+        return f"{s1['name']} is recommended for enterprises prioritizing ROI and credibility."
+    else:
+        return f"{s2['name']} is recommended for enterprises prioritizing ROI and credibility."
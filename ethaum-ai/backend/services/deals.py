@@ -0,0 +1,123 @@
+"""EthAum AI - Enterprise Deals Catalog Service.
+
+The deals marketplace is read on every page view but changes rarely.
+The catalog is built from one embedded select and kept as
+pre-serialized JSON fragments, one per deal, so filtered and paginated
+pages are assembled without touching the database or re-validating.
+"""
+
+from typing import NamedTuple, Optional
+
+from database import get_db
+from schemas.deal import DealResponse
+from services.cache import TTLCache
+
+# Deals can also be edited directly in Supabase, so entries expire anyway
+_catalog = TTLCache(maxsize=1, ttl=300)
+_CATALOG_KEY = "active"
+
+
+class CatalogEntry(NamedTuple):
+    """One active deal with the fields it can be filtered on."""
+    deal_id: int
+    product_id: int
+    startup_name: str
+    category: str
+    credibility_score: int
+    json: bytes
+
+
+def get_deals_catalog() -> list[CatalogEntry]:
+    """Get the active deals catalog, building it on a cache miss."""
+    return _catalog.get_or_set(_CATALOG_KEY, _build_catalog)
+
+
+def get_deal_startup_name(deal_id: int) -> Optional[str]:
+    """
+    Name of the startup behind a deal, or None if the deal does not exist.
+
+    Active deals are answered from the cached catalog; others take one
+    embedded select.
+    """
+    for entry in get_deals_catalog():
+        if entry.deal_id == deal_id:
+            return entry.startup_name
+
+    db = get_db()
+    result = db.table("deals").select("id, products(name)").eq("id", deal_id).execute()
+    if not result.data:
+        return None
+    product = result.data[0].get("products") or {}
+    return product.get("name") or "Unknown"
+
+
+def render_deals_page(
+    category: Optional[str] = None,
+    min_credibility: Optional[int] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> tuple[bytes, int]:
+    """
+    Assemble a JSON array of deals from the cached catalog.
+
+    Returns:
+        The serialized page and the total number of matching deals.
+    """
+    entries = [
+        entry for entry in get_deals_catalog()
+        if (category is None or entry.category == category)
+        and (min_credibility is None or entry.credibility_score >= min_credibility)
+    ]
+    end = None if limit is None else offset + limit
+    page = entries[offset:end]
+    return b"[" + b",".join(entry.json for entry in page) + b"]", len(entries)
+
+
+def invalidate_deals_catalog(product_id: Optional[int] = None) -> None:
+    """
+    Drop the cached catalog after a deal or a linked product changes.
+
+    Args:
+        product_id: The product that changed. When given, the catalog is
+            kept unless one of its deals belongs to that product.
+    """
+    if product_id is not None:
+        catalog = _catalog.get(_CATALOG_KEY)
+        if catalog is not None and all(entry.product_id != product_id for entry in catalog):
+            return
+    _catalog.clear()
+
+
+def _build_catalog() -> list[CatalogEntry]:
+    db = get_db()
+
+    # Join deals with products to get startup names and credibility scores
+    deals_result = db.table("deals").select(
+        "id, product_id, title, description, trial_days, is_active, products(name, trust_score, category)"
+    ).eq("is_active", True).order("id").execute()
+
+    catalog = []
+    for deal in deals_result.data or []:
+        product = deal.get("products") or {"name": "Unknown", "trust_score": 0}
+
+        response = DealResponse(
+            id=deal["id"],
+            product_id=deal["product_id"],
+            startup_name=product["name"],
+            pilot_title=deal["title"],
+            description=deal["description"] or "",
+            ideal_buyer="Enterprise",
+            credibility_score=product["trust_score"],
+            pilot_duration=f"{deal['trial_days']} days",
+            status="open" if deal["is_active"] else "closed",
+        )
+        catalog.append(CatalogEntry(
+            deal_id=deal["id"],
+            product_id=deal["product_id"],
+            startup_name=response.startup_name,
+            category=product.get("category") or "",
+            credibility_score=response.credibility_score,
+            json=response.model_dump_json().encode("utf-8"),
+        ))
+
+    return catalog
@@ -0,0 +1,67 @@
+"""EthAum AI - Streaming Table Export.
+
+Exports walk a table in id order one page at a time (keyset, so every
+page costs the same index seek) and yield each page as NDJSON bytes, so
+memory stays at one page however large the table grows.
+"""
+
+import json
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from database import get_db
+
+EXPORT_PAGE_SIZE = 1000
+
+# Exportable tables and the columns they export
+EXPORT_COLUMNS = {
+    "products": "id, name, website, category, funding_stage, description, tagline, trust_score, "
+                "data_integrity, market_traction, user_sentiment, upvotes, status, user_id, created_at, updated_at",
+    "reviews": "id, product_id, user_id, rating, comment, reviewer_name, sentiment_score, verified, created_at",
+    "pilot_requests": "id, deal_id, product_id, owner_id, company_name, email, message, status, created_at, read_at",
+}
+
+
+def iter_ndjson(
+    table: str,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> Iterator[bytes]:
+    """
+    Yield a table's rows as NDJSON, one page of lines per chunk.
+
+    Args:
+        table: One of EXPORT_COLUMNS.
+        created_after: Only rows created at or after this time.
+        created_before: Only rows created before this time.
+        page_size: Rows fetched per request.
+    """
+    columns = EXPORT_COLUMNS[table]
+    db = get_db()
+    last_id = None
+    while True:
+        query = db.table(table).select(columns)
+        if created_after:
+            query = query.gte("created_at", created_after.isoformat())
+        if created_before:
+            query = query.lt("created_at", created_before.isoformat())
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(page_size).execute().data or []
+        if rows:
+            yield "".join(json.dumps(row, default=str) + "\n" for row in rows).encode("utf-8")
+            last_id = rows[-1]["id"]
+        if len(rows) < page_size:
+            return
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a byte stream into one gzip member, chunk by chunk."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,226 @@
+"""EthAum AI - Batch Matchmaking Job.
+
+Buyer matches only depend on a product's category, trust score and
+market traction, and on the buyer profiles. This job scores the whole
+approved catalog against the profiles across a process pool and stores
+each product's top matches in `product_buyer_matches`, next to the
+inputs they were computed from in `product_match_state`. Later runs
+only recompute products whose inputs changed, or every product when the
+profiles changed, so the matchmaking endpoint becomes a lookup.
+
+Run it from a scheduler with:
+
+    python -m services.match_batch [--workers N] [--full]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+
+from database import get_db
+from services.matchmaking import (
+    BUYER_PERSONAS,
+    TOP_MATCHES,
+    MatchmakingEngine,
+    get_engine,
+    load_approved_startups,
+    load_buyer_profiles,
+)
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 2000
+WRITE_BATCH_SIZE = 500
+STATE_PAGE_SIZE = 1000
+# Below this many changed products, forking workers costs more than it saves
+PARALLEL_THRESHOLD = 5000
+
+_worker_engine: Optional[MatchmakingEngine] = None
+
+
+def run_batch(workers: Optional[int] = None, full: bool = False) -> dict:
+    """
+    Bring stored matches up to date with the catalog and buyer profiles.
+
+    Args:
+        workers: Worker processes to score with. Defaults to the CPU count.
+        full: Recompute every product even if its inputs are unchanged.
+
+    Returns:
+        Run statistics: products, recomputed, removed and seconds.
+    """
+    started = time.perf_counter()
+    buyers = load_buyer_profiles() or BUYER_PERSONAS
+    engine = MatchmakingEngine(buyers)
+
+    products = load_approved_startups()
+    state = _load_state()
+
+    changed = [p for p in products if full or state.get(p["id"]) != _inputs(p, engine.version)]
+    approved_ids = {p["id"] for p in products}
+    removed = [pid for pid in state if pid not in approved_ids]
+
+    for start in range(0, len(removed), WRITE_BATCH_SIZE):
+        _delete_matches(removed[start:start + WRITE_BATCH_SIZE])
+
+    matches = _score(buyers, changed, workers)
+    for start in range(0, len(changed), WRITE_BATCH_SIZE):
+        end = start + WRITE_BATCH_SIZE
+        _write_matches(changed[start:end], matches[start:end], engine.version)
+
+    stats = {
+        "products": len(products),
+        "recomputed": len(changed),
+        "removed": len(removed),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info("Batch matchmaking finished: %s", stats)
+    return stats
+
+
+def stored_matches(product: dict, trust_score: int, market_traction: int) -> Optional[list[dict]]:
+    """
+    Buyer matches stored for a product, described for the API.
+
+    Args:
+        product: Product row with embedded `product_match_state` and
+            `product_buyer_matches`.
+        trust_score: The product's current trust score.
+        market_traction: The product's current market traction.
+
+    Returns:
+        The matches, or None if they are missing or were computed from
+        other inputs or buyer profiles than the current ones.
+    """
+    state = product.get("product_match_state")
+    if isinstance(state, list):
+        state = state[0] if state else None
+    if not state:
+        return None
+
+    engine = get_engine()
+    category = product.get("category") or ""
+    current = (category, trust_score, market_traction, engine.version)
+    if (state["category"], state["trust_score"], state["market_traction"], state["profiles_version"]) != current:
+        return None
+
+    matches = []
+    for row in sorted(product.get("product_buyer_matches") or [], key=lambda r: r["rank"]):
+        buyer = engine.buyers_by_id.get(row["buyer_id"])
+        if buyer is None:
+            return None
+        matches.append(engine._describe(buyer, row["match_score"], category, trust_score, market_traction))
+    return matches
+
+
+def _score(buyers: list[dict], products: list[dict], workers: Optional[int]) -> list[list[tuple[int, int]]]:
+    """Top (buyer_id, match_score) pairs for each product, in product order."""
+    rows = [(p["category"] or "", p["trust_score"] or 0, p["market_traction"] or 0) for p in products]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(rows) < PARALLEL_THRESHOLD:
+        _init_worker(buyers)
+        return _score_chunk(rows)
+
+    chunks = [rows[start:start + CHUNK_SIZE] for start in range(0, len(rows), CHUNK_SIZE)]
+    # Spawn, not fork: the API process may be running threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(buyers,)) as pool:
+        return [matches for chunk in pool.map(_score_chunk, chunks) for matches in chunk]
+
+
+def _init_worker(buyers: list[dict]) -> None:
+    global _worker_engine
+    _worker_engine = MatchmakingEngine(buyers)
+
+
+def _score_chunk(rows: list[tuple[str, int, int]]) -> list[list[tuple[int, int]]]:
+    engine = _worker_engine
+    return [
+        [(engine.buyers[position].get("id"), score) for score, position in engine.rank(*row, TOP_MATCHES)]
+        for row in rows
+    ]
+
+
+def _inputs(product: dict, version: str) -> tuple:
+    return (product["category"] or "", product["trust_score"] or 0, product["market_traction"] or 0, version)
+
+
+def _load_state() -> dict[int, tuple]:
+    """Inputs each stored product's matches were computed from."""
+    db = get_db()
+    state: dict[int, tuple] = {}
+    offset = 0
+    while True:
+        result = db.table("product_match_state").select(
+            "product_id, category, trust_score, market_traction, profiles_version"
+        ).order("product_id").range(offset, offset + STATE_PAGE_SIZE - 1).execute()
+        page = result.data or []
+        for row in page:
+            state[row["product_id"]] = (
+                row["category"] or "", row["trust_score"], row["market_traction"], row["profiles_version"]
+            )
+        offset += len(page)
+        if len(page) < STATE_PAGE_SIZE:
+            return state
+
+
+def _write_matches(products: list[dict], matches: list[list[tuple[int, int]]], version: str) -> None:
+    """
+    Store new matches for a batch of products.
+
+    Rows are upserted by (product_id, rank) and surplus ranks deleted
+    afterwards, so readers never see a product with its matches missing.
+    State is written last; a failure part-way leaves it stale, and the
+    products are picked up again on the next run.
+    """
+    db = get_db()
+    rows = [
+        {"product_id": product["id"], "rank": rank, "buyer_id": buyer_id, "match_score": score}
+        for product, product_matches in zip(products, matches)
+        for rank, (buyer_id, score) in enumerate(product_matches, start=1)
+    ]
+    if rows:
+        db.table("product_buyer_matches").upsert(rows, on_conflict="product_id,rank").execute()
+
+    by_count: dict[int, list[int]] = {}
+    for product, product_matches in zip(products, matches):
+        by_count.setdefault(len(product_matches), []).append(product["id"])
+    for count, ids in by_count.items():
+        if count < TOP_MATCHES:
+            db.table("product_buyer_matches").delete().in_("product_id", ids).gt("rank", count).execute()
+
+    computed_at = datetime.now(timezone.utc).isoformat()
+    db.table("product_match_state").upsert([
+        {
+            "product_id": product["id"],
+            "category": product["category"] or "",
+            "trust_score": product["trust_score"] or 0,
+            "market_traction": product["market_traction"] or 0,
+            "profiles_version": version,
+            "computed_at": computed_at,
+        }
+        for product in products
+    ], on_conflict="product_id").execute()
+
+
+def _delete_matches(product_ids: list[int]) -> None:
+    """Drop stored matches of products that are no longer approved."""
+    db = get_db()
+    db.table("product_match_state").delete().in_("product_id", product_ids).execute()
+    db.table("product_buyer_matches").delete().in_("product_id", product_ids).execute()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute stored buyer matches for changed products.")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--full", action="store_true", help="recompute every product")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(run_batch(workers=args.workers, full=args.full))
@@ -4,10 +4,43 @@ This module provides EXPLAINABLE AI HEURISTICS for matching
 enterprise buyers to startups based on category, trust score,
 and market traction.
 
+Buyer profiles are loaded from the `buyer_profiles` table into an
+indexed engine (category -> buyers, plus per-buyer trust thresholds)
+so a match only scores the buyers that can actually rank, even with
+tens of thousands of profiles. The built-in personas below are used
+when no profiles have been loaded.
+
+The reverse direction (startups for a buyer) uses an index of approved
+products grouped by category and sorted by trust and traction, so the
+top matches are found without scoring the whole catalog.
+
+Both are built on first use and rebuilt by a background refresher, so
+requests never wait on a reload.
+
 NOTE: This is an explainable AI heuristic for MVP demonstration.
 In production, this would use ML models trained on buyer behavior.
 """
 
+import bisect
+import hashlib
+import heapq
+import json
+import logging
+import threading
+from itertools import islice
+from typing import Optional
+
+import numpy as np
+
+from database import get_db
+
+logger = logging.getLogger(__name__)
+
+MIN_MATCH_SCORE = 30
+TOP_MATCHES = 5
+REFRESH_INTERVAL_SECONDS = 600
+PROFILE_PAGE_SIZE = 1000
+
 # Buyer personas for AI matchmaking
 BUYER_PERSONAS = [
     {
@@ -48,6 +81,228 @@ BUYER_PERSONAS = [
 ]
 
 
+class MatchmakingEngine:
+    """
+    Indexed buyer matching with the same scoring rules as the original
+    linear scan over personas.
+
+    A buyer that does not share a category with the startup can score at
+    most trust (+30) + traction (+30), and only if the startup meets the
+    buyer's minimum trust score. So only category candidates (found via
+    the inverted index) need individual scoring; every other buyer scores
+    the same base value, and the best of those are simply the earliest
+    buyers whose threshold the startup meets.
+    """
+
+    def __init__(self, buyers: list[dict]):
+        self.buyers = buyers
+        self.buyers_by_id = {b.get("id"): b for b in buyers}
+        self.version = profiles_fingerprint(buyers)
+        self.min_trust = np.array([b["min_trust_score"] for b in buyers], dtype=np.float64)
+
+        # category -> sorted buyer positions
+        index: dict[str, list[int]] = {}
+        for position, buyer in enumerate(buyers):
+            for category in set(buyer["categories"]):
+                index.setdefault(category, []).append(position)
+        self.category_index = {cat: np.array(ids, dtype=np.int64) for cat, ids in index.items()}
+
+        # min_trust_score -> sorted buyer positions, thresholds ascending
+        by_threshold: dict[float, list[int]] = {}
+        for position, buyer in enumerate(buyers):
+            by_threshold.setdefault(float(buyer["min_trust_score"]), []).append(position)
+        self.thresholds = sorted(by_threshold)
+        self.threshold_positions = [by_threshold[t] for t in self.thresholds]
+
+    def match(self, category: str, trust_score: int, market_traction: int, top_k: int = TOP_MATCHES) -> list[dict]:
+        """Top-K buyers for a startup, ordered by score then buyer order."""
+        return [
+            self._describe(self.buyers[position], score, category, trust_score, market_traction)
+            for score, position in self.rank(category, trust_score, market_traction, top_k)
+        ]
+
+    def rank(self, category: str, trust_score: int, market_traction: int, top_k: int = TOP_MATCHES) -> list[tuple[int, int]]:
+        """Top-K (match_score, buyer position) pairs for a startup, best first."""
+        trust_points = 30 if trust_score >= 80 else 15 if trust_score >= 60 else 0
+        traction_points = 30 if market_traction >= 60 else 15 if market_traction >= 40 else 0
+
+        exact = self.category_index.get(category, np.empty(0, dtype=np.int64))
+        partial_lists = [ids for cat, ids in self.category_index.items() if cat != category and cat in category]
+        partial = np.setdiff1d(np.concatenate(partial_lists), exact) if partial_lists else np.empty(0, dtype=np.int64)
+
+        candidates = np.concatenate([exact, partial])
+        bonus = np.concatenate([np.full(len(exact), 40), np.full(len(partial), 20)])
+        scores = bonus + traction_points + np.where(self.min_trust[candidates] <= trust_score, trust_points, -20)
+
+        # Best top_k candidates by (score desc, buyer order), selected in numpy
+        keep = scores >= MIN_MATCH_SCORE
+        candidates, scores = candidates[keep], scores[keep]
+        if len(candidates) > top_k:
+            order_key = -scores * len(self.buyers) + candidates
+            best = np.argpartition(order_key, top_k)[:top_k]
+            candidates, scores = candidates[best], scores[best]
+        ranked = list(zip((-scores).tolist(), candidates.tolist()))
+
+        # Buyers outside the category sets all score the same base value
+        base = trust_points + traction_points
+        if base >= MIN_MATCH_SCORE:
+            mask = np.zeros(len(self.buyers), dtype=np.bool_)
+            for ids in [exact] + partial_lists:
+                mask[ids] = True
+            excluded = mask.tobytes()
+            eligible = heapq.merge(*self.threshold_positions[:bisect.bisect_right(self.thresholds, trust_score)])
+            others = islice((p for p in eligible if not excluded[p]), top_k)
+            ranked.extend((-base, position) for position in others)
+
+        return [(-negative_score, position) for negative_score, position in heapq.nsmallest(top_k, ranked)]
+
+    @staticmethod
+    def _describe(
+        buyer: dict,
+        match_score: int,
+        category: str,
+        trust_score: int,
+        market_traction: int,
+    ) -> dict:
+        """Build a match entry with the explainable reasons for its score."""
+        return {
+            "buyer_type": buyer["buyer_type"],
+            "buyer_description": buyer["description"],
+            "match_score": min(100, max(0, match_score)),
+            "reasons": _match_reasons(buyer, category, trust_score, market_traction),
+            "recommendation": _get_recommendation(match_score),
+        }
+
+
+class StartupIndex:
+    """
+    Approved startups grouped by category, each group sorted by
+    (trust_score desc, market_traction desc, id asc), for ranking the
+    catalog against a single buyer.
+
+    A startup's score only grows with trust and traction, so walking a
+    group in this order gives a running upper bound for everything left
+    in it; once that bound can't beat the current K-th best the rest of
+    the group is skipped.
+
+    Group lists are never modified in place: writers swap in a new list
+    under the lock, so a reader can walk the lists it took a snapshot of
+    while upserts go on.
+    """
+
+    def __init__(self, products: list[dict]):
+        self._lock = threading.Lock()
+        self._groups: dict[str, list[tuple]] = {}
+        self._products: dict[int, dict] = {}
+        for product in map(_matching_fields, products):
+            self._products[product["id"]] = product
+            self._groups.setdefault(product["category"], []).append(_entry(product))
+        for entries in self._groups.values():
+            entries.sort()
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def upsert(self, product: dict) -> None:
+        """Add or re-position a startup after its fields changed."""
+        with self._lock:
+            self._remove(product["id"])
+            self._insert(product)
+
+    def remove(self, product_id: int) -> None:
+        """Drop a startup that is no longer approved."""
+        with self._lock:
+            self._remove(product_id)
+
+    def top_for_buyer(self, buyer: dict, top_k: int) -> list[tuple[int, dict]]:
+        """
+        Best-matching startups for a buyer.
+
+        Returns:
+            (match_score, product) pairs, best first. Ties are broken by
+            trust score, then traction, then lowest id.
+        """
+        buyer_categories = set(buyer["categories"])
+        min_trust = buyer["min_trust_score"]
+
+        def trust_points(trust: int) -> int:
+            if trust < min_trust:
+                return -20
+            return 30 if trust >= 80 else 15 if trust >= 60 else 0
+
+        with self._lock:
+            snapshot = list(self._groups.items())
+
+        groups = []
+        for category, entries in snapshot:
+            if not entries:
+                continue
+            if category in buyer_categories:
+                bonus = 40
+            elif any(cat in category for cat in buyer_categories):
+                bonus = 20
+            else:
+                bonus = 0
+            groups.append((bonus, entries))
+
+        def group_bound(group: tuple) -> tuple:
+            bonus, entries = group
+            neg_trust, neg_traction, product_id, _ = entries[0]
+            return (bonus + trust_points(-neg_trust) + 30, -neg_trust, -neg_traction, -product_id)
+
+        best: list[tuple] = []  # min-heap of ((score, trust, traction, -id), product)
+        for bonus, entries in sorted(groups, key=group_bound, reverse=True):
+            for neg_trust, neg_traction, product_id, product in entries:
+                trust, traction = -neg_trust, -neg_traction
+                points = bonus + trust_points(trust)
+                # Upper bound for this entry and every entry after it in the group
+                if points + 30 < MIN_MATCH_SCORE:
+                    break
+                if len(best) == top_k and (points + 30, trust, traction, -product_id) < best[0][0]:
+                    break
+
+                score = points + (30 if traction >= 60 else 15 if traction >= 40 else 0)
+                if score < MIN_MATCH_SCORE:
+                    continue
+                key = (score, trust, traction, -product_id)
+                # Keys are unique by id, so the heap never compares products
+                if len(best) < top_k:
+                    heapq.heappush(best, (key, product))
+                elif key > best[0][0]:
+                    heapq.heapreplace(best, (key, product))
+
+        return [(key[0], product) for key, product in sorted(best, key=lambda item: item[0], reverse=True)]
+
+    def _insert(self, product: dict) -> None:
+        product = _matching_fields(product)
+        self._products[product["id"]] = product
+        entries = list(self._groups.get(product["category"], ()))
+        bisect.insort(entries, _entry(product))
+        self._groups[product["category"]] = entries
+
+    def _remove(self, product_id: int) -> None:
+        product = self._products.pop(product_id, None)
+        if product is None:
+            return
+        entries = self._groups.get(product["category"], [])
+        position = bisect.bisect_left(entries, _entry(product)[:3])
+        if position < len(entries) and entries[position][2] == product_id:
+            self._groups[product["category"]] = entries[:position] + entries[position + 1:]
+
+
+_engine: Optional[MatchmakingEngine] = None
+_engine_lock = threading.Lock()
+
+_startups: Optional[StartupIndex] = None
+_startups_lock = threading.Lock()
+# Ids written while the startup index is being rebuilt, re-applied after the swap
+_missed: Optional[set[int]] = None
+_missed_lock = threading.Lock()
+
+_stop = threading.Event()
+_refresher: Optional[threading.Thread] = None
+
+
 def match_buyers_to_startup(
     category: str,
     trust_score: int,
@@ -73,55 +328,219 @@ def match_buyers_to_startup(
     Returns:
         List of matched buyer personas with scores and reasons
     """
-    matches = []
-    
-    for buyer in BUYER_PERSONAS:
-        match_score = 0
-        reasons = []
-        
-        # Category matching (+40 max)
-        if category in buyer["categories"]:
-            match_score += 40
-            reasons.append(f"Strong category fit: {category}")
-        elif any(cat in category for cat in buyer["categories"]):
-            match_score += 20
-            reasons.append(f"Partial category alignment")
-        
-        # Trust score evaluation (+30 max)
-        if trust_score >= buyer["min_trust_score"]:
-            if trust_score >= 80:
-                match_score += 30
-                reasons.append(f"High credibility (Trust Score: {trust_score})")
-            elif trust_score >= 60:
-                match_score += 15
-                reasons.append(f"Good credibility (Trust Score: {trust_score})")
+    return get_engine().match(category, trust_score, market_traction)
+
+
+def get_engine() -> MatchmakingEngine:
+    """Get the buyer engine, building it on first use."""
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                reload_engine()
+    return _engine
+
+
+def reload_engine() -> None:
+    """Rebuild the buyer engine from the database, keeping the current one if the load fails."""
+    global _engine
+    try:
+        buyers = load_buyer_profiles()
+    except Exception:
+        logger.exception("Failed to load buyer profiles, keeping current set")
+        buyers = None
+    if buyers or _engine is None:
+        _engine = MatchmakingEngine(buyers or BUYER_PERSONAS)
+
+
+def load_buyer_profiles() -> list[dict]:
+    """Load every buyer profile from the database, in id order."""
+    db = get_db()
+    buyers: list[dict] = []
+    while True:
+        result = db.table("buyer_profiles").select(
+            "id, buyer_type, categories, min_trust_score, description"
+        ).order("id").range(len(buyers), len(buyers) + PROFILE_PAGE_SIZE - 1).execute()
+        page = result.data or []
+        buyers.extend(page)
+        if len(page) < PROFILE_PAGE_SIZE:
+            return [{**b, "categories": b.get("categories") or [], "description": b.get("description") or ""} for b in buyers]
+
+
+def match_startups_to_buyer(buyer: dict, top_k: int = 10) -> list[dict]:
+    """
+    Rank the approved catalog for an enterprise buyer.
+
+    Applies the same scoring rules as `match_buyers_to_startup`, from the
+    buyer's side.
+
+    Args:
+        buyer: Buyer profile with categories and min_trust_score.
+        top_k: Number of startups to return.
+
+    Returns:
+        Matched startups with scores, reasons and recommendation.
+    """
+    return [
+        {
+            "id": product["id"],
+            "name": product["name"],
+            "category": product["category"],
+            "trust_score": product["trust_score"],
+            "market_traction": product["market_traction"],
+            "match_score": min(100, max(0, score)),
+            "reasons": _match_reasons(buyer, product["category"], product["trust_score"], product["market_traction"]),
+            "recommendation": _get_recommendation(score),
+        }
+        for score, product in get_startup_index().top_for_buyer(buyer, top_k)
+    ]
+
+
+def get_startup_index() -> StartupIndex:
+    """Get the startup index, building it on first use."""
+    if _startups is None:
+        with _startups_lock:
+            if _startups is None:
+                rebuild_startup_index()
+    return _startups
+
+
+def rebuild_startup_index() -> int:
+    """Rebuild the startup index from the approved catalog. Returns the number of products."""
+    global _startups, _missed
+    with _missed_lock:
+        _missed = set()
+    try:
+        startups = StartupIndex(load_approved_startups())
+        with _missed_lock:
+            _startups = startups
+            missed = _missed
+    finally:
+        with _missed_lock:
+            _missed = None
+    if missed:
+        refresh_startups(list(missed))
+    return len(startups)
+
+
+def start_refresher() -> None:
+    """Build the buyer engine and startup index in the background and rebuild them periodically."""
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return
+    _stop.clear()
+    _refresher = threading.Thread(target=_refresh_loop, name="matchmaking-index", daemon=True)
+    _refresher.start()
+
+
+def stop_refresher() -> None:
+    """Stop the periodic rebuild."""
+    _stop.set()
+
+
+def refresh_startup(product_id: int) -> None:
+    """Write-path hook: re-read one product into the startup index if it is loaded."""
+    refresh_startups([product_id])
+
+
+def refresh_startups(product_ids: list[int]) -> None:
+    """Write-path hook: re-read a batch of products into the startup index with one query."""
+    with _missed_lock:
+        if _missed is not None:
+            _missed.update(product_ids)
+    if _startups is None or not product_ids:
+        return
+    try:
+        db = get_db()
+        result = db.table("products").select(
+            "id, name, category, trust_score, market_traction, status"
+        ).in_("id", list(product_ids)).execute()
+    except Exception:
+        logger.exception("Failed to refresh startup index for products %s", product_ids)
+        return
+
+    approved = {row["id"]: row for row in result.data or [] if row.get("status") == "approved"}
+    for product_id in product_ids:
+        if product_id in approved:
+            _startups.upsert(approved[product_id])
         else:
-            # Below minimum threshold
-            match_score -= 20
-            reasons.append(f"Below trust threshold")
-        
-        # Market traction evaluation (+30 max)
-        if market_traction >= 60:
-            match_score += 30
-            reasons.append("Strong market traction signals")
-        elif market_traction >= 40:
-            match_score += 15
-            reasons.append("Growing market presence")
-        
-        # Only include matches above 30%
-        if match_score >= 30:
-            matches.append({
-                "buyer_type": buyer["buyer_type"],
-                "buyer_description": buyer["description"],
-                "match_score": min(100, max(0, match_score)),
-                "reasons": reasons,
-                "recommendation": _get_recommendation(match_score),
-            })
-    
-    # Sort by match score descending
-    matches.sort(key=lambda x: x["match_score"], reverse=True)
-    
-    return matches[:5]  # Return top 5 matches
+            _startups.remove(product_id)
+
+
+def load_approved_startups() -> list[dict]:
+    """Load the matching inputs of every approved product, in id order."""
+    db = get_db()
+    products: list[dict] = []
+    while True:
+        result = db.table("products").select(
+            "id, name, category, trust_score, market_traction"
+        ).eq("status", "approved").order("id").range(len(products), len(products) + PROFILE_PAGE_SIZE - 1).execute()
+        page = result.data or []
+        products.extend(page)
+        if len(page) < PROFILE_PAGE_SIZE:
+            return products
+
+
+def profiles_fingerprint(buyers: list[dict]) -> str:
+    """Short hash identifying a set of buyer profiles, to detect when stored matches are stale."""
+    payload = json.dumps(
+        [[b.get("id"), sorted(b["categories"]), b["min_trust_score"]] for b in buyers],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _refresh_loop() -> None:
+    while True:
+        # Each build holds its lock so a first request waits for it instead of starting its own
+        with _engine_lock:
+            reload_engine()
+        try:
+            with _startups_lock:
+                rebuild_startup_index()
+        except Exception:
+            logger.exception("Startup index rebuild failed")
+        if _stop.wait(REFRESH_INTERVAL_SECONDS):
+            return
+
+
+def _matching_fields(product: dict) -> dict:
+    return {
+        "id": product["id"],
+        "name": product.get("name") or "",
+        "category": product.get("category") or "",
+        "trust_score": product.get("trust_score") or 0,
+        "market_traction": product.get("market_traction") or 0,
+    }
+
+
+def _entry(product: dict) -> tuple:
+    """Group entry: sort key (trust desc, traction desc, id asc) followed by the product itself."""
+    return (-product["trust_score"], -product["market_traction"], product["id"], product)
+
+
+def _match_reasons(buyer: dict, category: str, trust_score: int, market_traction: int) -> list[str]:
+    """Explainable reasons behind a buyer/startup match score."""
+    reasons = []
+
+    if category in buyer["categories"]:
+        reasons.append(f"Strong category fit: {category}")
+    elif any(cat in category for cat in buyer["categories"]):
+        reasons.append("Partial category alignment")
+
+    if trust_score >= buyer["min_trust_score"]:
+        if trust_score >= 80:
+            reasons.append(f"High credibility (Trust Score: {trust_score})")
+        elif trust_score >= 60:
+            reasons.append(f"Good credibility (Trust Score: {trust_score})")
+    else:
+        reasons.append("Below trust threshold")
+
+    if market_traction >= 60:
+        reasons.append("Strong market traction signals")
+    elif market_traction >= 40:
+        reasons.append("Growing market presence")
+
+    return reasons
 
 
 def _get_recommendation(score: int) -> str:
@@ -0,0 +1,81 @@
+"""EthAum AI - Keyset Pagination Helpers.
+
+Lists that grow without bound are paged by a (sort_key, id) cursor
+instead of OFFSET, so every page costs the same index seek no matter
+how deep the client has scrolled.
+"""
+
+import base64
+import json
+from typing import Any, Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encode the sort values of the last row on a page as an opaque cursor."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Decode a cursor produced by `encode_cursor`; 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(columns: list[str], values: list[Any], desc: bool = True) -> str:
+    """
+    PostgREST `or` expression selecting rows after a cursor.
+
+    For columns (a, id) descending this is
+    `a.lt.X,and(a.eq.X,id.lt.Y)`, i.e. the row-value comparison
+    (a, id) < (X, Y), which the matching composite index can seek.
+    """
+    op = "lt" if desc else "gt"
+    clauses = []
+    for depth in range(len(columns)):
+        equal = [f"{col}.eq.{_quote(val)}" for col, val in zip(columns[:depth], values[:depth])]
+        after = f"{columns[depth]}.{op}.{_quote(values[depth])}"
+        clauses.append(f"and({','.join(equal + [after])})" if equal else after)
+    return ",".join(clauses)
+
+
+def apply_keyset(query, columns: list[str], cursor: Optional[str], desc: bool = True):
+    """Order a query by `columns` and, given a cursor, start after it."""
+    for column in columns:
+        query = query.order(column, desc=desc)
+    if cursor:
+        query = query.or_(keyset_filter(columns, decode_cursor(cursor, len(columns)), desc))
+    return query
+
+
+def page_of(rows: list[dict], columns: list[str], limit: int) -> tuple[list[dict], Optional[str]]:
+    """
+    Split a `limit + 1` result into the page and the cursor for the next one.
+
+    Returns:
+        The rows to return and the next cursor, or None on the last page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor([page[-1].get(column) for column in columns])
+
+
+def _quote(value: Any) -> str:
+    """Quote a filter value so commas, dots and parentheses survive PostgREST parsing."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
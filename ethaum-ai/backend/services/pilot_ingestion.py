@@ -0,0 +1,296 @@
+"""EthAum AI - Pilot Request Ingestion Service.
+
+Pilot requests are accepted into an in-process queue and written to
+`pilot_requests` in micro-batches by a background thread, so a burst
+of submissions never ties up request workers on database round-trips.
+
+Each submission carries an idempotency key (client-supplied or
+generated). A client key is scoped to the deal and contact email, so
+two buyers who happen to send the same key never collide. Repeats of
+a key return the original submission, and reusing it for a different
+request is refused. The key is stored with a unique constraint so
+retries across workers or after a failed batch cannot create
+duplicate rows.
+
+Status and keys are tracked in memory for speed. When this process
+does not know a submission (after a restart, or on another worker),
+it is looked up in `pilot_requests` by request_id or key.
+"""
+
+import hashlib
+import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from database import get_db
+from services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+QUEUE_CAPACITY = 10_000
+BATCH_SIZE = 100
+BATCH_WINDOW_SECONDS = 0.05
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 0.5
+
+QUEUED = "queued"
+STORED = "stored"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when the ingestion queue cannot accept more submissions."""
+
+
+class IdempotencyConflictError(Exception):
+    """Raised when an idempotency key is reused for a different request."""
+
+
+# request_id -> submission record; scoped idempotency key -> (request_id, payload)
+_submissions = TTLCache(maxsize=100_000, ttl=86_400)
+_idempotency = TTLCache(maxsize=100_000, ttl=86_400)
+_submit_lock = threading.Lock()
+
+_queue: queue.Queue = queue.Queue(maxsize=QUEUE_CAPACITY)
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+
+
+def submit_pilot_request(
+    deal_id: int,
+    company_name: str,
+    email: str,
+    message: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+) -> tuple[dict, bool]:
+    """
+    Queue a pilot request for insertion.
+
+    Args:
+        deal_id: Deal the request is for.
+        company_name: Requesting company.
+        email: Contact email.
+        message: Optional note to the startup.
+        idempotency_key: Client key used to collapse repeated submissions.
+
+    Returns:
+        The submission record and whether it was newly created.
+
+    Raises:
+        QueueFullError: If the queue is at capacity.
+        IdempotencyConflictError: If the key was used for a different request.
+    """
+    key = _scoped_key(deal_id, email, idempotency_key) if idempotency_key else None
+    payload = (company_name, message or None)
+
+    if key:
+        # The database lookup stays outside the lock; the cache is checked again below
+        existing = _cached_submission(key, payload) or _stored_submission(key, payload)
+        if existing is not None:
+            return existing, False
+
+    with _submit_lock:
+        if key:
+            existing = _cached_submission(key, payload)
+            if existing is not None:
+                return existing, False
+
+        request_id = uuid.uuid4().hex
+        record = {
+            "request_id": request_id,
+            "status": QUEUED,
+            "deal_id": deal_id,
+            "pilot_request_id": None,
+            "attempts": 0,
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+        }
+        row = {
+            "deal_id": deal_id,
+            "company_name": company_name,
+            "email": email,
+            "message": message,
+            "status": "pending",
+            "idempotency_key": key or request_id,
+            "request_id": request_id,
+        }
+
+        try:
+            _queue.put_nowait((record, row))
+        except queue.Full:
+            raise QueueFullError("Pilot request queue is full")
+
+        _submissions.set(request_id, record)
+        if key:
+            _idempotency.set(key, (request_id, payload))
+
+    return record, True
+
+
+def get_submission(request_id: str) -> Optional[dict]:
+    """Current state of a submission, or None if it was never stored."""
+    record = _submissions.get(request_id)
+    if record is None:
+        row = _find_row("request_id", request_id)
+        if row is not None:
+            record = _record_from_row(row)
+            _submissions.set(request_id, record)
+    return record
+
+
+def start_worker() -> None:
+    """Start the background batch writer for this worker process."""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    _stop.clear()
+    _worker = threading.Thread(target=_worker_loop, name="pilot-ingestion", daemon=True)
+    _worker.start()
+
+
+def stop_worker(timeout: float = 10.0) -> None:
+    """Stop accepting batches and write out whatever is still queued."""
+    _stop.set()
+    if _worker is not None:
+        _worker.join(timeout=timeout)
+
+
+def _worker_loop() -> None:
+    while not (_stop.is_set() and _queue.empty()):
+        batch = _next_batch()
+        if batch:
+            _write_batch(batch)
+
+
+def _next_batch() -> list[tuple[dict, dict]]:
+    """Wait for one item, then gather more until the batch fills or the window closes."""
+    try:
+        batch = [_queue.get(timeout=0.5)]
+    except queue.Empty:
+        return []
+
+    deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+    while len(batch) < BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _write_batch(batch: list[tuple[dict, dict]]) -> None:
+    """
+    Insert a batch, retrying with exponential backoff before giving up.
+
+    A batch rejected for its data is split in half and each half written
+    on its own, so one bad row fails alone instead of taking the rest of
+    the batch with it.
+    """
+    db = get_db()
+    rows = [row for _, row in batch]
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        for record, _ in batch:
+            record["attempts"] = attempt
+        try:
+            result = db.table("pilot_requests").upsert(
+                rows, on_conflict="idempotency_key", ignore_duplicates=True
+            ).execute()
+        except Exception as error:
+            if _is_data_error(error):
+                if len(batch) > 1:
+                    middle = len(batch) // 2
+                    _write_batch(batch[:middle])
+                    _write_batch(batch[middle:])
+                    return
+                logger.warning("Pilot request %s rejected: %s", batch[0][0]["request_id"], error)
+                break
+            logger.exception("Pilot request batch of %d failed (attempt %d)", len(rows), attempt)
+            if attempt < MAX_ATTEMPTS and not _stop.is_set():
+                time.sleep(BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+            continue
+
+        stored_ids = {r.get("idempotency_key"): r.get("id") for r in result.data or []}
+        duplicates = [row["idempotency_key"] for _, row in batch if row["idempotency_key"] not in stored_ids]
+        if duplicates:
+            stored_ids.update(_existing_ids(duplicates))
+        for record, row in batch:
+            record["status"] = STORED
+            record["pilot_request_id"] = stored_ids.get(row["idempotency_key"])
+        return
+
+    for record, _ in batch:
+        record["status"] = FAILED
+
+
+def _is_data_error(error: Exception) -> bool:
+    """Whether the database rejected the rows themselves (data exception or constraint violation)."""
+    code = str(getattr(error, "code", None) or "")
+    return code[:2] in ("22", "23")
+
+
+def _scoped_key(deal_id: int, email: str, idempotency_key: str) -> str:
+    """Stored form of a client key, unique per deal and contact email."""
+    scope = f"{deal_id}\x00{email.strip().lower()}\x00{idempotency_key}"
+    return hashlib.sha256(scope.encode("utf-8")).hexdigest()
+
+
+def _cached_submission(key: str, payload: tuple) -> Optional[dict]:
+    """The in-memory submission for a key, if this process has it."""
+    entry = _idempotency.get(key)
+    if entry is None:
+        return None
+    request_id, original = entry
+    if original != payload:
+        raise IdempotencyConflictError("Idempotency key was already used for a different request")
+    return _submissions.get(request_id)
+
+
+def _stored_submission(key: str, payload: tuple) -> Optional[dict]:
+    """The stored submission for a key, for keys first seen by another process."""
+    row = _find_row("idempotency_key", key)
+    if row is None:
+        return None
+    if (row.get("company_name"), row.get("message") or None) != payload:
+        raise IdempotencyConflictError("Idempotency key was already used for a different request")
+    record = _record_from_row(row)
+    if record["request_id"]:
+        _submissions.set(record["request_id"], record)
+        _idempotency.set(key, (record["request_id"], payload))
+    return record
+
+
+def _find_row(column: str, value: str) -> Optional[dict]:
+    db = get_db()
+    result = db.table("pilot_requests").select(
+        "id, request_id, deal_id, company_name, message, created_at"
+    ).eq(column, value).limit(1).execute()
+    return result.data[0] if result.data else None
+
+
+def _record_from_row(row: dict) -> dict:
+    return {
+        "request_id": row.get("request_id"),
+        "status": STORED,
+        "deal_id": row.get("deal_id"),
+        "pilot_request_id": row.get("id"),
+        "attempts": None,
+        "submitted_at": row.get("created_at"),
+    }
+
+
+def _existing_ids(keys: list[str]) -> dict[str, int]:
+    """Row ids for keys whose insert was ignored as a duplicate."""
+    db = get_db()
+    try:
+        result = db.table("pilot_requests").select("id, idempotency_key").in_("idempotency_key", keys).execute()
+    except Exception:
+        logger.exception("Failed to look up %d duplicate pilot requests", len(keys))
+        return {}
+    return {r["idempotency_key"]: r["id"] for r in result.data or []}
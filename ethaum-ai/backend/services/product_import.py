@@ -0,0 +1,278 @@
+"""EthAum AI - Bulk Product Import.
+
+Seeds the marketplace from partner lists. The file is parsed as a
+stream, one CSV or JSONL row at a time. Each row is validated against
+`ProductCreate` and deduplicated on its normalised website, against
+both the catalog and earlier rows. Rows are inserted in batches, with
+the same initial scores `create_product` gives a single submission.
+
+Run it from a shell with:
+
+    python -m services.product_import partners.csv [--batch-size N] [--approve]
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+import time
+from typing import BinaryIO, Callable, Iterator, Optional
+from urllib.parse import urlsplit
+
+from pydantic import ValidationError
+
+from database import get_db
+from schemas.product import ProductCreate
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "jsonl")
+DEFAULT_BATCH_SIZE = 500
+WEBSITE_PAGE_SIZE = 1000
+# Errors beyond this many are counted but not listed in the report
+MAX_REPORTED_ERRORS = 100
+
+INITIAL_TRUST_SCORE = 70
+INITIAL_SIGNAL_SCORE = 70
+
+
+def initial_product_row(product: ProductCreate, user_id: Optional[str], status: str = "pending") -> dict:
+    """The products row for a new submission, with its starting scores."""
+    row = {
+        "name": product.name,
+        "website": product.website,
+        "category": product.category,
+        "funding_stage": product.funding_stage,
+        "description": product.description,
+        "trust_score": INITIAL_TRUST_SCORE,
+        "data_integrity": INITIAL_SIGNAL_SCORE,
+        "market_traction": INITIAL_SIGNAL_SCORE,
+        "user_sentiment": INITIAL_SIGNAL_SCORE,
+        "user_id": user_id,
+        "status": status,
+    }
+    if product.tagline:
+        row["tagline"] = product.tagline
+    return row
+
+
+def normalize_website(website: str) -> str:
+    """Host and path of a URL, lowercased, without scheme, `www.` or trailing slash."""
+    text = website.strip().lower()
+    parts = urlsplit(text if "://" in text else f"//{text}")
+    host = parts.netloc.removeprefix("www.")
+    return f"{host}{parts.path}".rstrip("/")
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """File format from an extension, or None if it is not one we read."""
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    return {"csv": "csv", "jsonl": "jsonl", "ndjson": "jsonl"}.get(extension)
+
+
+def iter_rows(stream: BinaryIO, format: str) -> Iterator[tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Parse a CSV (with a header row) or JSONL byte stream lazily.
+
+    Yields:
+        (row number, fields, None) for parsed rows and
+        (row number, None, error) for rows that could not be parsed.
+    """
+    if not hasattr(stream, "readable"):
+        # Upload spool files only gained the io.IOBase methods in Python 3.11
+        stream = io.BufferedReader(_RawReader(stream))
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if format == "csv":
+            for number, row in enumerate(csv.DictReader(text), start=1):
+                if None in row:
+                    yield number, None, "More values than header columns"
+                else:
+                    yield number, {key: value for key, value in row.items() if value not in (None, "")}, None
+        else:
+            for number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as error:
+                    yield number, None, f"Invalid JSON: {error.msg}"
+                    continue
+                if isinstance(row, dict):
+                    yield number, row, None
+                else:
+                    yield number, None, "Expected a JSON object"
+    finally:
+        # Leave the underlying stream for the caller to close
+        text.detach()
+
+
+class _RawReader(io.RawIOBase):
+    """Minimal raw stream over any object with read(), for TextIOWrapper."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def import_products(
+    stream: BinaryIO,
+    format: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    status: str = "pending",
+    user_id: Optional[str] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+    on_insert: Optional[Callable[[list[dict]], None]] = None,
+) -> dict:
+    """
+    Import products from a CSV or JSONL stream.
+
+    Args:
+        stream: Binary file object; read once, front to back.
+        format: "csv" or "jsonl".
+        batch_size: Rows per insert request.
+        status: Moderation status for the new products.
+        user_id: Owner to record on the new products, if any.
+        progress: Called with the running report after every batch.
+        on_insert: Called with the inserted rows (as returned by the
+            database, with their ids) after every batch.
+
+    Returns:
+        Report with rows, inserted, duplicates, invalid, failed, the
+        first MAX_REPORTED_ERRORS errors by row number, seconds and
+        rows_per_second.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+
+    started = time.perf_counter()
+    report = {"rows": 0, "inserted": 0, "duplicates": 0, "invalid": 0, "failed": 0, "errors": []}
+    seen = _existing_websites()
+    batch: list[tuple[int, dict]] = []
+
+    for number, fields, error in iter_rows(stream, format):
+        report["rows"] += 1
+        if error is None:
+            try:
+                product = ProductCreate(**fields)
+            except ValidationError as validation:
+                error = "; ".join(
+                    f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in validation.errors()
+                )
+        if error is not None:
+            report["invalid"] += 1
+            _record_error(report, number, error)
+            continue
+
+        website = normalize_website(product.website)
+        if website in seen:
+            report["duplicates"] += 1
+            continue
+        seen.add(website)
+
+        batch.append((number, initial_product_row(product, user_id, status)))
+        if len(batch) >= batch_size:
+            _insert_batch(batch, report, on_insert)
+            batch = []
+            _report_progress(report, started, progress)
+
+    if batch:
+        _insert_batch(batch, report, on_insert)
+    # Progress was already reported for a final full batch; just stamp the totals
+    _report_progress(report, started, progress if batch else None)
+    return report
+
+
+def _insert_batch(
+    batch: list[tuple[int, dict]],
+    report: dict,
+    on_insert: Optional[Callable[[list[dict]], None]] = None,
+) -> None:
+    """Insert a batch in one request, falling back to row by row to isolate failures."""
+    db = get_db()
+    inserted: list[dict] = []
+    try:
+        inserted = db.table("products").insert([row for _, row in batch]).execute().data or []
+        report["inserted"] += len(batch)
+    except Exception:
+        logger.warning("Batch insert of %d products failed; retrying row by row", len(batch))
+        for number, row in batch:
+            try:
+                inserted.extend(db.table("products").insert(row).execute().data or [])
+                report["inserted"] += 1
+            except Exception as error:
+                report["failed"] += 1
+                _record_error(report, number, f"Insert failed: {error}")
+
+    if on_insert is not None and inserted:
+        on_insert(inserted)
+
+
+def _existing_websites() -> set[str]:
+    """Normalised websites of every product already in the catalog."""
+    db = get_db()
+    websites: set[str] = set()
+    offset = 0
+    while True:
+        page = db.table("products").select("id, website").order("id").range(
+            offset, offset + WEBSITE_PAGE_SIZE - 1
+        ).execute().data or []
+        websites.update(normalize_website(row["website"]) for row in page if row.get("website"))
+        offset += len(page)
+        if len(page) < WEBSITE_PAGE_SIZE:
+            return websites
+
+
+def _record_error(report: dict, number: int, error: str) -> None:
+    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+        report["errors"].append({"row": number, "error": error})
+
+
+def _report_progress(report: dict, started: float, progress: Optional[Callable[[dict], None]]) -> None:
+    seconds = time.perf_counter() - started
+    report["seconds"] = round(seconds, 3)
+    report["rows_per_second"] = round(report["rows"] / seconds, 1) if seconds else 0.0
+    if progress is not None:
+        progress(report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import products from a CSV or JSONL file.")
+    parser.add_argument("path", help="file to import, or - for stdin")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="rows per insert")
+    parser.add_argument("--approve", action="store_true", help="import as approved instead of pending")
+    args = parser.parse_args()
+
+    file_format = args.format or detect_format(args.path)
+    if file_format is None:
+        parser.error("cannot tell the format from the file name; pass --format")
+
+    logging.basicConfig(level=logging.INFO)
+
+    def print_progress(report: dict) -> None:
+        print(
+            f"{report['rows']} rows, {report['inserted']} inserted, {report['duplicates']} duplicates, "
+            f"{report['invalid'] + report['failed']} errors, {report['rows_per_second']} rows/s",
+            file=sys.stderr,
+        )
+
+    source = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    with source:
+        result = import_products(
+            source,
+            file_format,
+            batch_size=args.batch_size,
+            status="approved" if args.approve else "pending",
+            progress=print_progress,
+        )
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,117 @@
+"""EthAum AI - Product Index Refresh Queue.
+
+A product write changes the inputs of the in-memory comparison,
+matchmaking, similarity and search indexes, and refreshing each one
+re-reads the product from the database. Write paths queue the product
+id here instead, and a background worker applies the refreshes in
+batches, with one query per index for the whole batch. Ids queued
+again before their batch runs are refreshed once.
+
+Cache invalidations stay on the request, so the next read of the
+product sees the write; the indexes catch up a moment later.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+from services.comparisons import refresh_products_comparisons
+from services.matchmaking import refresh_startups
+from services.search import refresh_products_search
+from services.similarity import refresh_products_similarity
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+# How long the worker waits for more ids after the first one arrives
+BATCH_WINDOW_SECONDS = 0.2
+
+# product id -> its current category if the writer knew it
+_pending: dict[int, Optional[str]] = {}
+_cond = threading.Condition()
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+_applied = 0
+_failed = 0
+
+
+def queue_product_refresh(product_id: int, category: Optional[str] = None) -> None:
+    """Write-path hook: refresh one product in the indexes in the background."""
+    queue_products_refresh({product_id: category})
+
+
+def queue_products_refresh(categories: dict[int, Optional[str]]) -> None:
+    """
+    Write-path hook: refresh a batch of products in the indexes in the background.
+
+    Args:
+        categories: Product id -> its current category, or None when the
+            caller does not know it.
+    """
+    if not categories:
+        return
+    if _worker is None or not _worker.is_alive():
+        # No worker in this process (scripts, jobs): refresh inline
+        _apply(dict(categories))
+        return
+    with _cond:
+        for product_id, category in categories.items():
+            _pending[product_id] = category or _pending.get(product_id)
+        _cond.notify_all()
+
+
+def refresh_metrics() -> dict:
+    """Queue depth and lifetime counters for this worker."""
+    return {"pending": len(_pending), "applied": _applied, "failed": _failed}
+
+
+def start_worker() -> None:
+    """Start the background refresh worker for this worker process."""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    _stop.clear()
+    _worker = threading.Thread(target=_worker_loop, name="product-refresh", daemon=True)
+    _worker.start()
+
+
+def stop_worker(timeout: float = 10.0) -> None:
+    """Stop the worker after it has applied everything still queued."""
+    _stop.set()
+    with _cond:
+        _cond.notify_all()
+    if _worker is not None:
+        _worker.join(timeout=timeout)
+
+
+def _worker_loop() -> None:
+    while True:
+        with _cond:
+            _cond.wait_for(lambda: _stop.is_set() or _pending)
+            if not _pending:
+                return
+            if not _stop.is_set():
+                # Let a burst of writes land in the same batch
+                _cond.wait_for(lambda: _stop.is_set() or len(_pending) >= BATCH_SIZE, BATCH_WINDOW_SECONDS)
+            batch = dict(list(_pending.items())[:BATCH_SIZE])
+            for product_id in batch:
+                del _pending[product_id]
+        _apply(batch)
+
+
+def _apply(categories: dict[int, Optional[str]]) -> None:
+    global _applied, _failed
+    product_ids = list(categories)
+    # Each hook logs its own failures; a failure in one must not skip the others
+    for refresh, argument in (
+        (refresh_products_comparisons, categories),
+        (refresh_startups, product_ids),
+        (refresh_products_similarity, product_ids),
+        (refresh_products_search, product_ids),
+    ):
+        try:
+            refresh(argument)
+        except Exception:
+            logger.exception("Failed to refresh %s for products %s", refresh.__name__, product_ids)
+            _failed += 1
+    _applied += len(product_ids)
@@ -8,6 +8,10 @@ Dynamically calculates score based on reviews and upvotes from database.
 """
 
 from database import get_db
+from services.badges import invalidate_badge
+from services.cache import invalidate_tags
+from services.deals import invalidate_deals_catalog
+from services.product_refresh import queue_product_refresh
 
 
 def calculate_trust_score(
@@ -149,4 +153,9 @@ def update_product_trust_score(product_id: int) -> int:
         "market_traction": result["breakdown"].get("market_traction", 70),
     }).eq("id", product_id).execute()
     
+    invalidate_badge(product_id)
+    invalidate_deals_catalog(product_id)
+    queue_product_refresh(product_id)
+    invalidate_tags(f"product:{product_id}", "products")
+    
     return result["score"]
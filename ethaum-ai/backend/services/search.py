@@ -0,0 +1,498 @@
+"""EthAum AI - Product Search Index.
+
+An in-memory inverted index over the approved catalog's name, tagline,
+description and category, ranked with BM25. Each product occupies a
+slot number, and the products of each category and funding stage are
+kept as bitsets (Python ints with one bit per slot), so facet counts
+for a result set are one AND and popcount per facet value.
+
+As-you-type suggestions come from a separate autocomplete index: the
+word-start suffixes of every approved product name in one sorted array,
+searched with bisect, plus the trust-ranked top suggestions precomputed
+for every prefix shared by more products than a suggestion list holds.
+Any prefix then costs a dict lookup or a bisect and a scan of at most
+that many entries.
+
+Both indexes are built from one catalog load by a background refresher
+and rebuilt periodically, so requests never wait on a reload; product
+write paths update single entries in place.
+"""
+
+import bisect
+import heapq
+
+import logging
+import math
+import re
+import threading
+from typing import NamedTuple, Optional
+
+from database import get_db
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = "id, name, tagline, description, category, funding_stage, trust_score, website"
+SUGGEST_LIMIT = 10
+REFRESH_INTERVAL_SECONDS = 600
+PAGE_SIZE = 1000
+
+# BM25 parameters and per-field term weights
+K1 = 1.2
+B = 0.75
+FIELD_WEIGHTS = {"name": 3.0, "tagline": 2.0, "category": 2.0, "description": 1.0}
+
+STOP_WORDS = frozenset("a an and are as at be by for from in is it of on or the to with".split())
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Lowercase word tokens without stop words."""
+    return [token for token in _TOKEN.findall((text or "").lower()) if token not in STOP_WORDS]
+
+
+class SearchHit(NamedTuple):
+    """A ranked search result."""
+    score: float
+    product: dict
+
+
+class SearchIndex:
+    """BM25 inverted index with bitset postings and facets."""
+
+    def __init__(self, products: list[dict]):
+        self._lock = threading.Lock()
+        self._docs: list[Optional[dict]] = []
+        self._lengths: list[float] = []
+        self._slot_of: dict[int, int] = {}
+        self._free: list[int] = []
+        self._total_length = 0.0
+        # term -> {slot: weighted term frequency}
+        self._postings: dict[str, dict[int, float]] = {}
+        # facet -> value -> bitset of slots
+        self._facets: dict[str, dict[str, int]] = {"category": {}, "funding_stage": {}}
+
+        for product in products:
+            self._add(product, facets=False)
+        for facet, values in self._facets.items():
+            slots: dict[str, list[int]] = {}
+            for slot, document in enumerate(self._docs):
+                slots.setdefault(document.get(facet) or "", []).append(slot)
+            self._facets[facet] = {value: _bitset(members, len(self._docs)) for value, members in slots.items()}
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def upsert(self, product: dict) -> None:
+        """Index a product, replacing any previous version of it."""
+        with self._lock:
+            self._remove(product["id"])
+            self._add(product)
+
+    def remove(self, product_id: int) -> None:
+        """Drop a product from the index."""
+        with self._lock:
+            self._remove(product_id)
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        funding_stage: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[SearchHit], int, dict[str, dict[str, int]]]:
+        """
+        Rank products matching any query term.
+
+        Returns:
+            The requested page of hits, the total number of matches after
+            filters, and category / funding_stage facet counts over the
+            query matches (each facet ignoring its own filter).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            matched = _bitset({slot for term in terms for slot in self._postings.get(term, ())}, len(self._docs))
+            category_bits = self._facets["category"].get(category, 0) if category else -1
+            stage_bits = self._facets["funding_stage"].get(funding_stage, 0) if funding_stage else -1
+            facets = {
+                "category": _facet_counts(self._facets["category"], matched & stage_bits),
+                "funding_stage": _facet_counts(self._facets["funding_stage"], matched & category_bits),
+            }
+
+            scores: dict[int, float] = {}
+            documents = len(self._slot_of)
+            average_length = self._total_length / documents if documents else 0.0
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                for slot, frequency in postings.items():
+                    document = self._docs[slot]
+                    if category and document["category"] != category:
+                        continue
+                    if funding_stage and document["funding_stage"] != funding_stage:
+                        continue
+                    norm = K1 * (1 - B + B * self._lengths[slot] / average_length)
+                    scores[slot] = scores.get(slot, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: (-item[1], -(self._docs[item[0]]["trust_score"] or 0), self._docs[item[0]]["id"]),
+            )
+            page = [SearchHit(round(score, 4), self._docs[slot]) for slot, score in ranked[offset:offset + limit]]
+            return page, len(ranked), facets
+
+    def _add(self, product: dict, facets: bool = True) -> None:
+        document = {column.strip(): product.get(column.strip()) for column in SEARCH_COLUMNS.split(",")}
+        slot = self._free.pop() if self._free else len(self._docs)
+        if slot == len(self._docs):
+            self._docs.append(None)
+            self._lengths.append(0.0)
+        self._docs[slot] = document
+        self._slot_of[document["id"]] = slot
+
+        frequencies: dict[str, float] = {}
+        length = 0.0
+        for field, weight in FIELD_WEIGHTS.items():
+            tokens = tokenize(document.get(field))
+            length += weight * len(tokens)
+            for token in tokens:
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+        self._lengths[slot] = length
+        self._total_length += length
+
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[slot] = frequency
+        if facets:
+            for facet, values in self._facets.items():
+                value = document.get(facet) or ""
+                values[value] = values.get(value, 0) | 1 << slot
+
+    def _remove(self, product_id: int) -> None:
+        slot = self._slot_of.pop(product_id, None)
+        if slot is None:
+            return
+        document = self._docs[slot]
+        mask = ~(1 << slot)
+
+        for field in FIELD_WEIGHTS:
+            for term in set(tokenize(document.get(field))):
+                postings = self._postings.get(term)
+                if postings is None or slot not in postings:
+                    continue
+                del postings[slot]
+                if not postings:
+                    del self._postings[term]
+        for facet, values in self._facets.items():
+            value = document.get(facet) or ""
+            values[value] &= mask
+            if not values[value]:
+                del values[value]
+
+        self._total_length -= self._lengths[slot]
+        self._lengths[slot] = 0.0
+        self._docs[slot] = None
+        self._free.append(slot)
+
+
+class AutocompleteIndex:
+    """Prefix suggestions for product names and categories, ranked by trust score."""
+
+    def __init__(self, products: list[dict]):
+        self._lock = threading.Lock()
+        self._products: dict[int, dict] = {}
+        self._keys: list[tuple[str, int]] = []
+        # prefix -> best (-trust_score, product_id), for prefixes of more than SUGGEST_LIMIT keys
+        self._top: dict[str, list[tuple[int, int]]] = {}
+        self._categories: list[str] = []
+        self._category_counts: dict[str, int] = {}
+        self._category_names: dict[str, str] = {}
+
+        for product in products:
+            self._products[product["id"]] = _suggestion(product)
+            self._keys.extend((key, product["id"]) for key in _name_keys(product.get("name")))
+            self._count_category(product.get("category"), +1)
+        self._keys.sort()
+        self._build(0, len(self._keys), "")
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def suggest(self, prefix: str, limit: int = SUGGEST_LIMIT) -> tuple[list[dict], list[dict]]:
+        """
+        Products whose name has a word starting with `prefix`, and
+        categories starting with it.
+
+        Returns:
+            Up to `limit` products, highest trust score first, and up to
+            `limit` categories with their product counts, largest first.
+        """
+        key = _normalize(prefix)
+        if not key:
+            return [], []
+        with self._lock:
+            top = self._top.get(key)
+            if top is None:
+                lo, hi = self._range(key)
+                top = self._ranked(lo, hi)
+            products = [self._products[product_id] for _, product_id in top[:limit]]
+
+            lo = bisect.bisect_left(self._categories, key)
+            hi = bisect.bisect_left(self._categories, key + "\uffff")
+            categories = sorted(
+                self._categories[lo:hi], key=lambda c: (-self._category_counts[c], c)
+            )[:limit]
+            categories = [
+                {"category": self._category_names[c], "count": self._category_counts[c]} for c in categories
+            ]
+        return products, categories
+
+    def upsert(self, product: dict) -> None:
+        """Add a product, replacing any previous name, category or trust score."""
+        with self._lock:
+            self._remove(product["id"])
+            self._products[product["id"]] = _suggestion(product)
+            self._count_category(product.get("category"), +1)
+            entry = (-(product.get("trust_score") or 0), product["id"])
+            keys = _name_keys(product.get("name"))
+            for key in keys:
+                bisect.insort(self._keys, (key, product["id"]))
+            for prefix in {key[:end] for key in keys for end in range(1, len(key) + 1)}:
+                top = self._top.get(prefix)
+                if top is not None:
+                    bisect.insort(top, entry)
+                    del top[SUGGEST_LIMIT:]
+                else:
+                    lo, hi = self._range(prefix)
+                    if hi - lo > SUGGEST_LIMIT:
+                        self._top[prefix] = self._ranked(lo, hi)
+
+    def remove(self, product_id: int) -> None:
+        """Drop a product from the suggestions."""
+        with self._lock:
+            self._remove(product_id)
+
+    def _remove(self, product_id: int) -> None:
+        product = self._products.pop(product_id, None)
+        if product is None:
+            return
+        self._count_category(product.get("category"), -1)
+        keys = _name_keys(product.get("name"))
+        for key in keys:
+            position = bisect.bisect_left(self._keys, (key, product_id))
+            if position < len(self._keys) and self._keys[position] == (key, product_id):
+                del self._keys[position]
+        for prefix in {key[:end] for key in keys for end in range(1, len(key) + 1)}:
+            top = self._top.get(prefix)
+            if top is None:
+                continue
+            lo, hi = self._range(prefix)
+            if hi - lo <= SUGGEST_LIMIT:
+                del self._top[prefix]
+            elif any(pid == product_id for _, pid in top):
+                self._top[prefix] = self._ranked(lo, hi)
+
+    def _build(self, lo: int, hi: int, prefix: str) -> list[tuple[int, int]]:
+        """
+        Precompute top lists for every prefix under `prefix` with more than
+        SUGGEST_LIMIT keys, merging children bottom-up, and return the
+        top list for `prefix` itself.
+        """
+        if hi - lo <= SUGGEST_LIMIT:
+            return self._ranked(lo, hi)
+
+        depth = len(prefix)
+        candidates: list[tuple[int, int]] = []
+        position = lo
+        # Keys equal to the prefix sort before its extensions
+        while position < hi and len(self._keys[position][0]) == depth:
+            candidates.append(self._rank_entry(self._keys[position][1]))
+            position += 1
+        while position < hi:
+            child = prefix + self._keys[position][0][depth]
+            end = bisect.bisect_left(self._keys, (child + "\uffff",), position, hi)
+            candidates.extend(self._build(position, end, child))
+            position = end
+
+        top = heapq.nsmallest(SUGGEST_LIMIT, set(candidates))
+        if prefix:
+            self._top[prefix] = top
+        return top
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        lo = bisect.bisect_left(self._keys, (prefix,))
+        hi = bisect.bisect_left(self._keys, (prefix + "\uffff",), lo)
+        return lo, hi
+
+    def _ranked(self, lo: int, hi: int) -> list[tuple[int, int]]:
+        """Best products among keys[lo:hi]."""
+        return heapq.nsmallest(SUGGEST_LIMIT, {self._rank_entry(pid) for _, pid in self._keys[lo:hi]})
+
+    def _rank_entry(self, product_id: int) -> tuple[int, int]:
+        return -(self._products[product_id]["trust_score"] or 0), product_id
+
+    def _count_category(self, category: Optional[str], delta: int) -> None:
+        key = _normalize(category)
+        if not key:
+            return
+        count = self._category_counts.get(key, 0) + delta
+        if count > 0:
+            if key not in self._category_counts:
+                bisect.insort(self._categories, key)
+                self._category_names[key] = category
+            self._category_counts[key] = count
+        elif key in self._category_counts:
+            self._categories.pop(bisect.bisect_left(self._categories, key))
+            del self._category_counts[key]
+            del self._category_names[key]
+
+
+_index: Optional[SearchIndex] = None
+_autocomplete: Optional[AutocompleteIndex] = None
+_build_lock = threading.Lock()
+# Products written while a rebuild is loading the catalog, re-read once it swaps in
+_missed: Optional[set[int]] = None
+_missed_lock = threading.Lock()
+_stop = threading.Event()
+_refresher: Optional[threading.Thread] = None
+
+
+def get_search_index() -> SearchIndex:
+    """Get the search index, building it on first use."""
+    if _index is None:
+        with _build_lock:
+            if _index is None:
+                rebuild_search_indexes()
+    return _index
+
+
+def get_autocomplete_index() -> AutocompleteIndex:
+    """Get the autocomplete index, building it on first use."""
+    if _autocomplete is None:
+        with _build_lock:
+            if _autocomplete is None:
+                rebuild_search_indexes()
+    return _autocomplete
+
+
+def rebuild_search_indexes() -> int:
+    """Rebuild both indexes from one load of the approved catalog. Returns the number of products."""
+    global _index, _autocomplete, _missed
+    with _missed_lock:
+        _missed = set()
+    try:
+        products = _load_approved()
+        index, autocomplete = SearchIndex(products), AutocompleteIndex(products)
+        with _missed_lock:
+            _index, _autocomplete = index, autocomplete
+            missed = _missed
+    finally:
+        with _missed_lock:
+            _missed = None
+    if missed:
+        refresh_products_search(list(missed))
+    return len(products)
+
+
+def start_refresher() -> None:
+    """Build the indexes in the background and rebuild them periodically."""
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return
+    _stop.clear()
+    _refresher = threading.Thread(target=_refresh_loop, name="search-index", daemon=True)
+    _refresher.start()
+
+
+def stop_refresher() -> None:
+    """Stop the periodic rebuild."""
+    _stop.set()
+
+
+def refresh_product_search(product_id: int) -> None:
+    """Write-path hook: re-read one product into the search and autocomplete indexes if loaded."""
+    refresh_products_search([product_id])
+
+
+def refresh_products_search(product_ids: list[int]) -> None:
+    """Write-path hook: re-read a batch of products into the indexes with one query."""
+    with _missed_lock:
+        if _missed is not None:
+            _missed.update(product_ids)
+    indexes = [index for index in (_index, _autocomplete) if index is not None]
+    if not indexes or not product_ids:
+        return
+    try:
+        db = get_db()
+        result = db.table("products").select(SEARCH_COLUMNS + ", status").in_("id", list(product_ids)).execute()
+    except Exception:
+        logger.exception("Failed to refresh search index for products %s", product_ids)
+        return
+
+    approved = {row["id"]: row for row in result.data or [] if row.get("status") == "approved"}
+    for index in indexes:
+        for product_id in product_ids:
+            if product_id in approved:
+                index.upsert(approved[product_id])
+            else:
+                index.remove(product_id)
+
+
+def _refresh_loop() -> None:
+    while True:
+        try:
+            # Holds the build lock so a first request waits for this build instead of starting its own
+            with _build_lock:
+                rebuild_search_indexes()
+        except Exception:
+            logger.exception("Search index rebuild failed")
+        if _stop.wait(REFRESH_INTERVAL_SECONDS):
+            return
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Lowercase words joined by single spaces, the form autocomplete keys are stored in."""
+    return " ".join(_TOKEN.findall((text or "").lower()))
+
+
+def _name_keys(name: Optional[str]) -> set[str]:
+    """A name from each of its words onwards, so any word of it can be typed first."""
+    words = _normalize(name).split(" ")
+    return {" ".join(words[start:]) for start in range(len(words)) if words[start]}
+
+
+def _suggestion(product: dict) -> dict:
+    return {
+        "id": product["id"],
+        "name": product.get("name"),
+        "category": product.get("category"),
+        "trust_score": product.get("trust_score"),
+    }
+
+
+def _bitset(slots, size: int) -> int:
+    """Bitset with the given slots set, built in one pass over a byte buffer."""
+    buffer = bytearray((size + 7) // 8)
+    for slot in slots:
+        buffer[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _facet_counts(values: dict[str, int], matched: int) -> dict[str, int]:
+    """Matches per facet value, most common first."""
+    # bin().count rather than int.bit_count, which needs Python 3.10
+    counts = {value: bin(bits & matched).count("1") for value, bits in values.items() if value}
+    return {value: count for value, count in sorted(counts.items(), key=lambda item: -item[1]) if count}
+
+
+def _load_approved() -> list[dict]:
+    db = get_db()
+    products: list[dict] = []
+    while True:
+        page = db.table("products").select(SEARCH_COLUMNS).eq("status", "approved").order("id").range(
+            len(products), len(products) + PAGE_SIZE - 1
+        ).execute().data or []
+        products.extend(page)
+        if len(page) < PAGE_SIZE:
+            return products
@@ -0,0 +1,456 @@
+"""EthAum AI - Product Similarity Index.
+
+Each approved product is encoded as a feature vector: a category
+one-hot plus funding stage, trust score, market traction, user
+sentiment and upvote volume scaled to 0-1. Similarity is one minus the
+weighted squared distance over its maximum, so products in the same
+category always rank above products in other categories, and the
+numeric signals order them within it.
+
+The top-K neighbours of every product are computed with blocked matrix
+products and persisted to `product_neighbors`, so "similar products"
+is one indexed lookup. When a product's features change, only its own
+row and the rows it enters or leaves are recomputed. Upvote volume is
+refreshed by the periodic rebuild rather than on every vote.
+"""
+
+import logging
+import math
+import threading
+from typing import Optional
+
+import numpy as np
+
+from database import get_db
+
+logger = logging.getLogger(__name__)
+
+TOP_K_NEIGHBORS = 20
+BLOCK_SIZE = 1024
+PAGE_SIZE = 1000
+WRITE_BATCH_SIZE = 500
+REFRESH_INTERVAL_SECONDS = 900
+
+FEATURE_COLUMNS = "id, category, funding_stage, trust_score, market_traction, user_sentiment"
+
+FUNDING_STAGES = ["Pre-Seed", "Seed", "Series A", "Series B", "Series C", "Series D", "Series D+", "Pre-IPO"]
+UPVOTE_SCALE = 1000
+
+# Weights of the numeric features, in vector order; the category one-hot has weight 1
+NUMERIC_WEIGHTS = np.array([0.5, 1.0, 0.5, 0.5, 0.5])  # stage, trust, traction, sentiment, upvotes
+CROSS_CATEGORY_DISTANCE = 2.0
+MAX_DISTANCE = CROSS_CATEGORY_DISTANCE + float(np.sum(NUMERIC_WEIGHTS ** 2))
+
+
+def encode_numeric(product: dict, upvotes: int) -> np.ndarray:
+    """Weighted numeric features of a product, each scaled to 0-1 before weighting."""
+    stage = product.get("funding_stage")
+    stage_value = FUNDING_STAGES.index(stage) / (len(FUNDING_STAGES) - 1) if stage in FUNDING_STAGES else 0.5
+    values = np.array([
+        stage_value,
+        (product.get("trust_score") or 0) / 100,
+        (product.get("market_traction") or 0) / 100,
+        (product.get("user_sentiment") or 0) / 100,
+        min(1.0, math.log1p(max(0, upvotes)) / math.log1p(UPVOTE_SCALE)),
+    ])
+    return np.clip(values, 0.0, 1.0) * NUMERIC_WEIGHTS
+
+
+class SimilarityIndex:
+    """
+    Feature matrix and top-K neighbour lists for the approved catalog.
+
+    Rows keep their position for the life of the index; removed products
+    are masked out rather than deleted, and new products are appended.
+    """
+
+    def __init__(self, products: list[dict], upvotes: dict[int, int], top_k: int = TOP_K_NEIGHBORS):
+        self.top_k = top_k
+        self._lock = threading.Lock()
+        self.ids: list[int] = []
+        self.position: dict[int, int] = {}
+        self.category_column: dict[str, int] = {}
+        self.features = np.zeros((0, len(NUMERIC_WEIGHTS)), dtype=np.float32)
+        self.active = np.zeros(0, dtype=bool)
+
+        rows = []
+        for product in products:
+            self._column_for(product.get("category") or "")
+            self.position[product["id"]] = len(self.ids)
+            self.ids.append(product["id"])
+            rows.append(product)
+        self.features = np.zeros((len(rows), len(NUMERIC_WEIGHTS) + len(self.category_column)), dtype=np.float32)
+        for i, product in enumerate(rows):
+            self.features[i] = self._encode(product, upvotes.get(product["id"], 0))
+        self.active = np.ones(len(rows), dtype=bool)
+        self.norms = np.einsum("ij,ij->i", self.features, self.features)
+        self.id_array = np.array(self.ids, dtype=np.int64)
+        self.category = np.array(
+            [self.category_column[product.get("category") or ""] for product in rows], dtype=np.int64
+        )
+
+        self.neighbors = np.full((len(rows), top_k), -1, dtype=np.int64)
+        self.scores = np.full((len(rows), top_k), -np.inf, dtype=np.float32)
+        self._compute_rows(np.arange(len(rows)))
+
+    def __contains__(self, product_id: int) -> bool:
+        position = self.position.get(product_id)
+        return position is not None and bool(self.active[position])
+
+    def product_ids(self) -> list[int]:
+        """Ids of the products currently indexed."""
+        return [pid for pid, position in self.position.items() if self.active[position]]
+
+    def neighbors_of(self, product_id: int, limit: Optional[int] = None) -> list[tuple[int, float]]:
+        """Nearest products as (product_id, similarity) pairs, most similar first."""
+        position = self.position.get(product_id)
+        if position is None or not self.active[position]:
+            return []
+        return [
+            (self.ids[n], _similarity(score))
+            for n, score in zip(self.neighbors[position], self.scores[position])
+            if n >= 0
+        ][:limit]
+
+    def query(self, product: dict, upvotes: int = 0, limit: int = TOP_K_NEIGHBORS) -> list[tuple[int, float]]:
+        """Nearest indexed products to a product that is not in the index."""
+        with self._lock:
+            vector = self._encode(product, upvotes)
+            scores = self._scores_against(vector[None, :], np.array([vector @ vector], dtype=np.float32))[0]
+            if product.get("id") in self.position:
+                scores[self.position[product["id"]]] = -np.inf
+            neighbors, best = _top_k(scores[None, :], self.id_array, limit)
+            return [(self.ids[n], _similarity(s)) for n, s in zip(neighbors[0], best[0]) if n >= 0]
+
+    def update(self, product: dict, upvotes: int) -> set[int]:
+        """
+        Insert or re-encode a product and fix up every row it affects.
+
+        Returns:
+            Ids of the products whose neighbour lists changed.
+        """
+        with self._lock:
+            vector = self._encode(product, upvotes)
+            position = self.position.get(product["id"])
+            if position is None:
+                position = self._append(product["id"])
+            self.features[position] = vector
+            self.norms[position] = vector @ vector
+            self.category[position] = self.category_column[product.get("category") or ""]
+            self.active[position] = True
+            return self._refresh_around(position, entering=True)
+
+    def remove(self, product_id: int) -> set[int]:
+        """
+        Drop a product from the index.
+
+        Returns:
+            Ids of the products whose neighbour lists changed.
+        """
+        with self._lock:
+            position = self.position.get(product_id)
+            if position is None or not self.active[position]:
+                return set()
+            self.active[position] = False
+            self.neighbors[position] = -1
+            self.scores[position] = -np.inf
+            return self._refresh_around(position, entering=False)
+
+    def _refresh_around(self, position: int, entering: bool) -> set[int]:
+        """Recompute a row, the rows it was in and, if active, the rows it should now enter."""
+        affected = (self.neighbors == position).any(axis=1)
+        if entering:
+            scores = self._scores_against(self.features[position][None, :], self.norms[position:position + 1])[0]
+            scores[position] = -np.inf
+            affected |= scores > self.scores[:, -1]
+            affected[position] = True
+        rows = np.nonzero(affected & self.active)[0]
+
+        before_neighbors, before_scores = self.neighbors[rows].copy(), self.scores[rows].copy()
+        self._compute_rows(rows)
+        changed = (before_neighbors != self.neighbors[rows]).any(axis=1) | (before_scores != self.scores[rows]).any(axis=1)
+        return {self.ids[r] for r in rows[changed]} | ({self.ids[position]} if entering else set())
+
+    def _compute_rows(self, rows: np.ndarray) -> None:
+        """
+        Top-K neighbours of the given rows, one block of rows at a time.
+
+        Any same-category product scores at least 0.5 and any other at
+        most 0.5, so a row whose category has more than K other members
+        is first scored against that category alone; only rows whose
+        K-th neighbour sits exactly on the boundary are rescored against
+        the whole catalog.
+        """
+        everything = np.arange(len(self.ids))
+        for column in np.unique(self.category[rows]):
+            group = rows[self.category[rows] == column]
+            members = np.nonzero((self.category == column) & self.active)[0]
+            if len(members) <= self.top_k:
+                self._compute_block(group, everything)
+                continue
+            self._compute_block(group, members)
+            boundary = group[self.scores[group, -1] <= -CROSS_CATEGORY_DISTANCE]
+            if len(boundary):
+                self._compute_block(boundary, everything)
+
+    def _compute_block(self, rows: np.ndarray, columns: np.ndarray) -> None:
+        for start in range(0, len(rows), BLOCK_SIZE):
+            block = rows[start:start + BLOCK_SIZE]
+            scores = self._scores_against(self.features[block], self.norms[block], columns)
+            scores[block[:, None] == columns[None, :]] = -np.inf
+            neighbors, self.scores[block] = _top_k(scores, self.id_array[columns], self.top_k)
+            self.neighbors[block] = np.where(neighbors >= 0, columns[neighbors], -1)
+
+    def _scores_against(self, vectors: np.ndarray, norms: np.ndarray, columns: Optional[np.ndarray] = None) -> np.ndarray:
+        """Negative squared distance from each vector to each row in `columns`; -inf for inactive rows."""
+        if columns is None:
+            columns = np.arange(len(self.ids))
+        scores = vectors @ self.features[columns].T
+        scores *= 2
+        scores -= norms[:, None]
+        scores -= np.where(self.active[columns], self.norms[columns], np.inf)[None, :]
+        return scores
+
+    def _encode(self, product: dict, upvotes: int) -> np.ndarray:
+        column = self._column_for(product.get("category") or "")
+        vector = np.zeros(len(NUMERIC_WEIGHTS) + len(self.category_column), dtype=np.float32)
+        vector[:len(NUMERIC_WEIGHTS)] = encode_numeric(product, upvotes)
+        vector[column] = 1.0
+        return vector
+
+    def _column_for(self, category: str) -> int:
+        """Feature column of a category, widening the matrix for new categories."""
+        column = self.category_column.get(category)
+        if column is None:
+            column = len(NUMERIC_WEIGHTS) + len(self.category_column)
+            self.category_column[category] = column
+            if len(self.features):
+                self.features = np.hstack([self.features, np.zeros((len(self.features), 1), dtype=np.float32)])
+            else:
+                self.features = np.zeros((0, column + 1), dtype=np.float32)
+        return column
+
+    def _append(self, product_id: int) -> int:
+        position = len(self.ids)
+        self.ids.append(product_id)
+        self.position[product_id] = position
+        self.features = np.vstack([self.features, np.zeros((1, self.features.shape[1]), dtype=np.float32)])
+        self.norms = np.append(self.norms, np.float32(0))
+        self.active = np.append(self.active, False)
+        self.id_array = np.append(self.id_array, product_id)
+        self.category = np.append(self.category, 0)
+        self.neighbors = np.vstack([self.neighbors, np.full((1, self.top_k), -1, dtype=np.int64)])
+        self.scores = np.vstack([self.scores, np.full((1, self.top_k), -np.inf, dtype=np.float32)])
+        return position
+
+
+_index: Optional[SimilarityIndex] = None
+_index_lock = threading.Lock()
+_stop = threading.Event()
+_refresher: Optional[threading.Thread] = None
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """Get the similarity index, building it on first use."""
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                rebuild_index()
+    return _index
+
+
+def rebuild_index() -> int:
+    """
+    Rebuild the index from the database and persist neighbour lists that changed.
+
+    Returns:
+        The number of products whose stored neighbours were rewritten.
+    """
+    global _index
+    previous = _stored_neighbors() if _index is None else {
+        pid: _index.neighbors_of(pid) for pid in _index.product_ids()
+    }
+    index = SimilarityIndex(load_features(), load_upvote_totals())
+    _index = index
+
+    current = {pid: index.neighbors_of(pid) for pid in index.product_ids()}
+    changed = [pid for pid, neighbors in current.items() if _rounded(neighbors) != _rounded(previous.get(pid, []))]
+    removed = [pid for pid in previous if pid not in current]
+    _persist(index, changed, removed)
+    return len(changed) + len(removed)
+
+
+def refresh_product_similarity(product_id: int) -> None:
+    """Write-path hook: re-encode one product and persist the neighbour lists it changes."""
+    refresh_products_similarity([product_id])
+
+
+def refresh_products_similarity(product_ids: list[int]) -> None:
+    """Write-path hook: re-encode a batch of products and persist the changed lists once."""
+    index = _index
+    if index is None or not product_ids:
+        return
+    try:
+        db = get_db()
+        result = db.table("products").select(FEATURE_COLUMNS + ", status").in_("id", list(product_ids)).execute()
+        approved = {row["id"]: row for row in result.data or [] if row.get("status") == "approved"}
+        upvotes: dict[int, int] = {}
+        if approved:
+            launches = db.table("launches").select("product_id, upvotes").in_("product_id", list(approved)).execute()
+            for launch in launches.data or []:
+                upvotes[launch["product_id"]] = upvotes.get(launch["product_id"], 0) + (launch.get("upvotes") or 0)
+
+        changed: set[int] = set()
+        removed: list[int] = []
+        for product_id in product_ids:
+            if product_id in approved:
+                changed |= index.update(approved[product_id], upvotes.get(product_id, 0))
+            else:
+                changed |= index.remove(product_id)
+                removed.append(product_id)
+        _persist(index, list(changed - set(removed)), removed)
+    except Exception:
+        logger.exception("Failed to refresh similarity for products %s", product_ids)
+
+
+def find_similar_products(product_id: int, limit: int) -> Optional[tuple[dict, list[tuple[dict, float]]]]:
+    """
+    Neighbours of a product that has no stored neighbour list yet.
+
+    Returns:
+        The source product and its (product, similarity) neighbours, or
+        None if the product does not exist.
+    """
+    db = get_db()
+    result = db.table("products").select(FEATURE_COLUMNS).eq("id", product_id).execute()
+    if not result.data:
+        return None
+    source = result.data[0]
+
+    index = get_similarity_index()
+    pairs = index.neighbors_of(product_id, limit) if product_id in index else index.query(source, limit=limit)
+    if not pairs:
+        return source, []
+
+    products = db.table("products").select(
+        "id, name, category, trust_score, website, funding_stage"
+    ).in_("id", [pid for pid, _ in pairs]).execute()
+    by_id = {p["id"]: p for p in products.data or []}
+    return source, [(by_id[pid], similarity) for pid, similarity in pairs if pid in by_id]
+
+
+def load_features() -> list[dict]:
+    """Feature columns of every approved product, in id order."""
+    return _load_pages(lambda: get_db().table("products").select(FEATURE_COLUMNS).eq("status", "approved").order("id"))
+
+
+def load_upvote_totals() -> dict[int, int]:
+    """Total launch upvotes per product."""
+    totals: dict[int, int] = {}
+    for launch in _load_pages(lambda: get_db().table("launches").select("id, product_id, upvotes").order("id")):
+        totals[launch["product_id"]] = totals.get(launch["product_id"], 0) + (launch.get("upvotes") or 0)
+    return totals
+
+
+def start_refresher() -> None:
+    """Build the index in the background and rebuild it periodically."""
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return
+    _stop.clear()
+    _refresher = threading.Thread(target=_refresh_loop, name="similarity-index", daemon=True)
+    _refresher.start()
+
+
+def stop_refresher() -> None:
+    """Stop the periodic rebuild."""
+    _stop.set()
+
+
+def _refresh_loop() -> None:
+    while True:
+        try:
+            with _index_lock:
+                rebuild_index()
+        except Exception:
+            logger.exception("Similarity index rebuild failed")
+        if _stop.wait(REFRESH_INTERVAL_SECONDS):
+            return
+
+
+def _top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Best k columns of each row by score, ties broken by lower product id; -1 pads short rows."""
+    rows, columns = scores.shape
+    neighbors = np.full((rows, k), -1, dtype=np.int64)
+    best = np.full((rows, k), -np.inf, dtype=np.float32)
+    if columns == 0:
+        return neighbors, best
+
+    take = min(k, columns)
+    if take < columns:
+        candidates = np.argpartition(scores, columns - take, axis=1)[:, columns - take:]
+    else:
+        candidates = np.tile(np.arange(columns), (rows, 1))
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.lexsort((ids[candidates], -candidate_scores), axis=-1)
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+    valid = np.isfinite(candidate_scores)
+    neighbors[:, :take] = np.where(valid, candidates, -1)
+    best[:, :take] = np.where(valid, candidate_scores, -np.inf)
+    return neighbors, best
+
+
+def _similarity(score: float) -> float:
+    """Negative squared distance to a 0-1 similarity."""
+    return round(max(0.0, 1 + float(score) / MAX_DISTANCE), 4)
+
+
+def _rounded(neighbors: list[tuple[int, float]]) -> list[tuple[int, float]]:
+    return [(pid, round(similarity, 4)) for pid, similarity in neighbors]
+
+
+def _load_pages(build_query) -> list[dict]:
+    rows: list[dict] = []
+    while True:
+        page = build_query().range(len(rows), len(rows) + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+
+
+def _stored_neighbors() -> dict[int, list[tuple[int, float]]]:
+    """Neighbour lists currently persisted, to avoid rewriting unchanged rows."""
+    stored: dict[int, list[tuple[int, float]]] = {}
+    rows = _load_pages(lambda: get_db().table("product_neighbors").select(
+        "product_id, rank, neighbor_id, similarity"
+    ).order("product_id").order("rank"))
+    for row in rows:
+        stored.setdefault(row["product_id"], []).append((row["neighbor_id"], row["similarity"]))
+    return stored
+
+
+def _persist(index: SimilarityIndex, changed: list[int], removed: list[int]) -> None:
+    """Write the neighbour lists of changed products and drop those of removed ones."""
+    db = get_db()
+    for start in range(0, len(changed), WRITE_BATCH_SIZE):
+        batch = changed[start:start + WRITE_BATCH_SIZE]
+        lists = {pid: index.neighbors_of(pid) for pid in batch}
+        rows = [
+            {"product_id": pid, "rank": rank, "neighbor_id": neighbor_id, "similarity": similarity}
+            for pid, neighbors in lists.items()
+            for rank, (neighbor_id, similarity) in enumerate(neighbors, start=1)
+        ]
+        if rows:
+            db.table("product_neighbors").upsert(rows, on_conflict="product_id,rank").execute()
+
+        by_count: dict[int, list[int]] = {}
+        for pid, neighbors in lists.items():
+            by_count.setdefault(len(neighbors), []).append(pid)
+        for count, ids in by_count.items():
+            if count < index.top_k:
+                db.table("product_neighbors").delete().in_("product_id", ids).gt("rank", count).execute()
+
+    for start in range(0, len(removed), WRITE_BATCH_SIZE):
+        db.table("product_neighbors").delete().in_("product_id", removed[start:start + WRITE_BATCH_SIZE]).execute()
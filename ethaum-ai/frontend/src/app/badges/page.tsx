@@ -14,14 +14,17 @@ export default function BadgesPage() {
     const [badgeData, setBadgeData] = useState<BadgeData | null>(null);
     const [copied, setCopied] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         async function fetchProducts() {
             try {
                 const data = await getProducts();
-                setProducts(data);
-                if (data.length > 0) {
-                    setSelectedProduct(data[0].id);
+                setProducts(data.products);
+                setNextCursor(data.next_cursor);
+                if (data.products.length > 0) {
+                    setSelectedProduct(data.products[0].id);
                 }
             } catch (error) {
                 console.error("Failed to fetch products:", error);
@@ -32,6 +35,20 @@ export default function BadgesPage() {
         fetchProducts();
     }, []);
 
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const page = await getProducts(nextCursor);
+            setProducts((current) => [...current, ...page.products]);
+            setNextCursor(page.next_cursor);
+        } catch (error) {
+            console.error("Failed to fetch more products:", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         async function fetchBadge() {
             if (!selectedProduct) return;
@@ -91,6 +108,16 @@ export default function BadgesPage() {
                                     </button>
                                 ))}
                             </div>
+                            {nextCursor && (
+                                <Button
+                                    variant="outline"
+                                    className="mt-4 w-full"
+                                    onClick={loadMore}
+                                    disabled={loadingMore}
+                                >
+                                    {loadingMore ? "Loading..." : "Load more"}
+                                </Button>
+                            )}
                         </CardContent>
                     </Card>
 
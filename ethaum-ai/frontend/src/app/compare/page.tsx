@@ -14,11 +14,14 @@ export default function ComparePage() {
     const [selected2, setSelected2] = useState<number | null>(null);
     const [comparison, setComparison] = useState<ComparisonData | null>(null);
     const [loading, setLoading] = useState(false);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         async function fetchStartups() {
             const data = await getComparisonStartups();
             setStartups(data.startups);
+            setNextCursor(data.next_cursor);
             if (data.startups.length >= 2) {
                 setSelected1(data.startups[0].id);
                 setSelected2(data.startups[1].id);
@@ -27,6 +30,15 @@ export default function ComparePage() {
         fetchStartups();
     }, []);
 
+    const loadMoreStartups = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        const data = await getComparisonStartups(nextCursor);
+        setStartups((current) => [...current, ...data.startups]);
+        setNextCursor(data.next_cursor);
+        setLoadingMore(false);
+    };
+
     const handleCompare = async () => {
         if (!selected1 || !selected2) return;
         setLoading(true);
@@ -80,6 +92,11 @@ export default function ComparePage() {
                         </option>
                     ))}
                 </select>
+                {nextCursor && (
+                    <Button variant="outline" size="sm" onClick={loadMoreStartups} disabled={loadingMore}>
+                        {loadingMore ? "Loading..." : "More startups"}
+                    </Button>
+                )}
             </div>
 
             {loading && (
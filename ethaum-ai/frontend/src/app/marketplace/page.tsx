@@ -3,6 +3,7 @@
 import { useEffect, useState } from "react";
 import { getProducts, getLeaderboard, Product, Launch } from "@/lib/api";
 import { ProductCard } from "@/components/ProductCard";
+import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Search } from "lucide-react";
 
@@ -11,6 +12,8 @@ export default function MarketplacePage() {
     const [leaderboard, setLeaderboard] = useState<Launch[]>([]);
     const [search, setSearch] = useState("");
     const [loading, setLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         async function fetchData() {
@@ -19,7 +22,8 @@ export default function MarketplacePage() {
                     getProducts(),
                     getLeaderboard(),
                 ]);
-                setProducts(productsData);
+                setProducts(productsData.products);
+                setNextCursor(productsData.next_cursor);
                 setLeaderboard(leaderboardData);
             } catch (error) {
                 console.error("Failed to fetch data:", error);
@@ -36,6 +40,20 @@ export default function MarketplacePage() {
         fetchData();
     }, []);
 
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const page = await getProducts(nextCursor);
+            setProducts((current) => [...current, ...page.products]);
+            setNextCursor(page.next_cursor);
+        } catch (error) {
+            console.error("Failed to fetch more products:", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const getUpvotes = (productId: number) => {
         const launch = leaderboard.find((l) => l.product_id === productId);
         return launch?.upvotes;
@@ -86,6 +104,14 @@ export default function MarketplacePage() {
             {filteredProducts.length === 0 && !loading && (
                 <div className="text-center text-gray-500">No startups found.</div>
             )}
+
+            {nextCursor && !loading && (
+                <div className="mt-8 text-center">
+                    <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+                        {loadingMore ? "Loading..." : "Load more"}
+                    </Button>
+                </div>
+            )}
         </div>
     );
 }
@@ -43,9 +43,13 @@ export interface QuadrantData {
 }
 
 // Products
-export async function getProducts(): Promise<Product[]> {
-    const res = await fetch(`${API_BASE}/api/v1/products`);
-    return res.json();
+// One page of the catalog; pass next_cursor back as cursor to load the next page
+export async function getProducts(cursor?: string | null, limit = 20): Promise<{ products: Product[]; next_cursor: string | null }> {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor) params.set("cursor", cursor);
+    const res = await fetch(`${API_BASE}/api/v1/products?${params}`);
+    if (!res.ok) throw new Error("Failed to fetch products");
+    return { products: await res.json(), next_cursor: res.headers.get("X-Next-Cursor") };
 }
 
 export async function getProduct(id: number): Promise<Product> {
@@ -222,12 +226,16 @@ export interface StartupMetrics {
     ideal_for: string;
 }
 
-export async function getComparisonStartups(): Promise<{ startups: { id: number; name: string; category: string; trust_score: number }[] }> {
+// One page of startups; pass next_cursor back as cursor to load the next page
+export async function getComparisonStartups(cursor?: string | null, limit = 50): Promise<{ startups: { id: number; name: string; category: string; trust_score: number }[]; next_cursor: string | null }> {
     try {
-        const res = await fetch(`${API_BASE}/api/v1/comparisons`);
+        const params = new URLSearchParams({ limit: String(limit) });
+        if (cursor) params.set("cursor", cursor);
+        const res = await fetch(`${API_BASE}/api/v1/comparisons?${params}`);
+        if (!res.ok) return { startups: [], next_cursor: null };
         return res.json();
     } catch {
-        return { startups: [] };
+        return { startups: [], next_cursor: null };
     }
 }
 